@@ -0,0 +1,334 @@
+import asyncio
+import json
+import sys
+from datetime import date
+from urllib.parse import urlsplit, parse_qsl
+from data_manager import StaleWriteError
+import operations
+
+# Seconds writes are collected before they are committed together
+COMMIT_DELAY = 0.2
+
+# Seconds between checks for changes other processes made to the data file
+RELOAD_INTERVAL = 2.0
+
+# Largest accepted request body in bytes
+MAX_BODY_SIZE = 1024 * 1024
+
+STATUS_TEXT = {200: "OK", 201: "Created", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+# Write endpoint -> operation of the operations module; the JSON body holds its fields
+WRITE_ROUTES = {
+    "/api/modules": "add_module",
+    "/api/grades": "add_grade",
+    "/api/learning-times": "log_time",
+    "/api/operations": None,
+}
+
+# Read endpoint -> query parameters its response depends on; other parameters are ignored
+QUERY_PARAMETERS = {
+    "/api/learning-time": ("period", "start", "end"),
+}
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def snapshot_to_dict(snapshot) -> dict:
+    """
+    JSON representation of a DashboardSnapshot.
+    """
+    return {
+        "study_progress": snapshot.study_progress,
+        "grade_average": snapshot.grade_average,
+        "average_learning_time": snapshot.average_learning_time,
+        "planned_learning_time": snapshot.planned_learning_time,
+        "actual_learning_time": snapshot.actual_learning_time,
+        "semester_grade_averages": {str(number): average for number, average in snapshot.semester_grade_averages.items()},
+        "modules": [
+            {"title": title, "actual_time": actual, "planned_time": planned}
+            for title, actual, planned in zip(snapshot.module_titles, snapshot.module_actual_times,
+                                              snapshot.module_planned_times)
+        ],
+        "status_counts": {status.value: count for status, count in snapshot.status_counts.items()},
+        "recent_weekly_hours": [{"week": week.isoformat(), "hours": hours} for week, hours in snapshot.recent_weekly_hours],
+    }
+
+class ApiServer:
+    """
+    Local HTTP/JSON API over a study program, built on asyncio streams (stdlib only).
+
+    GET /api/program, /api/semesters/<number>, /api/metrics, /api/dashboard and
+    /api/learning-time?period=week|month&start=&end= return JSON. Every response is
+    serialized once per data version (and day) and then served from a cache with an
+    ETag, so many dashboard viewers cost one dictionary lookup per request.
+
+    POST /api/modules, /api/grades and /api/learning-times take the fields of the
+    add_module, add_grade and log_time operations and validate them like the menu;
+    POST /api/operations takes a list of operations. Writes change the study program
+    immediately and are committed together commit_delay seconds after the first one.
+
+    Requests run on the event loop thread, so they never see a half-applied change.
+    File I/O (commits, checks for external changes) runs in the default executor and
+    never blocks readers; writes wait until it is done, so the study program does
+    not change between the snapshot that is written and the merge of external changes.
+    """
+    def __init__(self, data_manager, study_program, progress_monitor,
+                 commit_delay: float = COMMIT_DELAY, reload_interval: float = RELOAD_INTERVAL):
+        self.data_manager = data_manager
+        self.study_program = study_program
+        self.progress_monitor = progress_monitor
+        self.commit_delay = commit_delay
+        self.reload_interval = reload_interval
+        # (path, parameters used by the endpoint) -> (cache key, ETag, serialized body)
+        self._cache = {}
+        self._commit_handle = None
+        self._commit_task = None
+        self._reload_task = None
+        # Held while the data file is written or read; writes wait for it
+        self._data_lock = None
+        self.server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000):
+        """
+        Start listening; port 0 picks a free port (see self.port).
+        """
+        self._data_lock = asyncio.Lock()
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        if self.reload_interval:
+            self._reload_task = asyncio.get_running_loop().create_task(self._reload_periodically())
+        return self.server
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8000):
+        await self.start(host, port)
+        print(f"Serving {self.data_manager.file_path} on http://{host}:{self.port}/api/program")
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """
+        Stop the server and commit writes that are still waiting.
+        """
+        if self._reload_task is not None:
+            self._reload_task.cancel()
+            self._reload_task = None
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self._commit_handle is not None:
+            self._commit_handle.cancel()
+            await self.commit()
+        # Waits for a commit that is still being written
+        async with self._data_lock:
+            await asyncio.get_running_loop().run_in_executor(None, self.data_manager.flush)
+
+    async def _reload_periodically(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            if self._commit_handle is not None:
+                continue
+            try:
+                async with self._data_lock:
+                    data = await loop.run_in_executor(None, self.data_manager.read_changes)
+                    diff = self.data_manager.merge_changes(self.study_program, data)
+            except Exception as error:
+                # Checked again after the next interval instead of ending the reloads
+                print(f"Merging external changes failed: {error!r}", file=sys.stderr)
+                continue
+            if diff:
+                print(f"Merged external changes: {diff.summary()}.")
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                keep_alive = await self._handle_request(request_line, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, request_line: bytes, reader, writer) -> bool:
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            self._write_response(writer, 400, {"error": "Malformed request line."}, keep_alive=False)
+            return False
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+        length = headers.get("content-length") or "0"
+        if not length.isdigit():
+            self._write_response(writer, 400, {"error": "Invalid Content-Length."}, keep_alive=False)
+            return False
+        length = int(length)
+        if length > MAX_BODY_SIZE:
+            self._write_response(writer, 413, {"error": "Request body too large."}, keep_alive=False)
+            return False
+        body = await reader.readexactly(length) if length else b""
+
+        url = urlsplit(target)
+        try:
+            if method == "GET":
+                etag, payload = self.read(url.path, url.query)
+                if headers.get("if-none-match") == etag:
+                    self._write_head(writer, 304, 0, keep_alive, etag)
+                else:
+                    self._write_head(writer, 200, len(payload), keep_alive, etag)
+                    writer.write(payload)
+            elif method == "POST":
+                async with self._data_lock:
+                    response = self.write(url.path, body)
+                self._write_response(writer, 201, response, keep_alive)
+            else:
+                raise HttpError(405, f"Method {method} is not supported.")
+        except HttpError as error:
+            self._write_response(writer, error.status, {"error": str(error)}, keep_alive)
+        except Exception as error:
+            # A bug must not drop the connection without an answer
+            print(f"Error handling {method} {url.path}: {error!r}", file=sys.stderr)
+            self._write_response(writer, 500, {"error": "Internal server error."}, keep_alive)
+        return keep_alive
+
+    def _write_head(self, writer, status: int, length: int, keep_alive: bool, etag: str = None):
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}", "Content-Type: application/json",
+                 f"Content-Length: {length}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if etag:
+            lines.append(f"ETag: {etag}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    def _write_response(self, writer, status: int, payload, keep_alive: bool):
+        body = json.dumps(payload).encode("utf-8")
+        self._write_head(writer, status, len(body), keep_alive)
+        writer.write(body)
+
+    def read(self, path: str, query: str = "") -> tuple:
+        """
+        Return (ETag, serialized JSON body) of a read endpoint, from the cache if the data did not change.
+        """
+        query = dict(parse_qsl(query))
+        # Unused parameters (e.g. cache busters) must not add cache entries
+        entry = (path, tuple((name, query[name]) for name in QUERY_PARAMETERS.get(path, ()) if name in query))
+        key = (self.study_program.version, date.today())
+        cached = self._cache.get(entry)
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+        etag = f'"{key[0]}-{key[1].toordinal()}"'
+        payload = json.dumps(self._build(path, dict(entry[1]))).encode("utf-8")
+        self._cache[entry] = (key, etag, payload)
+        return etag, payload
+
+    def _build(self, path: str, query: dict):
+        monitor = self.progress_monitor
+        if path == "/api/program":
+            return self.study_program.to_dict()
+        if path.startswith("/api/semesters/"):
+            try:
+                number = operations.parse_semester_number(path.rsplit("/", 1)[1])
+            except ValueError as error:
+                raise HttpError(404, str(error))
+            semester = self.study_program.get_semester(number)
+            if semester is None:
+                raise HttpError(404, f"No semester found with number {number}.")
+            return semester.to_dict()
+        if path == "/api/metrics":
+            return {
+                "version": self.study_program.version,
+                "grade_average": monitor.calc_grade_average(),
+                "pass_quote": monitor.calc_pass_quote(),
+                "study_progress": monitor.calc_study_progress(),
+                "average_learning_time": monitor.calc_average_learning_time(),
+            }
+        if path == "/api/dashboard":
+            return snapshot_to_dict(monitor.build_dashboard_snapshot())
+        if path == "/api/learning-time":
+            try:
+                start = operations.parse_date(query["start"]) if "start" in query else None
+                end = operations.parse_date(query["end"]) if "end" in query else None
+                rollup = monitor.calc_learning_time_rollup(query.get("period", "week"), start, end)
+            except ValueError as error:
+                raise HttpError(400, str(error))
+            return [{"start": period.isoformat(), "hours": hours} for period, hours in rollup]
+        if path in WRITE_ROUTES:
+            raise HttpError(405, f"Use POST for {path}.")
+        raise HttpError(404, f"Unknown endpoint {path}.")
+
+    def write(self, path: str, body: bytes) -> dict:
+        """
+        Apply the operation of a write endpoint and schedule the batched commit.
+        """
+        if path not in WRITE_ROUTES:
+            raise HttpError(404, f"Unknown write endpoint {path}.")
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            raise HttpError(400, "The request body must be JSON.")
+        name = WRITE_ROUTES[path]
+        if name is None:
+            if not isinstance(payload, list):
+                raise HttpError(400, "Expected a JSON list of operations.")
+            rejected = operations.apply_operations(self.study_program, payload)
+            response = {"applied": len(payload) - len(rejected),
+                        "rejected": [{"position": position, "error": message} for position, message in rejected]}
+            if not response["applied"]:
+                return dict(response, version=self.study_program.version)
+        else:
+            if not isinstance(payload, dict):
+                raise HttpError(400, "Expected a JSON object.")
+            try:
+                operations.apply_operation(self.study_program, dict(payload, op=name))
+            except ValueError as error:
+                raise HttpError(400, str(error))
+            response = {}
+        self._schedule_commit()
+        response["version"] = self.study_program.version
+        return response
+
+    def _schedule_commit(self):
+        if self._commit_handle is None:
+            loop = asyncio.get_running_loop()
+            self._commit_handle = loop.call_later(self.commit_delay, self._start_commit)
+
+    def _start_commit(self):
+        # Keep a reference so the task is not garbage collected and its failure is reported
+        self._commit_task = asyncio.get_running_loop().create_task(self.commit())
+        self._commit_task.add_done_callback(self._commit_done)
+
+    def _commit_done(self, task):
+        if task is self._commit_task:
+            self._commit_task = None
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Committing failed, the changes were not saved: {task.exception()!r}", file=sys.stderr)
+
+    async def commit(self):
+        """
+        Persist all writes since the last commit at once. The study program is
+        snapshotted on the event loop thread and written in the executor.
+        """
+        self._commit_handle = None
+        async with self._data_lock:
+            records, data = self.data_manager.take_changes(self.study_program)
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self.data_manager.commit_changes, records, data)
+            except StaleWriteError as error:
+                print(f"{error} The changes were not saved.", file=sys.stderr)
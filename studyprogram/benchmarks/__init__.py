@@ -0,0 +1,5 @@
+"""
+Benchmarks for the study program dashboard.
+
+Run them from the studyprogram directory, e.g. python -m benchmarks.bench_formats
+"""
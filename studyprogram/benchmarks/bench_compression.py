@@ -0,0 +1,48 @@
+import argparse
+import os
+import tempfile
+from data_manager import DataManager
+from benchmarks.bench_formats import best_of
+from benchmarks.synthetic import generate_program_dict
+
+# (label, storage format, compression, level); the first one is the baseline
+VARIANTS = [
+    ("json", "json", None, None),
+    ("json+gzip-1", "json", "gzip", 1),
+    ("json+gzip-6", "json", "gzip", 6),
+    ("json+gzip-9", "json", "gzip", 9),
+    ("json+xz-0", "json", "xz", 0),
+    ("json+xz-6", "json", "xz", 6),
+    ("binary", "binary", None, None),
+    ("binary+gzip-6", "binary", "gzip", 6),
+    ("binary+xz-6", "binary", "xz", 6),
+]
+
+def run(learning_times_per_module: int, repeat: int, disk_mbps: float):
+    data = generate_program_dict(learning_times_per_module=learning_times_per_module)
+    entries = sum(len(m["learning_times"]) for s in data["semesters"] for m in s["modules"])
+    print(f"Synthetic program: 36 modules, {entries} learning time entries")
+    # On a slow (network) disk the transfer time of the file adds to the CPU time measured locally
+    print(f"{'variant':14} {'size':>12} {'ratio':>6} {'save':>10} {'load':>10} {f'load@{disk_mbps:g}MB/s':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, storage_format, compression, level in VARIANTS:
+            path = os.path.join(directory, f"study_data.{label}")
+            data_manager = DataManager(path, storage_format=storage_format, compression=compression or "none",
+                                       compression_level=level)
+            save = best_of(repeat, lambda: data_manager.save_data(data))
+            load = best_of(repeat, lambda: DataManager(path).load_data())
+            size = os.path.getsize(path)
+            if compression is None and storage_format == "json":
+                baseline = size
+            remote_load = load + size / (disk_mbps * 1024 * 1024)
+            print(f"{label:14} {size:>10} B {baseline / size:>5.1f}x {save * 1000:>8.1f}ms {load * 1000:>8.1f}ms "
+                  f"{remote_load * 1000:>12.1f}ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare compressed and uncompressed data files")
+    parser.add_argument("--learning-times", type=int, default=2000, help="learning time entries per module")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--disk-mbps", type=float, default=10.0,
+                        help="disk or network bandwidth in MB/s used for the load@ column (default: 10)")
+    args = parser.parse_args()
+    run(args.learning_times, args.repeat, args.disk_mbps)
@@ -0,0 +1,44 @@
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from data_manager import DataManager
+from benchmarks.synthetic import generate_program_dict
+
+def best_of(repeat: int, function) -> float:
+    timings = []
+    for _ in range(repeat):
+        # Keep the "File ... saved/loaded." messages out of the benchmark output
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run(learning_times_per_module: int, repeat: int):
+    data = generate_program_dict(learning_times_per_module=learning_times_per_module)
+    entries = sum(len(m["learning_times"]) for s in data["semesters"] for m in s["modules"])
+    print(f"Synthetic program: 36 modules, {entries} learning time entries")
+    print(f"{'format':8} {'size':>12} {'save':>10} {'load':>10}")
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for storage_format in ("json", "binary"):
+            path = os.path.join(directory, f"study_data.{storage_format}")
+            data_manager = DataManager(path, storage_format=storage_format)
+            save = best_of(repeat, lambda: data_manager.save_data(data))
+            load = best_of(repeat, lambda: DataManager(path).load_data())
+            results[storage_format] = (os.path.getsize(path), save, load)
+            print(f"{storage_format:8} {results[storage_format][0]:>10} B {save * 1000:>8.1f}ms {load * 1000:>8.1f}ms")
+    json_size, json_save, json_load = results["json"]
+    binary_size, binary_save, binary_load = results["binary"]
+    print(f"binary vs json: {json_size / binary_size:.1f}x smaller, "
+          f"save {json_save / binary_save:.1f}x faster, load {json_load / binary_load:.1f}x faster")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the JSON and binary storage formats")
+    parser.add_argument("--learning-times", type=int, default=2000, help="learning time entries per module")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.learning_times, args.repeat)
@@ -0,0 +1,77 @@
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from data_manager import DataManager
+from benchmarks.synthetic import generate_program_dict
+
+STUDYPROGRAM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MENU_HEADER = "--- STUDY PROGRESS DASHBOARD ---"
+
+IMPORT_PROBE = (
+    "import sys, time; start = time.perf_counter(); import main; "
+    "print(time.perf_counter() - start); print('plotext' in sys.modules)"
+)
+
+def measure_import() -> tuple:
+    """
+    Import main in a fresh interpreter; returns (seconds, whether plotext got imported).
+    """
+    output = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=STUDYPROGRAM_DIR,
+                            capture_output=True, text=True, check=True).stdout.split()
+    return float(output[0]), output[1] == "True"
+
+def measure_first_menu(data_file: str) -> float:
+    """
+    Start main.py and measure the time until the menu is printed.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "main.py", "--file", data_file], cwd=STUDYPROGRAM_DIR,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    for line in process.stdout:
+        if MENU_HEADER in line:
+            elapsed = time.perf_counter() - start
+            break
+    else:
+        raise RuntimeError("main.py exited without showing the menu.")
+    process.communicate("7\n")
+    return elapsed
+
+def run(repeat: int, learning_times_per_module: int, max_import_ms: float, max_menu_ms: float) -> bool:
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, "study_data.json")
+        with contextlib.redirect_stdout(io.StringIO()):
+            DataManager(data_file).save_data(generate_program_dict(learning_times_per_module=learning_times_per_module))
+
+        imports = [measure_import() for _ in range(repeat)]
+        import_ms = statistics.median(seconds for seconds, _ in imports) * 1000
+        plotext_imported = any(imported for _, imported in imports)
+        menu_ms = statistics.median(measure_first_menu(data_file) for _ in range(repeat)) * 1000
+
+    print(f"import main:        {import_ms:8.1f} ms (plotext imported: {plotext_imported})")
+    print(f"time to first menu: {menu_ms:8.1f} ms (process start included)")
+
+    ok = not plotext_imported
+    if plotext_imported:
+        print("REGRESSION: plotext is imported at startup.")
+    if max_import_ms is not None and import_ms > max_import_ms:
+        print(f"REGRESSION: import time above {max_import_ms} ms.")
+        ok = False
+    if max_menu_ms is not None and menu_ms > max_menu_ms:
+        print(f"REGRESSION: time to first menu above {max_menu_ms} ms.")
+        ok = False
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the startup time of the CLI")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--learning-times", type=int, default=2000, help="learning time entries per module of the data file")
+    parser.add_argument("--max-import-ms", type=float, default=None, help="fail if importing main takes longer")
+    parser.add_argument("--max-menu-ms", type=float, default=None, help="fail if the menu takes longer to appear")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.repeat, args.learning_times, args.max_import_ms, args.max_menu_ms) else 1)
@@ -0,0 +1,158 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from classes import StudyProgram
+from data_manager import DataManager
+from progress_monitor import ProgressMonitor, ProgressTotals
+from benchmarks.synthetic import generate_program_dict
+
+SCALES = {
+    "small": {"semesters": 6, "modules_per_semester": 6, "exams_per_module": 1, "learning_times_per_module": 100},
+    "medium": {"semesters": 6, "modules_per_semester": 6, "exams_per_module": 2, "learning_times_per_module": 2000},
+    "large": {"semesters": 6, "modules_per_semester": 10, "exams_per_module": 3, "learning_times_per_module": 20000},
+    "huge": {"semesters": 12, "modules_per_semester": 10, "exams_per_module": 3, "learning_times_per_module": 50000},
+}
+
+# Calls per measurement for operations too fast to time individually
+FAST_CALLS = 1000
+
+def measure(function, repeat: int, number: int = 1) -> dict:
+    """
+    Time function() repeat times (number calls each); returns per-call seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            timings.append((time.perf_counter() - start) / number)
+    return {"best": min(timings), "median": statistics.median(timings), "repeat": repeat, "number": number}
+
+def headless_dashboard(program: StudyProgram, monitor: ProgressMonitor):
+    from cli_controller import CLIController
+    controller = CLIController(DataManager(os.devnull), program, monitor)
+    # Render into a string; the render cache is dropped so every run renders the plots
+    return lambda: (controller._render_cache.clear(), controller.render_dashboard())
+
+def run_benchmarks(scale: dict, repeat: int) -> dict:
+    data = generate_program_dict(**scale)
+    program = StudyProgram.from_dict(data)
+    monitor = ProgressMonitor(program)
+    results = {}
+
+    results["to_dict"] = measure(program.to_dict, repeat)
+    results["from_dict"] = measure(lambda: StudyProgram.from_dict(data), repeat)
+    results["from_dict_lazy"] = measure(lambda: StudyProgram.from_dict(data, lazy=True), repeat)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for storage_format in ("json", "binary"):
+            path = os.path.join(directory, f"study_data.{storage_format}")
+            data_manager = DataManager(path, storage_format=storage_format)
+            results[f"save_data_{storage_format}"] = measure(lambda: data_manager.save_data(data), repeat)
+            results[f"load_data_{storage_format}"] = measure(lambda: DataManager(path).load_data(), repeat)
+
+    results["totals_recompute"] = measure(lambda: ProgressTotals.from_study_program(program), repeat)
+    for metric in ("calc_grade_average", "calc_pass_quote", "calc_study_progress", "calc_average_learning_time"):
+        results[metric] = measure(getattr(monitor, metric), repeat, FAST_CALLS)
+    results["build_dashboard_snapshot"] = measure(monitor.build_dashboard_snapshot, repeat)
+
+    from numpy_monitor import NumpyProgressMonitor, np
+    if np is None:
+        results["numpy_columns_and_snapshot"] = {"skipped": "numpy is not installed"}
+    else:
+        numpy_monitor = NumpyProgressMonitor(program)
+        # Rebuild the columns every time, as after a change of the study program
+        results["numpy_columns_and_snapshot"] = measure(
+            lambda: (numpy_monitor._on_change("benchmark"), numpy_monitor.build_dashboard_snapshot()), repeat)
+
+    from cli_controller import CLIController
+    controller = CLIController(DataManager(os.devnull), program, monitor)
+    results["render_progress"] = measure(lambda: controller.render_progress(), repeat)
+    results["render_progress_truncated"] = measure(lambda: controller.render_progress(5), repeat)
+
+    try:
+        results["show_dashboard"] = measure(headless_dashboard(program, monitor), repeat)
+    except ImportError as error:
+        # plotext is an optional dependency for benchmarking purposes
+        results["show_dashboard"] = {"skipped": str(error)}
+    return results
+
+def compare(results: dict, baseline: dict, tolerance: float, min_seconds: float) -> list:
+    """
+    Return the names of all benchmarks that got slower than the baseline allows.
+    """
+    regressions = []
+    print(f"\n{'benchmark':28} {'baseline':>14} {'current':>14} {'ratio':>7}")
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if "best" not in result or not previous or "best" not in previous:
+            continue
+        ratio = result["best"] / previous["best"] if previous["best"] else float("inf")
+        regressed = ratio > 1 + tolerance and result["best"] - previous["best"] > min_seconds
+        marker = "  REGRESSION" if regressed else ""
+        print(f"{name:28} {previous['best'] * 1e6:11.1f} us {result['best'] * 1e6:11.1f} us {ratio:6.2f}x{marker}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the study program dashboard at a configurable scale")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--semesters", type=int)
+    parser.add_argument("--modules-per-semester", type=int)
+    parser.add_argument("--exams-per-module", type=int)
+    parser.add_argument("--learning-times-per-module", type=int)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a report written earlier with --output")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline (0.25 = 25%%)")
+    parser.add_argument("--min-seconds", type=float, default=0.002, help="ignore slowdowns smaller than this (noise)")
+    args = parser.parse_args()
+
+    scale = dict(SCALES[args.scale])
+    for key in scale:
+        if getattr(args, key) is not None:
+            scale[key] = getattr(args, key)
+
+    results = run_benchmarks(scale, args.repeat)
+    report = {
+        "meta": {
+            "scale": scale,
+            "learning_time_entries": scale["semesters"] * scale["modules_per_semester"] * scale["learning_times_per_module"],
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    print(f"Scale: {scale} ({report['meta']['learning_time_entries']} learning time entries)")
+    for name, result in results.items():
+        if "best" in result:
+            print(f"  {name:28} best {result['best'] * 1e6:12.1f} us  median {result['median'] * 1e6:12.1f} us")
+        else:
+            print(f"  {name:28} skipped ({result['skipped']})")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance, args.min_seconds)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import random
+from datetime import date, timedelta
+from classes import StudyProgram
+
+# Learning time dates cycle through this many days, so any number of entries stays a valid date
+DATE_WINDOW_DAYS = 10 * 365
+
+def generate_program_dict(semesters: int = 6, modules_per_semester: int = 6, exams_per_module: int = 1,
+                          learning_times_per_module: int = 365, seed: int = 42) -> dict:
+    """
+    Generate the dictionary representation of a synthetic study program.
+    """
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    iso_dates = [(start + timedelta(days=day)).isoformat() for day in range(min(learning_times_per_module, DATE_WINDOW_DAYS))]
+    program = {"name": "Synthetic", "regular_study_period": semesters, "semesters": []}
+    for number in range(1, semesters + 1):
+        modules = []
+        for index in range(modules_per_semester):
+            exams = []
+            for attempt in range(1, exams_per_module + 1):
+                grade = round(rng.uniform(1.0, 5.0), 1)
+                exams.append({"grade": grade, "attempt": attempt, "passed": grade <= 4.0})
+            status = "passed" if any(exam["passed"] for exam in exams) else ("failed" if exams else "open")
+            modules.append({
+                "title": f"module {number}.{index}",
+                "ects": rng.choice((5, 10)),
+                "status": status,
+                "exam_performances": exams,
+                "learning_times": [
+                    {"date": iso_dates[day % DATE_WINDOW_DAYS], "hours": round(rng.uniform(0.5, 8.0), 2)}
+                    for day in range(learning_times_per_module)
+                ],
+            })
+        program["semesters"].append({"number": number, "modules": modules})
+    return program
+
+def generate_program(**scale) -> StudyProgram:
+    """
+    Generate a synthetic StudyProgram; takes the same arguments as generate_program_dict.
+    """
+    return StudyProgram.from_dict(generate_program_dict(**scale))
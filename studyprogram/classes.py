@@ -1,8 +1,49 @@
 from enum import Enum
-from datetime import date
+from datetime import date, timedelta
+from array import array
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from collections.abc import Sequence
+from itertools import accumulate
 import re
 from typing import List
 
+def normalize_title(title: str) -> str:
+    """
+    Normalize a module title for comparisons (lower case, single spaces).
+    """
+    return re.sub(r'\s+', ' ', title.strip().lower())
+
+def check_period(period: str):
+    """
+    Raise ValueError unless period is "week" or "month".
+    """
+    if period not in ("week", "month"):
+        raise ValueError(f"Unknown period '{period}' (expected 'week' or 'month').")
+
+def period_start(day: date, period: str) -> date:
+    """
+    First day of the week (Monday) or month containing the given day.
+    """
+    check_period(period)
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+def period_starts(start: date, end: date, period: str) -> List[date]:
+    """
+    Start dates of all weeks or months from the one containing start up to the one
+    after the one containing end, i.e. the boundaries of the periods between them.
+    """
+    boundaries = [period_start(start, period)]
+    while boundaries[-1] <= end:
+        current = boundaries[-1]
+        if period == "week":
+            boundaries.append(current + timedelta(days=7))
+        else:
+            boundaries.append(date(current.year + current.month // 12, current.month % 12 + 1, 1))
+    return boundaries
+
 class ModuleStatus(Enum):
     """
     Enum representing the status of a module.
@@ -15,6 +56,8 @@ class ExamPerformance:
     """
     Class representing the performance of a student in an exam.
     """
+    __slots__ = ("grade", "attempt", "passed")
+
     def __init__(self, grade: float, attempt: int, passed: bool):
         self.grade = grade
         self.attempt = attempt
@@ -22,6 +65,14 @@ class ExamPerformance:
 
     def __repr__(self):
         return f"ExamPerformance(grade={self.grade}, attempt={self.attempt}, passed={self.passed})"
+
+    def __eq__(self, other):
+        if not isinstance(other, ExamPerformance):
+            return NotImplemented
+        return (self.grade, self.attempt, self.passed) == (other.grade, other.attempt, other.passed)
+
+    def __hash__(self):
+        return hash((self.grade, self.attempt, self.passed))
     
     def is_passed(self) -> bool:
         """
@@ -33,12 +84,22 @@ class LearningTime:
     """
     Class representing the learning time for a student.
     """
+    __slots__ = ("date", "hours")
+
     def __init__(self, date: date, hours: float):
         self.date = date
         self.hours = hours
 
     def __repr__(self):
         return f"LearningTime(date={self.date} hours={self.hours})"
+
+    def __eq__(self, other):
+        if not isinstance(other, LearningTime):
+            return NotImplemented
+        return (self.date, self.hours) == (other.date, other.hours)
+
+    def __hash__(self):
+        return hash((self.date, self.hours))
     
     def get_learning_time(self) -> float:
         """
@@ -46,79 +107,363 @@ class LearningTime:
         """
         return self.hours
 
+class _PackedView(Sequence):
+    """
+    Read-only list view over the packed arrays of a module. Items are created on access,
+    so changing them does not change the module; append() goes through the module.
+    """
+    __slots__ = ("_module",)
+
+    def __init__(self, module):
+        self._module = module
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._item(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"{type(self).__name__} index out of range")
+        return self._item(index)
+
+    def __eq__(self, other):
+        if not isinstance(other, (Sequence, list)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+class ExamPerformanceView(_PackedView):
+    """
+    The exam performances of a module, backed by its packed exam arrays.
+    """
+    __slots__ = ()
+
+    def __len__(self):
+        return len(self._module._exam_grades)
+
+    def _item(self, index: int) -> ExamPerformance:
+        module = self._module
+        return ExamPerformance(module._exam_grades[index], module._exam_attempts[index], bool(module._exam_passed[index]))
+
+    def __iter__(self):
+        module = self._module
+        for grade, attempt, passed in zip(module._exam_grades, module._exam_attempts, module._exam_passed):
+            yield ExamPerformance(grade, attempt, bool(passed))
+
+    def append(self, performance: ExamPerformance):
+        self._module.add_exam_performance(performance)
+
+class LearningTimeView(_PackedView):
+    """
+    The learning times of a module, backed by its packed date ordinal and hour arrays.
+    """
+    __slots__ = ()
+
+    def __len__(self):
+        return len(self._module._lt_hours)
+
+    def _item(self, index: int) -> LearningTime:
+        module = self._module
+        return LearningTime(date.fromordinal(module._lt_dates[index]), module._lt_hours[index])
+
+    def __iter__(self):
+        for ordinal, hours in zip(self._module._lt_dates, self._module._lt_hours):
+            yield LearningTime(date.fromordinal(ordinal), hours)
+
+    def append(self, learning_time: LearningTime):
+        self._module.add_learning_time(learning_time)
+
 class Module:
     """
     Class representing a module in a course.
+
+    Exam performances and learning times are stored in packed parallel arrays
+    (grades/attempts/passed flags and date ordinals/hours); exam_performances and
+    learning_times are lightweight list views over them. Learning times are kept
+    sorted by date together with cumulative hour sums, so the hours of any date
+    window are found with two binary searches.
+
+    A module created with from_dict(data, lazy=True) keeps the raw records and only
+    builds the arrays the first time they are accessed. The get_* aggregates are
+    computed straight from the raw records until then.
     """
+    _PACKED_FIELDS = ("_exam_grades", "_exam_attempts", "_exam_passed", "_lt_dates", "_lt_hours", "_lt_prefix")
+
+    __slots__ = ("semester", "_title", "normalized_title", "_ects", "_status", "_raw") + _PACKED_FIELDS
+
     def __init__(self, title: str, ects: int, status: ModuleStatus):
+        self.semester = None
         self.title = title
-        self.normalized_title = re.sub(r'\s+', ' ', title.strip().lower())
         self.ects = ects
         self.status = status
-        self.exam_performances: List[ExamPerformance] = []
-        self.learning_times: List[LearningTime] = []
+        self._raw = None
+        self._exam_grades = array("d")
+        self._exam_attempts = array("i")
+        self._exam_passed = array("b")
+        self._lt_dates = array("i")
+        self._lt_hours = array("d")
+        # _lt_prefix[i] is the sum of _lt_hours[0..i]
+        self._lt_prefix = array("d")
+
+    def __getattr__(self, name):
+        # Only called for unset slots: the packed arrays of a lazily loaded module
+        if name in Module._PACKED_FIELDS and self._raw is not None:
+            self._materialize()
+            return getattr(self, name)
+        raise AttributeError(f"'Module' object has no attribute '{name}'")
+
+    def _materialize(self):
+        """
+        Build the packed arrays from the raw records of a lazily loaded module.
+        """
+        raw, self._raw = self._raw, None
+        exams = raw.get("exam_performances", [])
+        self._exam_grades = array("d", (exam["grade"] for exam in exams))
+        self._exam_attempts = array("i", (exam["attempt"] for exam in exams))
+        self._exam_passed = array("b", (exam["passed"] for exam in exams))
+        self._set_learning_times(raw.get("learning_times", []))
+
+    def _set_learning_times(self, learning_times: list):
+        """
+        Fill the learning time arrays from raw records, sorted by date (stable for equal dates).
+        """
+        dates = [date.fromisoformat(lt["date"]).toordinal() for lt in learning_times]
+        hours = [lt["hours"] for lt in learning_times]
+        if any(earlier > later for earlier, later in zip(dates, dates[1:])):
+            order = sorted(range(len(dates)), key=dates.__getitem__)
+            dates = [dates[i] for i in order]
+            hours = [hours[i] for i in order]
+        self._lt_dates = array("i", dates)
+        self._lt_hours = array("d", hours)
+        self._lt_prefix = array("d", accumulate(hours))
+
+    def is_loaded(self) -> bool:
+        """
+        Check whether the exam performances and learning times have been built.
+        """
+        return self._raw is None
+
+    @property
+    def exam_performances(self) -> ExamPerformanceView:
+        return ExamPerformanceView(self)
+
+    @property
+    def learning_times(self) -> LearningTimeView:
+        return LearningTimeView(self)
+
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @title.setter
+    def title(self, value: str):
+        old = getattr(self, "_title", None)
+        self._title = value
+        self.normalized_title = normalize_title(value)
+        if old is not None and old != value:
+            self._emit("title_changed", old=old, new=value)
+
+    @property
+    def ects(self) -> int:
+        return self._ects
+
+    @ects.setter
+    def ects(self, value: int):
+        old = getattr(self, "_ects", None)
+        self._ects = value
+        if old is not None and old != value:
+            self._emit("ects_changed", old=old, new=value)
+
+    @property
+    def status(self) -> ModuleStatus:
+        return self._status
+
+    @status.setter
+    def status(self, value: ModuleStatus):
+        old = getattr(self, "_status", None)
+        self._status = value
+        if old is not None and old != value:
+            self._emit("status_changed", old=old, new=value)
+
+    def _emit(self, event: str, **payload):
+        """
+        Forward a change event to the semester (and program) this module belongs to.
+        """
+        if self.semester is not None:
+            self.semester._emit(event, module=self, **payload)
 
     def get_grade(self) -> float:
         """
         Get the average grade for the module.
         """
-        if not self.exam_performances:
+        if not self._exam_grades:
             return 0.0
-        total_grade = sum(performance.grade for performance in self.exam_performances)
-        return total_grade / len(self.exam_performances)
+        return sum(self._exam_grades) / len(self._exam_grades)
+
+    def get_passed_grades(self) -> List[float]:
+        """
+        Get the grades of all passed exam performances.
+        """
+        if self._raw is not None:
+            return [exam["grade"] for exam in self._raw.get("exam_performances", []) if exam["passed"]]
+        return [grade for grade, passed in zip(self._exam_grades, self._exam_passed) if passed]
+
+    def get_learning_hours(self) -> float:
+        """
+        Get the total number of hours spent learning for the module.
+        """
+        if self._raw is not None:
+            return sum(lt["hours"] for lt in self._raw.get("learning_times", []))
+        return self._lt_prefix[-1] if self._lt_prefix else 0.0
+
+    def _hours_before_index(self, index: int) -> float:
+        return self._lt_prefix[index - 1] if index > 0 else 0.0
+
+    def get_learning_hours_before(self, day: date) -> float:
+        """
+        Get the hours of all learning times before the given day (O(log n)).
+        """
+        return self._hours_before_index(bisect_left(self._lt_dates, day.toordinal()))
+
+    def get_learning_hours_between(self, start: date = None, end: date = None) -> float:
+        """
+        Get the hours learned from start to end (both inclusive, open if None) in O(log n).
+        """
+        low = bisect_left(self._lt_dates, start.toordinal()) if start else 0
+        high = bisect_right(self._lt_dates, end.toordinal()) if end else len(self._lt_dates)
+        return self._hours_before_index(high) - self._hours_before_index(low) if high > low else 0.0
+
+    def get_first_learning_date(self) -> date:
+        """
+        Get the date of the earliest learning time (None if there is none).
+        """
+        return date.fromordinal(self._lt_dates[0]) if self._lt_dates else None
+
+    def get_learning_time_rollup(self, period: str = "week", start: date = None, end: date = None) -> list:
+        """
+        Get (period start, hours) for every week or month from start to end (default:
+        the first learning time to today), including periods without learning time.
+        """
+        start = start or self.get_first_learning_date()
+        if start is None:
+            return []
+        boundaries = period_starts(start, end or date.today(), period)
+        cumulative = [self.get_learning_hours_before(boundary) for boundary in boundaries]
+        return [(boundaries[i], cumulative[i + 1] - cumulative[i]) for i in range(len(boundaries) - 1)]
+
+    def get_exam_count(self) -> int:
+        """
+        Get the number of exam performances of the module.
+        """
+        if self._raw is not None:
+            return len(self._raw.get("exam_performances", []))
+        return len(self._exam_grades)
+
+    def get_learning_time_count(self) -> int:
+        """
+        Get the number of learning time entries of the module.
+        """
+        if self._raw is not None:
+            return len(self._raw.get("learning_times", []))
+        return len(self._lt_hours)
     
     def to_dict(self) -> dict:
         """
         Convert the module to a dictionary representation.
         """
+        if self._raw is not None:
+            return {
+                "title": self.title,
+                "ects": self.ects,
+                "status": self.status.value,
+                "exam_performances": [dict(exam) for exam in self._raw.get("exam_performances", [])],
+                "learning_times": [dict(lt) for lt in self._raw.get("learning_times", [])]
+            }
         return {
             "title": self.title,
             "ects": self.ects,
             "status": self.status.value,
             "exam_performances": [
-                {"grade": e.grade, "attempt": e.attempt, "passed": e.passed}
-                for e in self.exam_performances
+                {"grade": grade, "attempt": attempt, "passed": bool(passed)}
+                for grade, attempt, passed in zip(self._exam_grades, self._exam_attempts, self._exam_passed)
             ],
             "learning_times": [
-                {"date": lt.date.isoformat(), "hours": lt.hours}
-                for lt in self.learning_times
+                {"date": date.fromordinal(ordinal).isoformat(), "hours": hours}
+                for ordinal, hours in zip(self._lt_dates, self._lt_hours)
             ]
         }
     
     @staticmethod
-    def from_dict(data: dict):
+    def from_dict(data: dict, lazy: bool = False):
         """
         Create a Module instance from a dictionary representation.
+        With lazy=True the exam performances and learning times are built on first access.
         """
         module = Module(
             title=data["title"],
             ects=data["ects"],
             status=ModuleStatus(data["status"])
         )
-        for exam in data.get("exam_performances", []):
-            module.exam_performances.append(ExamPerformance(
-                grade=exam["grade"],
-                attempt=exam["attempt"],
-                passed=exam["passed"]
-            ))
-        for learning_time in data.get("learning_times", []):
-            module.learning_times.append(LearningTime(
-                date=date.fromisoformat(learning_time["date"]),
-                hours=learning_time["hours"]
-            ))
+        if lazy:
+            for field in Module._PACKED_FIELDS:
+                delattr(module, field)
+            module._raw = data
+            return module
+        exams = data.get("exam_performances", [])
+        module._exam_grades.extend(exam["grade"] for exam in exams)
+        module._exam_attempts.extend(exam["attempt"] for exam in exams)
+        module._exam_passed.extend(exam["passed"] for exam in exams)
+        module._set_learning_times(data.get("learning_times", []))
         return module
     
     def add_exam_performance(self, performance: ExamPerformance):
         """
         Add an exam performance to the module.
         """
-        self.exam_performances.append(performance)
+        self._exam_grades.append(performance.grade)
+        self._exam_attempts.append(performance.attempt)
+        self._exam_passed.append(performance.passed)
+        self._emit("exam_added", exam=performance)
 
     def add_learning_time(self, learning_time: LearningTime):
         """
-        Add a learning time entry for the module.
+        Add a learning time entry for the module, keeping the entries sorted by date.
         """
-        self.learning_times.append(learning_time)
+        ordinal = learning_time.date.toordinal()
+        if not self._lt_dates or ordinal >= self._lt_dates[-1]:
+            # The common case: logging today's (or the newest) learning time
+            self._lt_dates.append(ordinal)
+            self._lt_hours.append(learning_time.hours)
+            self._lt_prefix.append(self._hours_before_index(len(self._lt_prefix)) + learning_time.hours)
+        else:
+            # Backfilled entry: insert it and recompute the cumulative sums from there
+            index = bisect_right(self._lt_dates, ordinal)
+            self._lt_dates.insert(index, ordinal)
+            self._lt_hours.insert(index, learning_time.hours)
+            self._lt_prefix[index:] = array("d", accumulate(self._lt_hours[index:], initial=self._hours_before_index(index)))[1:]
+        self._emit("learning_time_added", learning_time=learning_time)
+
+    def add_learning_times(self, learning_times: list):
+        """
+        Add several learning time entries at once, e.g. from an import. The entries are
+        sorted and merged into the arrays in one pass, so backfilling many old entries
+        recomputes the cumulative sums once instead of once per entry.
+        """
+        learning_times = sorted(learning_times, key=lambda learning_time: learning_time.date)
+        if not learning_times:
+            return
+        # Existing entries stay before new ones of the same date, like in add_learning_time
+        index = bisect_right(self._lt_dates, learning_times[0].date.toordinal())
+        merged = list(merge(zip(self._lt_dates[index:], self._lt_hours[index:]),
+                            ((learning_time.date.toordinal(), learning_time.hours) for learning_time in learning_times),
+                            key=lambda entry: entry[0]))
+        self._lt_dates[index:] = array("i", (ordinal for ordinal, _ in merged))
+        self._lt_hours[index:] = array("d", (hours for _, hours in merged))
+        self._lt_prefix[index:] = array("d", accumulate(self._lt_hours[index:], initial=self._hours_before_index(index)))[1:]
+        for learning_time in learning_times:
+            self._emit("learning_time_added", learning_time=learning_time)
 
     def __repr__(self):
         return f"Module(name={self.title}, status={self.status}, exam_performances={self.exam_performances}, learning_times={self.learning_times}, ects={self.ects})"
@@ -127,8 +472,11 @@ class Semester:
     """
     Class representing a semester in a course.
     """
+    __slots__ = ("number", "program", "modules")
+
     def __init__(self, number: int):
         self.number = number
+        self.program = None
         self.modules: List[Module] = []
 
     def add_module(self, module: Module):
@@ -136,6 +484,23 @@ class Semester:
         Add a module to the semester.
         """
         self.modules.append(module)
+        module.semester = self
+        self._emit("module_added", module=module)
+
+    def remove_module(self, module: Module):
+        """
+        Remove a module from the semester.
+        """
+        self.modules.remove(module)
+        self._emit("module_removed", module=module)
+        module.semester = None
+
+    def _emit(self, event: str, **payload):
+        """
+        Forward a change event to the study program this semester belongs to.
+        """
+        if self.program is not None:
+            self.program._emit(event, semester=self, **payload)
 
     def get_modules(self) -> List[Module]:
         """
@@ -150,7 +515,7 @@ class Semester:
         }
     
     @staticmethod
-    def from_dict(data: dict):  
+    def from_dict(data: dict, lazy: bool = False):
         """
         Create a Semester instance from a dictionary representation.
         """
@@ -158,7 +523,7 @@ class Semester:
             number=data["number"]
         )
         for module_data in data.get("modules", []):
-            semester.add_module(Module.from_dict(module_data))
+            semester.add_module(Module.from_dict(module_data, lazy=lazy))
         return semester
 
     def __repr__(self):
@@ -167,11 +532,99 @@ class Semester:
 class StudyProgram:
     """
     Class representing a study program.
+
+    Semesters are indexed by number and modules by (semester number, normalized title);
+    the indexes are kept up to date through the change events. Every change event also
+    bumps version, so views derived from the data can be cached per version.
     """
+    __slots__ = ("_name", "_regular_study_period", "semesters", "version", "_listeners", "_semester_index", "_module_index")
+
     def __init__(self, name: str, regular_study_period: int = 6):
         self.name = name
         self.regular_study_period = regular_study_period
         self.semesters: List[Semester] = []
+        # Monotonically increasing data version, bumped by every change event
+        self.version = 0
+        self._listeners = []
+        self._semester_index = {}
+        self._module_index = {}
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._set_field("name", value)
+
+    @property
+    def regular_study_period(self) -> int:
+        return self._regular_study_period
+
+    @regular_study_period.setter
+    def regular_study_period(self, value: int):
+        self._set_field("regular_study_period", value)
+
+    def _set_field(self, field: str, value):
+        old = getattr(self, "_" + field, None)
+        setattr(self, "_" + field, value)
+        if old is not None and old != value:
+            self._emit("program_changed", field=field, old=old, new=value)
+
+    def get_semester(self, number: int) -> Semester:
+        """
+        Get the semester with the given number (None if it does not exist).
+        """
+        return self._semester_index.get(number)
+
+    def get_module(self, semester_number: int, title: str) -> Module:
+        """
+        Get a module by semester number and (not necessarily normalized) title, None if it does not exist.
+        """
+        return self._module_index.get((semester_number, normalize_title(title)))
+
+    def add_semester(self, semester: Semester):
+        """
+        Add a semester to the study program.
+        """
+        self.semesters.append(semester)
+        semester.program = self
+        self._emit("semester_added", semester=semester)
+
+    def subscribe(self, listener):
+        """
+        Register a callback that is called as listener(event, **payload) on every change.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """
+        Remove a previously registered change listener.
+        """
+        self._listeners.remove(listener)
+
+    def _emit(self, event: str, **payload):
+        self.version += 1
+        self._update_index(event, **payload)
+        for listener in self._listeners:
+            listener(event, **payload)
+
+    def _update_index(self, event: str, semester=None, module=None, **payload):
+        if event == "semester_added":
+            self._semester_index[semester.number] = semester
+            for semester_module in semester.modules:
+                self._module_index[(semester.number, semester_module.normalized_title)] = semester_module
+        elif event == "module_added":
+            self._module_index[(semester.number, module.normalized_title)] = module
+        elif event == "module_removed":
+            key = (semester.number, module.normalized_title)
+            if self._module_index.get(key) is module:
+                del self._module_index[key]
+        elif event == "title_changed":
+            key = (semester.number, normalize_title(payload["old"]))
+            if self._module_index.get(key) is module:
+                del self._module_index[key]
+            self._module_index[(semester.number, module.normalized_title)] = module
 
     def get_progress(self) -> float:
         """
@@ -196,17 +649,19 @@ class StudyProgram:
             "semesters": [semester.to_dict() for semester in self.semesters]
         }
 
-    @staticmethod  
-    def from_dict(data: dict):
+    @staticmethod
+    def from_dict(data: dict, lazy: bool = False):
         """
         Create a StudyProgram instance from a dictionary representation.
+        With lazy=True the exam performances and learning times of each module are
+        only deserialized when they are first accessed.
         """
         study_program = StudyProgram(
             name=data["name"],
             regular_study_period=data["regular_study_period"]
         )
         for semester_data in data.get("semesters", []):
-            study_program.semesters.append(Semester.from_dict(semester_data))
+            study_program.add_semester(Semester.from_dict(semester_data, lazy=lazy))
         return study_program
 
     def __repr__(self):
@@ -1,24 +1,63 @@
-from classes import StudyProgram, Semester, Module, ModuleStatus
-from classes import ExamPerformance, LearningTime
-from data_manager import DataManager
+from classes import StudyProgram, ModuleStatus, normalize_title
+from data_manager import DataManager, StaleWriteError
 from progress_monitor import ProgressMonitor
+import operations
+import io
+import math
+import shutil
+import sys
 from datetime import date
-import plotext as plt
-import re
 
 STUDY_DATA_FILE = "study_data.json"
+
+# Learning times listed per module by "Display Progress" (the latest ones)
+RECENT_LEARNING_TIMES = 5
+
+_plotext = None
+
+def get_plotext():
+    # plotext is only imported when the dashboard is shown for the first time
+    global _plotext
+    if _plotext is None:
+        import plotext
+        _plotext = plotext
+    return _plotext
+
 class CLIController:
-    def __init__(self, data_manager: DataManager, study_program: StudyProgram, progress_monitor: ProgressMonitor):
+    def __init__(self, data_manager: DataManager, study_program: StudyProgram = None,
+                 progress_monitor: ProgressMonitor = None, loader=None):
         self.data_manager = data_manager
         self.study_program = study_program
         self.progress_monitor = progress_monitor
+        # Optional callable returning (study_program, progress_monitor) once loading has finished
+        self._loader = loader
+        # Panel name -> ((data version, terminal size), rendered text)
+        self._render_cache = {}
+        self._snapshot_cache = None
+
+    def _ensure_loaded(self):
+        if self._loader is not None:
+            self.study_program, self.progress_monitor = self._loader()
+            self._loader = None
+
+    def reload_external_changes(self):
+        # Merge edits another process made to the data file, so the next save does not overwrite them
+        diff = self.data_manager.reload_changes(self.study_program)
+        if diff:
+            print(f"The data file was changed outside this program ({diff.summary()}).")
+
+    def save_changes(self):
+        # Another process may have changed the same data in between; conflicting changes are not saved
+        try:
+            self.data_manager.commit(self.study_program)
+        except StaleWriteError as error:
+            print(f"{error} The change was not saved.")
 
     def get_semester(self, number: int):
-        return next((s for s in self.study_program.semesters if s.number == number), None)
+        return self.study_program.get_semester(number)
 
     def get_module(self, semester, module_name: str):
-        normalized_input = self.normalize_string(module_name)
-        return next((m for m in semester.get_modules() if self.normalize_string(m.title) == normalized_input), None)
+        return self.study_program.get_module(semester.number, module_name)
 
     def list_modules_in_semester(self, semester):
         if not semester.modules:
@@ -39,9 +78,23 @@ class CLIController:
         print("7. Exit")
     
     def handle_user_input(self):
+        try:
+            self._run_menu_loop()
+        finally:
+            # Make sure saves still queued in the background writer reach the disk
+            try:
+                self.data_manager.flush()
+            except StaleWriteError as error:
+                print(error)
+
+    def _run_menu_loop(self):
         while True:
             self.display_menu()
             choice = input("Please choose an Option: ")
+            if choice in ("1", "2", "3", "4", "5", "6"):
+                # The study program may still be loading in the background
+                self._ensure_loaded()
+                self.reload_external_changes()
             if choice == "1":
                 self.add_module()
             elif choice == "2":
@@ -61,80 +114,53 @@ class CLIController:
                 print("Invalid choice. Please try again.")
 
     def normalize_string(self, input_string: str) -> str:
-        return re.sub(r'\s+', ' ', input_string.strip().lower())
+        return normalize_title(input_string)
     
-    def add_module(self):
-        title = input("Enter module name: ")
-        normalized_title = self.normalize_string(title)
-
-        # ECTS points input with validation
+    def _prompt(self, message: str, parse):
+        # Ask until the input passes the shared validation of the operations module
         while True:
             try:
-                ects = int(input("Enter ECTS points (only 5 or 10 allowed): "))
-                if ects in (5, 10):
-                    break
-                else:
-                    print("Invalid input. ECTS points must be either 5 or 10.")
-            except ValueError:
-                print("Invalid input. Please enter a valid integer (5 or 10).")
-    
+                return parse(input(message))
+            except ValueError as error:
+                print(f"Invalid input. {error}")
 
-        # Semester number input with validation
-        while True:
-            try:
-                semester_number = int(input("Enter semester number (1 to 6): "))
-                if 1 <= semester_number <= 6:
-                    break
-                else:
-                    print("Invalid input. Semester number must be between 1 and 6.")
-            except ValueError:
-                print("Invalid input. Please enter a valid integer for the semester number.")
-        
-        # Find or create the semester
-        semester = next((s for s in self.study_program.semesters if s.number == semester_number), None)
+    def _prompt_module(self):
+        # Ask for a semester and one of its modules; prints why and returns None if there is none
+        semester_number = self._prompt("Enter semester number (1-6): ", operations.parse_semester_number)
+        semester = self.get_semester(semester_number)
         if not semester:
-            semester = Semester(semester_number)
-            self.study_program.semesters.append(semester)
+            print(f"No semester found with number {semester_number}.")
+            return None
+
+        self.list_modules_in_semester(semester)
+
+        module_name = input("Enter module name: ")
+        try:
+            return operations.find_module(self.study_program, semester_number, module_name)
+        except ValueError as error:
+            print(error)
+            return None
 
-        # Check for duplicate module
-        existing_module = next(
-            (m for m in semester.modules if m.normalized_title == normalized_title),
-            None
-        )
+    def add_module(self):
+        title = input("Enter module name: ")
+        ects = self._prompt("Enter ECTS points (only 5 or 10 allowed): ", operations.parse_ects)
+        semester_number = self._prompt("Enter semester number (1 to 6): ", operations.parse_semester_number)
 
-        if existing_module:
-            print(f"Module '{title}' already exists in semester {semester_number}.")
+        try:
+            operations.add_module(self.study_program, title, ects, semester_number)
+        except ValueError as error:
+            print(error)
             return
-        
-        # Create and add the module
-        module = Module(normalized_title, ects, status=ModuleStatus.OPEN)
-        semester.add_module(module)
 
         print(f"Module '{title}' added to semester {semester_number}.")
 
-        self.data_manager.save_data(self.study_program.to_dict())
+        self.save_changes()
 
     def edit_module(self):
-        # Semester number input with validation
-        while True:
-            try:
-                semester_number = int(input("Enter semester number (1-6): "))
-                if 1 <= semester_number <= 6:
-                    break
-                else:
-                    print("Invalid input. Semester number must be between 1 and 6.")
-            except ValueError:
-                print("Invalid input. Please enter a valid integer for the semester number.")
-
-        semester = self.get_semester(semester_number)
-        if not semester:
-            print(f"No semester found with number {semester_number}.")
+        module = self._prompt_module()
+        if not module:
             return
-        
-        self.list_modules_in_semester(semester)
-
-        module_name = input("Enter module name: ")
-        module = self.get_module(semester, module_name)
+        semester_number = module.semester.number
 
         print(f"\nEditing module '{module.title}' in semester {semester_number}:")
         print("1. Edit Module Name")
@@ -145,250 +171,190 @@ class CLIController:
 
         choice = input("Select an option: ")
 
-        if choice == "1":
-            new_title = input("Enter new module name: ")
-            normalized_new_title = self.normalize_string(new_title)
-
-            # Check for duplicate module name
-            if any(self.normalize_string(m.title) == normalized_new_title and m != module for m in semester.get_modules()):
-                print(f"Module '{new_title}' already exists in semester {semester_number}.")
+        try:
+            if choice == "1":
+                new_title = input("Enter new module name: ")
+                operations.rename_module(self.study_program, semester_number, module.title, new_title)
+                print(f"Module name changed to '{new_title}'.")
+            elif choice == "2":
+                new_ects = self._prompt("Enter new ECTS points (only 5 or 10 allowed): ", operations.parse_ects)
+                operations.set_ects(self.study_program, semester_number, module.title, new_ects)
+                print(f"ECTS points changed to {new_ects}.")
+            elif choice == "3":
+                new_semester_number = self._prompt("Enter new semester number (1-6): ", operations.parse_semester_number)
+                operations.move_module(self.study_program, semester_number, module.title, new_semester_number)
+                print(f"Module '{module.title}' moved to semester {new_semester_number}.")
+            elif choice == "4":
+                confirm = input(f"Are you sure you want to delete the module '{module.title}'? (y/n): ")
+                if confirm.lower() == 'y':
+                    operations.delete_module(self.study_program, semester_number, module.title)
+                    print(f"Module '{module.title}' deleted from semester {semester_number}.")
+                else:
+                    print("Deletion cancelled.")
+            elif choice == "5":
+                print("Cancelled editing.")
                 return
-            
-            module.title = normalized_new_title
-            print(f"Module name changed to '{new_title}'.")
-        elif choice == "2":
-            while True:
-                try:
-                    new_ects = int(input("Enter new ECTS points (only 5 or 10 allowed): "))
-                    if new_ects in (5, 10):
-                        module.ects = new_ects
-                        print(f"ECTS points changed to {new_ects}.")
-                        break
-                    else:
-                        print("Invalid input. ECTS points must be either 5 or 10.")
-                except ValueError:
-                    print("Invalid input. Please enter a valid integer (5 or 10).")
-        elif choice == "3":
-            while True:
-                try:
-                    new_semester_number = int(input("Enter new semester number (1-6): "))
-                    if 1 <= new_semester_number <= 6:
-                        break
-                    else:
-                        print("Invalid input. Semester number must be between 1 and 6.")
-                except ValueError:
-                    print("Invalid input. Please enter a valid integer for the semester number.")
-
-            new_semester = next((s for s in self.study_program.semesters if s.number == new_semester_number), None)
-            if not new_semester:
-                new_semester = Semester(new_semester_number)
-                self.study_program.semesters.append(new_semester)
-
-            # Remove module from current semester and add to new semester
-            semester.modules.remove(module)
-            new_semester.add_module(module)
-            print(f"Module '{module.title}' moved to semester {new_semester_number}.")
-
-        elif choice == "4":
-            confirm = input(f"Are you sure you want to delete the module '{module.title}'? (y/n): ")
-            if confirm.lower() == 'y':
-                semester.modules.remove(module)
-                print(f"Module '{module.title}' deleted from semester {semester_number}.")
             else:
-                print("Deletion cancelled.")
-        elif choice == "5":
-            print("Cancelled editing.")
+                print("Invalid option.")
+        except ValueError as error:
+            print(error)
             return
-        else:
-            print("Invalid option.")
 
-        self.data_manager.save_data(self.study_program.to_dict())
+        self.save_changes()
         print("Changes saved successfully.")
 
-    
     def input_grades(self):
-
-        # Semester number input with validation
-        while True:
-                try:
-                    semester_number = int(input("Enter semester number (1-6): "))
-                    if 1 <= semester_number <= 6:
-                        break
-                    else:
-                        print("Invalid input. Semester number must be between 1 and 6.")
-                except ValueError:
-                    print("Invalid input. Please enter a valid integer for the semester number.")
-
-        semester = self.get_semester(semester_number)
-        if not semester:
-            print(f"No semester found with number {semester_number}.")
-            return
-
-        self.list_modules_in_semester(semester)
-
-        module_name = input("Enter module name: ")
-        module = self.get_module(semester, module_name)
-
+        module = self._prompt_module()
         if not module:
-            print(f"No module found with name '{module_name}' in semester {semester_number}.")
-            return
-        
-        # Check if module is already passed
-        if module.status == ModuleStatus.PASSED:
-            print(f"Module '{module_name}' has already been passed. No more grades can be entered.")
             return
 
-        # Check if attempts >= 3
-        if len(module.exam_performances) >= 3:
-            print(f"Module '{module_name}' has already been attempted 3 times and is considered failed.")
-            module.status = ModuleStatus.FAILED
+        # Already passed or out of attempts: no grade prompt
+        try:
+            operations.check_can_add_grade(module)
+        except ValueError as error:
+            print(error)
             return
 
         # Grade input with validation (allowing decimal points)
-        while True:
-            try:
-                grade = float(input("Enter grade (1.0 to 5.0, where ≤4.0 is passing): ")
-).replace(',', '.')
-                if 1.00 <= grade <= 5.00:
-                    break
-                else:
-                    print("Invalid input. Grade must be between 1.00 and 5.00.")
-            except ValueError:
-                print("Invalid input. Please enter a valid number for the grade.")
-
-        attempt = len(module.exam_performances) + 1
-        passed = grade <= 4.0
-
-        # Add exam performance correctly
-        module.exam_performances.append(ExamPerformance(grade=grade, attempt=attempt, passed=passed))
+        grade = self._prompt("Enter grade (1.0 to 5.0, where ≤4.0 is passing): ", operations.parse_grade)
+        operations.add_grade(self.study_program, module.semester.number, module.title, grade)
 
-        # Update status
-        module.status = ModuleStatus.PASSED if passed else ModuleStatus.FAILED
+        print(f"Grade {grade} added to module '{module.title}'.")
 
-        print(f"Grade {grade} added to module '{module_name}'.")
-
-        self.data_manager.save_data(self.study_program.to_dict())
+        self.save_changes()
     
     def add_learning_time(self):
-
-        # Semester number input with validation
-        while True:
-            try:
-                semester_number = int(input("Enter semester number (1-6): "))
-                if 1 <= semester_number <= 6:
-                    break
-                else:
-                    print("Invalid input. Semester number must be between 1 and 6.")
-            except ValueError:
-                print("Invalid input. Please enter a valid integer for the semester number.")
-                return
-
-        semester = self.get_semester(semester_number)
-        if not semester:
-            print(f"No semester found with number {semester_number}.")
-            return
-        
-        self.list_modules_in_semester(semester)
-
-        module_name = input("Enter module name: ")
-        module = self.get_module(semester, module_name)
-
-
+        module = self._prompt_module()
         if not module:
-            print(f"No module found with name '{module_name}' in semester {semester_number}.")
             return
 
-        while True:
-            try:
-                hours = float(input("Enter learning hours: ").replace(",", "."))
-                if hours >= 0:
-                    break
-                else:
-                    print("Invalid input. Learning hours must be a non-negative number.")
-            except ValueError:
-                print("Invalid input. Please enter a valid number for the learning hours.")
-                return
+        hours = self._prompt("Enter learning hours: ", operations.parse_hours)
+        learning_time = operations.log_time(self.study_program, module.semester.number, module.title, hours)
 
-        today = date.today()
-        module.learning_times.append(LearningTime(date=today, hours=hours))
+        print(f"Added {hours} learning hours to module '{module.title}' on {learning_time.date}.")
 
-        print(f"Added {hours} learning hours to module '{module_name}' on {today}.")
-
-        self.data_manager.save_data(self.study_program.to_dict())
+        self.save_changes()
     
     def calc_progress(self):
         progress = self.progress_monitor.calc_study_progress()
         print(f"Study progress: {progress:.2f}%")
     
+    def _write(self, text: str, page: bool = False):
+        """
+        Write a rendered view to the terminal with a single call. With page=True long
+        output is shown one screen at a time when stdout is an interactive terminal.
+        """
+        lines = text.splitlines(keepends=True)
+        height = shutil.get_terminal_size().lines - 1
+        if not page or not sys.stdout.isatty() or len(lines) <= height:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+            return
+        for start in range(0, len(lines), height):
+            sys.stdout.write("".join(lines[start:start + height]))
+            sys.stdout.flush()
+            if start + height < len(lines):
+                if input("-- More -- (Enter: next page, q: quit) ").strip().lower() == "q":
+                    return
+
     def show_dashboard(self):
-        print("\n--- DASHBOARD ---")
-        print(f"Timeline: Sem 1 - {self.study_program.regular_study_period} (3 Years)")
+        self._write(self.render_dashboard())
+
+    def render_dashboard(self) -> str:
+        """
+        Render the whole dashboard into a string (used by show_dashboard, tests and benchmarks).
+        """
+        out = io.StringIO()
+        # Collect all metrics and plot series in a single pass over the study program
+        # (reused until the data changes)
+        snapshot = self._dashboard_snapshot()
+
+        print("\n--- DASHBOARD ---", file=out)
+        print(f"Timeline: Sem 1 - {self.study_program.regular_study_period} (3 Years)", file=out)
         
         # Total number of semesters and calculated progress
-        completed_percentage = self.progress_monitor.calc_study_progress()
+        completed_percentage = snapshot.study_progress
         
         # Display study progress
-        print("=" * 30)
-        print(f"Study Progress: {completed_percentage:.1f}%")
+        print("=" * 30, file=out)
+        print(f"Study Progress: {completed_percentage:.1f}%", file=out)
         
         # Progress bar over the entire timeline (6 semesters)
         progress_bar_length = 40  # Length of the progress bar
         completed_length = int(progress_bar_length * completed_percentage / 100)
         progress_bar = '█' * completed_length + '-' * (progress_bar_length - completed_length)
-        print(f"Timeline: |{progress_bar}| {completed_percentage:.1f}% completed")
+        print(f"Timeline: |{progress_bar}| {completed_percentage:.1f}% completed", file=out)
 
-        avg_grade = self.progress_monitor.calc_grade_average()
-        study_progress = self.progress_monitor.calc_study_progress()
-        avg_learning_time = self.progress_monitor.calc_average_learning_time()
-
-        print(f"\nAvg. Grade: {avg_grade:.2f} | Study Prog.: {study_progress:.1f}% | Avg. Learn Time: {avg_learning_time:.1f} h")
+        print(f"\nAvg. Grade: {snapshot.grade_average:.2f} | Study Prog.: {snapshot.study_progress:.1f}% | Avg. Learn Time: {snapshot.average_learning_time:.1f} h", file=out)
         
-        # Calculation of planned learning time and actual learning time
-        planned_learning_time = sum(module.ects * 25 for semester in self.study_program.semesters for module in semester.modules)
-        actual_learning_time = sum(
-            sum(lt.hours for lt in module.learning_times)
-            for semester in self.study_program.semesters for module in semester.modules
-        )
-
-        print("\nLearning Time (Module):")
-        print(f"  Planned Learning Time: {planned_learning_time:.1f} hours")
-        print(f"  Actual Learning Time: {actual_learning_time:.1f} hours")
+        # Planned learning time and actual learning time
+        planned_learning_time = snapshot.planned_learning_time
+        actual_learning_time = snapshot.actual_learning_time
+
+        print("\nLearning Time (Module):", file=out)
+        print(f"  Planned Learning Time: {planned_learning_time:.1f} hours", file=out)
+        print(f"  Actual Learning Time: {actual_learning_time:.1f} hours", file=out)
         if actual_learning_time < planned_learning_time:
-            print(f"  You are behind by {planned_learning_time - actual_learning_time:.1f} hours.")
+            print(f"  You are behind by {planned_learning_time - actual_learning_time:.1f} hours.", file=out)
         elif actual_learning_time > planned_learning_time:
-            print(f"  You are ahead by {actual_learning_time - planned_learning_time:.1f} hours.")
+            print(f"  You are ahead by {actual_learning_time - planned_learning_time:.1f} hours.", file=out)
         else:
-            print("  You are right on track with your planned learning time.")
+            print("  You are right on track with your planned learning time.", file=out)
+
+        print("\nGrade Progression:", file=out)
+        print(self._cached_panel("grade_progression", self._render_grade_progression, snapshot), file=out)
+
+        print("\nLearning Time (Module):", file=out)
+        print(self._cached_panel("learning_time", self._render_learning_time, snapshot), file=out)
 
-        print("\nGrade Progression:")
-        self.plot_terminal_grade_progression()
+        print("\nExam Status:", file=out)
+        out.write(self._render_exam_status(snapshot))
 
-        print("\nLearning Time (Module):")
-        self.plot_terminal_learning_time()
+        print("\nRecent Study Intensity:", file=out)
+        out.write(self._render_recent_study_intensity(snapshot))
+        return out.getvalue()
 
-        print("\nExam Status:")
-        self.show_terminal_exam_status()
+    def show_progress(self, max_learning_times: int = RECENT_LEARNING_TIMES):
+        self._write(self.render_progress(max_learning_times), page=True)
 
-    def show_progress(self):
-        print("\n--- STUDY PROGRESS ---")
+    def render_progress(self, max_learning_times: int = None) -> str:
+        """
+        Render the study progress into a string, with only the latest max_learning_times
+        learning times per module (all of them if None).
+        """
+        out = io.StringIO()
+        print("\n--- STUDY PROGRESS ---", file=out)
         for semester in self.study_program.semesters:
-            print(f"Semester {semester.number}:")
+            print(f"Semester {semester.number}:", file=out)
             for module in semester.get_modules():
-                print(f"  Module: {module.title}, ECTS: {module.ects}, Status: {module.status}")
+                print(f"  Module: {module.title}, ECTS: {module.ects}, Status: {module.status}", file=out)
                 if module.exam_performances:
                     for ep in module.exam_performances:
-                        print(f"    Exam Performance: Grade: {ep.grade}, Attempt: {ep.attempt}, Passed: {ep.passed}")
+                        print(f"    Exam Performance: Grade: {ep.grade}, Attempt: {ep.attempt}, Passed: {ep.passed}", file=out)
                 else:
-                    print("    No exam performances recorded.")
-                if module.learning_times:
-                    print("    Learning Times:")
-                    for lt in module.learning_times:
-                        print(f"      Date: {lt.date}, Hours: {lt.hours}")
+                    print("    No exam performances recorded.", file=out)
+                learning_times = module.learning_times
+                if learning_times:
+                    print("    Learning Times:", file=out)
+                    # Learning times are sorted by date, so the latest ones are at the end
+                    hidden = len(learning_times) - max_learning_times if max_learning_times is not None else 0
+                    if hidden > 0:
+                        shown = learning_times[hidden:]
+                        hidden_hours = module.get_learning_hours() - sum(lt.hours for lt in shown)
+                        print(f"      ... {hidden} earlier entries ({hidden_hours:.1f} hours) not shown", file=out)
+                    else:
+                        shown = learning_times
+                    for lt in shown:
+                        print(f"      Date: {lt.date}, Hours: {lt.hours}", file=out)
                 else:
-                    print("    No learning times recorded.")
+                    print("    No learning times recorded.", file=out)
+        return out.getvalue()
     
     def display_progress_bar(self, label: str, value: float, max_value: float = 100, bar_length: int = 40):
         # Display a progress bar in the terminal
+        self._write(self.format_progress_bar(label, value, max_value, bar_length) + "\n")
+
+    def format_progress_bar(self, label: str, value: float, max_value: float = 100, bar_length: int = 40) -> str:
         if bar_length is None:
             bar_length = max(20, 40)  # Default to 40 if None is provided
         
@@ -402,35 +368,43 @@ class CLIController:
         
         # Format the output
         percentage = (value / max_value) * 100
-        print(f"{label:6}: |{bar}| {percentage:5.1f}%")
-
-    def plot_terminal_grade_progression(self):
-        import plotext as plt
-        import math
-
-        semester_grades = {}
-
-        # Iterate through semesters and modules to collect grades
-        for semester in self.study_program.semesters:
-            for module in semester.modules:
-                for ep in module.exam_performances:
-                    if ep.passed and ep.grade is not None:
-                        semester_grades.setdefault(semester.number, []).append(ep.grade)
-
-        if not semester_grades:
-            print("No exam performances available for plotting.")
-            return
+        return f"{label:6}: |{bar}| {percentage:5.1f}%"
+
+    def _dashboard_snapshot(self):
+        # The snapshot only changes with the data version (and the date, for the recent weeks)
+        key = (self.study_program.version, date.today())
+        if self._snapshot_cache is None or self._snapshot_cache[0] != key:
+            self._snapshot_cache = (key, self.progress_monitor.build_dashboard_snapshot())
+        return self._snapshot_cache[1]
+
+    def _cached_panel(self, panel: str, render, snapshot=None) -> str:
+        """
+        Return the rendered text of a dashboard panel, rendering it only if the data
+        version or the terminal size changed since it was last rendered.
+        """
+        key = (self.study_program.version, tuple(shutil.get_terminal_size()))
+        cached = self._render_cache.get(panel)
+        if cached is None or cached[0] != key:
+            cached = (key, render(snapshot or self._dashboard_snapshot()))
+            self._render_cache[panel] = cached
+        return cached[1]
+
+    def plot_terminal_grade_progression(self, snapshot=None):
+        self._write(self._cached_panel("grade_progression", self._render_grade_progression, snapshot) + "\n")
+
+    def _render_grade_progression(self, snapshot) -> str:
+        semester_averages = snapshot.semester_grade_averages
+
+        if not semester_averages:
+            return "No exam performances available for plotting."
+
+        plt = get_plotext()
 
         semesters = list(range(1, 7))
         avg_grades = []
 
         for s in semesters:
-            grades = semester_grades.get(s)
-            if grades:
-                avg = sum(grades) / len(grades)
-                avg_grades.append(avg)
-            else:
-                avg_grades.append(float('nan'))
+            avg_grades.append(semester_averages.get(s, float('nan')))
 
         # Invert grades for plotting (1.0 becomes 5.0, 5.0 becomes 1.0)
         inverted_grades = [6 - g if not math.isnan(g) else float('nan') for g in avg_grades]
@@ -458,46 +432,53 @@ class CLIController:
 
         plt.plot(semesters, inverted_grades, marker='hd', color="cyan", label="Ø Grade")
         plt.grid(False)
-        plt.show()
+        return plt.build()
 
-    def show_terminal_exam_status(self):
-        passed = 0
-        open = 0
-        failed = 0
+    def show_terminal_exam_status(self, snapshot=None):
+        self._write(self._render_exam_status(snapshot or self._dashboard_snapshot()))
 
-        for semester in self.study_program.semesters:
-            for module in semester.modules:
-                if module.status == ModuleStatus.PASSED:
-                    passed += 1
-                elif module.status == ModuleStatus.FAILED:
-                    failed += 1
-                else:
-                    open += 1
+    def _render_exam_status(self, snapshot) -> str:
+        passed = snapshot.status_counts[ModuleStatus.PASSED]
+        open = snapshot.status_counts[ModuleStatus.OPEN]
+        failed = snapshot.status_counts[ModuleStatus.FAILED]
 
         total = passed + open + failed
 
         if total == 0:
-            print("Keine Module zum Anzeigen des Prüfungsstatus verfügbar.")
-            return
-
-        print("\n--- EXAM STATUS OVERVIEW ---")
-        self.display_progress_bar("Passed", (passed / total) * 100)
-        self.display_progress_bar("Open", (open / total) * 100)
-        self.display_progress_bar("Failed", (failed / total) * 100)
-
-    def plot_terminal_learning_time(self):
-        module_titles = []
-        actual_times = []
-        planned_times = []
-
-        for semester in self.study_program.semesters:
-            for module in semester.modules:
-                module_titles.append(module.title)
-                actual_time = sum(lt.hours for lt in module.learning_times)
-                actual_times.append(actual_time)
-                planned_times.append(module.ects * 25)
+            return "Keine Module zum Anzeigen des Prüfungsstatus verfügbar.\n"
+
+        lines = ["", "--- EXAM STATUS OVERVIEW ---"]
+        lines.append(self.format_progress_bar("Passed", (passed / total) * 100))
+        lines.append(self.format_progress_bar("Open", (open / total) * 100))
+        lines.append(self.format_progress_bar("Failed", (failed / total) * 100))
+        return "\n".join(lines) + "\n"
+
+    def show_recent_study_intensity(self, snapshot=None):
+        self._write(self._render_recent_study_intensity(snapshot or self._dashboard_snapshot()))
+
+    def _render_recent_study_intensity(self, snapshot) -> str:
+        weeks = snapshot.recent_weekly_hours
+        if not any(hours for _, hours in weeks):
+            return "No learning time logged in the last weeks.\n"
+
+        # One bar per week, scaled to the busiest week
+        largest = max(hours for _, hours in weeks)
+        lines = []
+        for week_start, hours in weeks:
+            bar = '█' * round(40 * hours / largest)
+            lines.append(f"  Week of {week_start}: |{bar:40}| {hours:5.1f} h")
+        return "\n".join(lines) + "\n"
+
+    def plot_terminal_learning_time(self, snapshot=None):
+        self._write(self._cached_panel("learning_time", self._render_learning_time, snapshot) + "\n")
+
+    def _render_learning_time(self, snapshot) -> str:
+        module_titles = snapshot.module_titles
+        actual_times = snapshot.module_actual_times
+        planned_times = snapshot.module_planned_times
 
         if module_titles:
+            plt = get_plotext()
             x = list(range(len(module_titles)))  # x-Achse numerisch
 
             plt.clear_figure()
@@ -511,9 +492,9 @@ class CLIController:
             plt.bar([i + 0.2 for i in x], planned_times, label="Planned", color="red", width=0.2)
             plt.xticks([i + 0.2 for i in x], module_titles)
 
-            plt.show()
+            return plt.build()
         else:
-            print("Keine Module mit Lernzeiten zum Plotten vorhanden.")
+            return "Keine Module mit Lernzeiten zum Plotten vorhanden."
 
 if __name__ == "__main__":
     cli_controller = CLIController()
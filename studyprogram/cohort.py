@@ -0,0 +1,222 @@
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from classes import StudyProgram
+from data_manager import DataManager
+from progress_monitor import ProgressTotals
+from serializers import DECOMPRESSION_ERRORS, JsonSerializer, detect_serializer, open_data_file
+from streaming_loader import aggregate_file
+
+# Files handed to a worker process at once
+CHUNK_SIZE = 64
+
+# Errors of a damaged, malformed (e.g. a module without "status") or unreadable data file
+FILE_ERRORS = (OSError, ValueError, KeyError, TypeError, AttributeError, IndexError, struct.error) + DECOMPRESSION_ERRORS
+
+class Distribution:
+    """
+    Fixed-bin histogram of a metric across students. Mergeable, so workers can
+    build partial distributions without keeping the individual values.
+    """
+    def __init__(self, lower: float, upper: float, bins: int):
+        self.lower = lower
+        self.upper = upper
+        self.counts = [0] * bins
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value: float):
+        width = (self.upper - self.lower) / len(self.counts)
+        index = min(max(int((value - self.lower) / width), 0), len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        for value in (other.minimum, other.maximum):
+            if value is not None:
+                self.minimum = value if self.minimum is None else min(self.minimum, value)
+                self.maximum = value if self.maximum is None else max(self.maximum, value)
+        return self
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Approximate a percentile by interpolating inside the histogram bin it falls into.
+        """
+        if not self.count:
+            return 0
+        width = (self.upper - self.lower) / len(self.counts)
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= target:
+                value = self.lower + width * (index + (target - seen) / count)
+                return min(max(value, self.minimum), self.maximum)
+            seen += count
+        return self.maximum
+
+    def bin_edges(self):
+        width = (self.upper - self.lower) / len(self.counts)
+        return [(self.lower + i * width, self.lower + (i + 1) * width) for i in range(len(self.counts))]
+
+class CohortAggregate:
+    """
+    Partial (per worker) or final aggregate over a number of study program files.
+    """
+    def __init__(self):
+        self.totals = ProgressTotals()
+        self.files = 0
+        self.failed_files = []
+        self.distributions = {
+            "study_progress": Distribution(0, 100, 10),
+            "grade_average": Distribution(1.0, 5.0, 8),
+            "pass_quote": Distribution(0, 100, 10),
+            # The last bin also collects everything above 2000 hours
+            "learning_hours": Distribution(0, 2000, 20),
+        }
+
+    def add_totals(self, totals: ProgressTotals):
+        """
+        Add the totals of one student's study program.
+        """
+        self.files += 1
+        self.totals.merge(totals)
+        self.distributions["study_progress"].add(totals.study_progress())
+        if totals.passed_grade_count:
+            self.distributions["grade_average"].add(totals.grade_average())
+        self.distributions["pass_quote"].add(totals.pass_quote())
+        self.distributions["learning_hours"].add(totals.learning_hours_sum)
+
+    def merge(self, other):
+        self.totals.merge(other.totals)
+        self.files += other.files
+        self.failed_files.extend(other.failed_files)
+        for name, distribution in self.distributions.items():
+            distribution.merge(other.distributions[name])
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            "files": self.files,
+            "failed_files": self.failed_files,
+            "totals": {field: getattr(self.totals, field) for field in ProgressTotals.FIELDS},
+            "distributions": {
+                name: {
+                    "count": d.count, "mean": d.mean(), "min": d.minimum, "median": d.percentile(0.5),
+                    "p90": d.percentile(0.9), "max": d.maximum,
+                    "histogram": [{"from": low, "to": high, "count": count}
+                                  for (low, high), count in zip(d.bin_edges(), d.counts)],
+                }
+                for name, d in self.distributions.items()
+            },
+        }
+
+def file_totals(path: str):
+    """
+    Totals of one data file, or None if it cannot be loaded. JSON files (also
+    compressed ones) are streamed module by module; other formats are loaded
+    through the DataManager.
+    """
+    with open_data_file(path) as file:
+        serializer = detect_serializer(file.read(16))
+    if isinstance(serializer, JsonSerializer):
+        return aggregate_file(path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = DataManager(path).load_data()
+    if data is None:
+        return None
+    return ProgressTotals.from_study_program(StudyProgram.from_dict(data, lazy=True))
+
+def aggregate_files(paths) -> CohortAggregate:
+    """
+    Worker: aggregate the given files one at a time. A damaged or malformed file
+    is recorded in failed_files and does not stop the others.
+    """
+    aggregate = CohortAggregate()
+    for path in paths:
+        try:
+            totals = file_totals(path)
+        except FILE_ERRORS:
+            totals = None
+        if totals is None:
+            aggregate.failed_files.append(path)
+            continue
+        aggregate.add_totals(totals)
+    return aggregate
+
+def iter_chunks(directory: str, pattern: str, chunk_size: int):
+    chunk = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and fnmatch.fnmatch(entry.name, pattern):
+                chunk.append(entry.path)
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
+
+def analyze_cohort(directory: str, pattern: str = "*.json", workers: int = None, chunk_size: int = CHUNK_SIZE) -> CohortAggregate:
+    """
+    Aggregate all matching study program files of a directory in parallel.
+    """
+    result = CohortAggregate()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(aggregate_files, iter_chunks(directory, pattern, chunk_size)):
+            result.merge(partial)
+    return result
+
+def print_report(result: CohortAggregate):
+    print(f"\n--- COHORT REPORT ({result.files} students) ---")
+    if result.failed_files:
+        print(f"{len(result.failed_files)} file(s) could not be loaded: {', '.join(result.failed_files)}")
+    labels = {
+        "study_progress": "Study Progress (%)",
+        "grade_average": "Avg. Grade",
+        "pass_quote": "Pass Quote (%)",
+        "learning_hours": "Learning Hours",
+    }
+    for name, distribution in result.distributions.items():
+        print(f"\n{labels[name]}:")
+        if not distribution.count:
+            print("  No data.")
+            continue
+        print(f"  mean {distribution.mean():.2f} | min {distribution.minimum:.2f} | median {distribution.percentile(0.5):.2f}"
+              f" | p90 {distribution.percentile(0.9):.2f} | max {distribution.maximum:.2f}")
+        largest = max(distribution.counts)
+        for (low, high), count in zip(distribution.bin_edges(), distribution.counts):
+            bar = '█' * round(30 * count / largest) if largest else ''
+            print(f"  {low:7.1f} - {high:7.1f} | {bar} {count}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate the study programs of a whole cohort")
+    parser.add_argument("directory", help="directory with one study program file per student")
+    parser.add_argument("--pattern", default="*.json", help="file name pattern (default: *.json)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="files per worker task")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    result = analyze_cohort(args.directory, args.pattern, args.workers, args.chunk_size)
+    if args.json:
+        print(json.dumps(result.to_dict(), indent=4))
+    else:
+        print_report(result)
+
+if __name__ == "__main__":
+    main()
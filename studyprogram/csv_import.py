@@ -0,0 +1,148 @@
+import csv
+from itertools import islice
+from classes import StudyProgram, LearningTime, normalize_title
+import operations
+
+# Rows validated and applied at a time
+CHUNK_SIZE = 5000
+
+LEARNING_TIME_COLUMNS = ("semester", "module", "date", "hours")
+EXAM_COLUMNS = ("semester", "module", "grade", "attempt")
+
+class ImportReport:
+    """
+    Result of a CSV import: number of imported rows and the rejected rows with the reason.
+    """
+    def __init__(self):
+        self.imported = 0
+        self.rejected = []
+
+    def reject(self, line_number: int, row: list, message: str):
+        self.rejected.append((line_number, row, message))
+
+    def write_rejected(self, file):
+        """
+        Write the rejected rows as CSV with the line number and reason as extra columns.
+        """
+        writer = csv.writer(file)
+        writer.writerow(["line", "error", "row"])
+        for line_number, row, message in self.rejected:
+            writer.writerow([line_number, message, *row])
+
+class _ModuleResolver:
+    """
+    Resolves (semester, module title) cells to modules through the study program's
+    index, remembering the result for every distinct pair of raw cell values.
+    """
+    def __init__(self, study_program: StudyProgram):
+        self.study_program = study_program
+        self.cache = {}
+
+    def resolve(self, semester: str, title: str):
+        key = (semester, title)
+        if key not in self.cache:
+            # A module, or the error message for cells that do not name one
+            try:
+                number = operations.parse_semester_number(semester)
+                module = self.study_program.get_module(number, normalize_title(title))
+                self.cache[key] = module or f"No module found with name '{title}' in semester {number}."
+            except ValueError as error:
+                self.cache[key] = str(error)
+        result = self.cache[key]
+        if isinstance(result, str):
+            raise ValueError(result)
+        return result
+
+def _read_rows(file, columns: tuple):
+    """
+    Yield (line number, row, {column: value}) for every data row. The delimiter is
+    detected; a header row (with the column names in any order) is optional.
+    """
+    first_line = file.readline()
+    file.seek(0)
+    # Exports with ';' or tabs often use a decimal comma, so ',' only wins if it is the most frequent
+    delimiter = max((";", "\t", ","), key=first_line.count)
+    reader = csv.reader(file, delimiter=delimiter)
+    positions = {column: index for index, column in enumerate(columns)}
+    for row in reader:
+        header = [cell.strip().lower() for cell in row]
+        if reader.line_num == 1 and set(columns) <= set(header):
+            positions = {column: header.index(column) for column in columns}
+            continue
+        if not any(cell.strip() for cell in row):
+            continue
+        if len(row) <= max(positions.values()):
+            yield reader.line_num, row, None
+            continue
+        yield reader.line_num, row, {column: row[index].strip() for column, index in positions.items()}
+
+def _chunks(rows, chunk_size: int):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def import_learning_times(study_program: StudyProgram, file, chunk_size: int = CHUNK_SIZE) -> ImportReport:
+    """
+    Import learning times from a CSV file with the columns semester, module, date, hours.
+    """
+    report = ImportReport()
+    resolver = _ModuleResolver(study_program)
+    for chunk in _chunks(_read_rows(file, LEARNING_TIME_COLUMNS), chunk_size):
+        # Validate the whole chunk first, then add the valid rows
+        valid = []
+        for line_number, row, values in chunk:
+            if values is None:
+                report.reject(line_number, row, f"Expected the columns {', '.join(LEARNING_TIME_COLUMNS)}.")
+                continue
+            try:
+                module = resolver.resolve(values["semester"], values["module"])
+                if not values["date"]:
+                    # parse_date would fall back to today
+                    raise ValueError("Missing date.")
+                learning_time = LearningTime(operations.parse_date(values["date"]), operations.parse_hours(values["hours"]))
+            except ValueError as error:
+                report.reject(line_number, row, str(error))
+                continue
+            valid.append((module, learning_time))
+        # One merge per module, so importing backfilled (e.g. newest first) rows is not quadratic
+        by_module = {}
+        for module, learning_time in valid:
+            by_module.setdefault(id(module), (module, []))[1].append(learning_time)
+        for module, learning_times in by_module.values():
+            module.add_learning_times(learning_times)
+        report.imported += len(valid)
+    return report
+
+def import_exam_results(study_program: StudyProgram, file, chunk_size: int = CHUNK_SIZE) -> ImportReport:
+    """
+    Import exam results from a CSV file with the columns semester, module, grade, attempt.
+    Attempts have to follow the ones already recorded (1, 2, 3); the status is updated as
+    for a grade entered in the menu.
+    """
+    report = ImportReport()
+    resolver = _ModuleResolver(study_program)
+    for chunk in _chunks(_read_rows(file, EXAM_COLUMNS), chunk_size):
+        valid = []
+        for line_number, row, values in chunk:
+            if values is None:
+                report.reject(line_number, row, f"Expected the columns {', '.join(EXAM_COLUMNS)}.")
+                continue
+            try:
+                module = resolver.resolve(values["semester"], values["module"])
+                grade = operations.parse_grade(values["grade"])
+            except ValueError as error:
+                report.reject(line_number, row, str(error))
+                continue
+            valid.append((line_number, row, module, grade, values["attempt"] or None))
+        # Attempts depend on the rows before, so they are checked while adding
+        for line_number, row, module, grade, attempt in valid:
+            try:
+                operations.record_grade(module, grade, attempt)
+            except ValueError as error:
+                report.reject(line_number, row, str(error))
+                continue
+            report.imported += 1
+    return report
@@ -1,33 +1,538 @@
+import atexit
+import hashlib
 import json
+import os
+import stat
+import struct
+import tempfile
+import threading
+import time
+from journal import ChangeRecorder, apply_records, encode_record
+from history import HistoryStore
+from locking import FileLock
+from program_diff import merge_program
+from serializers import JsonSerializer, detect_serializer, get_serializer
+from serializers import DECOMPRESSION_ERRORS, compression_for_path, detect_compression, get_compression
+
+# Journal size in bytes after which the journal is folded back into the snapshot
+COMPACT_THRESHOLD = 256 * 1024
+
+# Seconds a background write waits for further saves before it is written
+DEBOUNCE_SECONDS = 0.5
+
+def file_signature(path: str):
+    """
+    (modification time in ns, size) of a file, None if it does not exist.
+    """
+    try:
+        status = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return status.st_mtime_ns, status.st_size
+
+def file_digest(path: str):
+    """
+    SHA-256 of the file content, None if it does not exist.
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+class StaleWriteError(Exception):
+    """
+    Raised when a save would overwrite changes another process made to the data file
+    and they cannot be merged.
+    """
+
+class _HashingWriter:
+    """
+    File wrapper hashing everything written through it, so a save knows the digest
+    of the file without reading it back.
+    """
+    def __init__(self, file):
+        self.file = file
+        self.digest = hashlib.sha256()
+
+    def write(self, data: bytes):
+        self.digest.update(data)
+        return self.file.write(data)
+
+    def flush(self):
+        self.file.flush()
+
+    # Enough of the binary file interface for io.TextIOWrapper (see JsonSerializer)
+    closed = False
+
+    def writable(self) -> bool:
+        return True
+
+    def readable(self) -> bool:
+        return False
+
+    def seekable(self) -> bool:
+        return False
 
 class DataManager:
     """
     Class to manage data loading and saving for the study program.
+
+    The file format is pluggable (see serializers.py): storage_format selects
+    "json" or "binary" for saving. Without it, files are saved in the format
+    they were loaded in (JSON for new files). load_data detects the format from
+    the first bytes of the file.
+
+    Files can be stored compressed: compression selects "gzip", "xz" or "none" and
+    compression_level the level (0-9). Without it, files keep the compression they
+    were loaded with, and new files are compressed according to their extension
+    (.gz, .xz). The serializer writes straight into the compressor and reads straight
+    from the decompressor; compressed files are recognised by their magic bytes.
+
+    In journal mode every mutation is appended as one compact record to a journal
+    file next to the JSON snapshot. Loading replays the journal on top of the
+    snapshot, and once the journal grows past compact_threshold it is folded back
+    into the snapshot.
+
+    With write_behind=True, save_data only hands the data to a background thread
+    which coalesces saves arriving within debounce seconds into a single write.
+    Call flush() to wait until everything has been written. Every write goes to a
+    temporary file that is fsynced and atomically renamed into place.
+
+    The modification time, size and content hash of the files are remembered on
+    every load and save. reload_changes() uses them to notice edits made by another
+    process and merges only the semesters and modules that differ into the live
+    study program; an unchanged file costs a single stat() per check.
+
+    Several processes may write the same file. Writes take an exclusive advisory
+    lock on "<file>.lock" only for the write itself (never across user prompts) and
+    every snapshot carries a revision counter. A write is stale when the file was
+    changed since this DataManager last loaded or wrote it: with auto_merge the
+    change records since then are replayed onto the current file, otherwise (or if
+    they no longer apply) StaleWriteError is raised. Reads take no lock; snapshots
+    are replaced atomically and a half-appended journal line is ignored.
+
+    With history=True every commit is also recorded in a HistoryStore
+    ("<file>.history") as a delta of its change records, so past states can be
+    rebuilt (see ProgressMonitor.at). When the file was changed without being
+    recorded (another writer without history, merged external changes), the next
+    commit is recorded as a checkpoint instead.
     """
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, journal: bool = False, compact_threshold: int = COMPACT_THRESHOLD,
+                 write_behind: bool = False, debounce: float = DEBOUNCE_SECONDS, storage_format: str = None,
+                 auto_merge: bool = True, history: bool = False, compression: str = None,
+                 compression_level: int = None):
         self.file_path = file_path
+        self.storage_format = storage_format
+        self.serializer = get_serializer(storage_format) if storage_format else JsonSerializer()
+        self.compression_format = compression
+        self.compression = get_compression(compression, compression_level) if compression else compression_for_path(file_path)
+        self.compression_level = compression_level
+        self.journal = journal
+        self.journal_path = file_path + ".journal"
+        self.compact_threshold = compact_threshold
+        self.write_behind = write_behind
+        self.debounce = debounce
+        self._recorder = None
+        # Sequence number of the last record written to (or replayed from) the journal
+        self._journal_seq = 0
+        # Path -> (signature, digest) of the files as this DataManager last loaded or wrote them
+        self._file_states = {}
+        self.auto_merge = auto_merge
+        self._lock = FileLock(file_path + ".lock")
+        # Revision of the snapshot on disk as of the last load or write
+        self.revision = 0
+        # Set when a merged write left the live study program behind the file
+        self._needs_reload = False
+        self.history = HistoryStore(file_path + ".history") if history else None
+        if write_behind:
+            self._start_writer()
+
+    def save_data(self, data, records: list = None):
+        """
+        Save data to the file in the configured storage format.
+        records are the change records data contains beyond the last load or save;
+        without them a stale save cannot be merged and is rejected.
+        """
+        if self.write_behind:
+            self._raise_write_error()
+            with self._condition:
+                # Coalesced saves need the records of all of them
+                if self._pending is None:
+                    self._pending_records = records
+                elif self._pending_records is not None:
+                    self._pending_records = None if records is None else self._pending_records + records
+                self._pending = data
+                self._generation += 1
+                self._condition.notify_all()
+            return
+        self._write_snapshot(data, records)
+        print(f"File {self.file_path} saved.")
 
-    def save_data(self, data):
+    def flush(self):
         """
-        Save data to a JSON file.
+        Block until all saves handed to the background writer have been written.
         """
-        with open(self.file_path, "w", encoding="utf-8") as file:  
-            json.dump(data, file, indent=4)
-        print(f"File {self.file_path} saved.")  
+        if not self.write_behind:
+            return
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._pending is not None or self._writing:
+                self._condition.wait()
+            self._flush_requested = False
+        self._raise_write_error()
+
+    def _save_pending(self) -> bool:
+        with self._condition:
+            return self._pending is not None or self._writing
+
+    def close(self):
+        """
+        Flush pending saves and stop the background writer.
+        """
+        if not self.write_behind or self._closed:
+            return
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._writer.join()
+
+    def _write_atomic(self, data):
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.file_path) + ".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                writer = _HashingWriter(file)
+                if self.compression is None:
+                    self.serializer.dump(data, writer)
+                else:
+                    with self.compression.writer(writer, self.compression_level) as stream:
+                        self.serializer.dump(data, stream)
+                file.flush()
+                os.fsync(file.fileno())
+            if os.path.exists(self.file_path):
+                os.chmod(tmp_path, stat.S_IMODE(os.stat(self.file_path).st_mode))
+            os.replace(tmp_path, self.file_path)
+            self._file_states[self.file_path] = (file_signature(self.file_path), writer.digest.hexdigest())
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _start_writer(self):
+        self._condition = threading.Condition()
+        self._pending = None
+        self._pending_records = None
+        self._generation = 0
+        self._writing = False
+        self._flush_requested = False
+        self._closed = False
+        self._write_error = None
+        self._writer = threading.Thread(target=self._writer_loop, name="DataManagerWriter", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _writer_loop(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                # Debounce: keep waiting while new saves come in, but never longer than 10 debounce intervals
+                deadline = time.monotonic() + 10 * self.debounce
+                while not self._flush_requested and not self._closed and time.monotonic() < deadline:
+                    generation = self._generation
+                    self._condition.wait(self.debounce)
+                    if self._generation == generation:
+                        break
+                data, self._pending = self._pending, None
+                records, self._pending_records = self._pending_records, None
+                self._writing = True
+            try:
+                self._write_snapshot(data, records)
+            except Exception as error:
+                self._write_error = error
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def _raise_write_error(self):
+        error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+
+    def _read(self):
+        """
+        Read the snapshot as it is on disk; returns (data, serializer, compression).
+        """
+        with open(self.file_path, "rb") as raw:
+            compression = detect_compression(raw.read(16))
+            raw.seek(0)
+            file = compression.reader(raw) if compression else raw
+            serializer = detect_serializer(file.read(16))
+            file.seek(0)
+            if serializer is None:
+                raise ValueError("unknown file format")
+            return serializer.load(file), serializer, compression
 
     def load_data(self):
         """
-        Load data from a JSON file.
+        Load data from the file, detecting its storage format.
         """
+        # Remembered before reading: a change made meanwhile is picked up by the next check
+        self._remember_file(self.file_path)
+        if self.journal:
+            self._remember_file(self.journal_path)
         try:
-            with open(self.file_path, "r", encoding="utf-8") as file:  
-                data = json.load(file)
-            print(f"File {self.file_path} loaded.")  
-            return data
+            data, serializer, compression = self._read()
+            print(f"File {self.file_path} loaded.")
         except FileNotFoundError:
-            print(f"File {self.file_path} not found.")  
+            print(f"File {self.file_path} not found.")
             return None
         except json.JSONDecodeError:
-            print(f"Error decoding JSON from file {self.file_path}.") 
+            print(f"Error decoding JSON from file {self.file_path}.")
             return None
+        except (ValueError, struct.error) + DECOMPRESSION_ERRORS as error:
+            print(f"Error decoding file {self.file_path}: {error}")
+            return None
+        if not self.storage_format:
+            # Keep saving in the format the file already has
+            self.serializer = serializer
+        if not self.compression_format:
+            self.compression = compression
+        self.revision = data.pop("revision", 0)
+        if self.journal:
+            self._replay_journal(data)
+        self._needs_reload = False
+        if self.history is not None:
+            # The first state of a history is the one it started from
+            with self._lock:
+                if not len(self.history):
+                    self.history.record(None, lambda: data, self._history_state())
+        return data
 
+    def attach(self, study_program):
+        """
+        Start recording the changes of a study program. The records are appended to
+        the journal in journal mode and replayed onto the file when a save is stale.
+        """
+        if self._recorder is None:
+            self._recorder = ChangeRecorder()
+            study_program.subscribe(self._recorder)
+
+    def commit(self, study_program):
+        """
+        Persist the changes made to a study program since the last commit.
+        """
+        records = self._recorder.drain() if self._recorder is not None else None
+        self._commit(records, study_program.to_dict)
+
+    def take_changes(self, study_program) -> tuple:
+        """
+        Take the change records since the last commit together with a full dictionary
+        of the study program, for commit_changes. Both are taken at once, so the
+        study program may change again while commit_changes runs on another thread.
+        """
+        records = self._recorder.drain() if self._recorder is not None else None
+        return records, study_program.to_dict()
+
+    def commit_changes(self, records: list, data: dict):
+        """
+        Persist changes taken with take_changes; does not touch the study program.
+        """
+        self._commit(records, lambda: data)
+
+    def _commit(self, records: list, full_state):
+        if not self.journal or self._recorder is None or not os.path.exists(self.file_path):
+            self._compact(records, full_state())
+            return
+
+        if records:
+            with self._lock:
+                if self._is_stale():
+                    # Check that the records still apply on top of the other process' changes
+                    merged = self._merge_onto_current(records)
+                    full_state = lambda: merged
+                base = self._history_state()
+                self._repair_journal()
+                with open(self.journal_path, "a", encoding="utf-8") as file:
+                    for record in records:
+                        self._journal_seq += 1
+                        record["seq"] = self._journal_seq
+                        file.write(encode_record(record))
+                self._remember_file(self.journal_path)
+                if self.history is not None:
+                    self.history.record(records, full_state, self._history_state(), base)
+            print(f"{len(records)} change(s) appended to {self.journal_path}.")
+
+        if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > self.compact_threshold:
+            self._compact([], full_state())
+
+    def compact(self, study_program):
+        """
+        Write a full snapshot of the study program and clear the journal.
+        """
+        self._compact(*self.take_changes(study_program))
+
+    def _compact(self, records: list, data: dict):
+        if not self.journal:
+            self.save_data(data, records)
+            return
+        # Snapshot and journal removal happen under one lock, so no append in between is lost
+        self.flush()
+        with self._lock:
+            self._write_snapshot(data, records)
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self._remember_file(self.journal_path)
+        print(f"File {self.file_path} saved.")
+
+    def _write_snapshot(self, data: dict, records: list = None):
+        """
+        Write a snapshot under the file lock, merging or rejecting it if it is stale.
+        """
+        with self._lock:
+            if self._is_stale():
+                data = self._merge_onto_current(records)
+            base = self._history_state()
+            data = dict(data, revision=self.revision + 1)
+            if self.journal:
+                # Records up to this sequence number are contained in the snapshot
+                data["journal_seq"] = self._journal_seq
+            self._write_atomic(data)
+            self.revision = data["revision"]
+            if self.history is not None:
+                self.history.record(records, lambda: data, self._history_state(), base)
+
+    def _history_state(self) -> str:
+        """
+        Identifies the content of the file (and journal) as of the last load or write.
+        """
+        return f"{self.revision}.{self._journal_seq}"
+
+    def _is_stale(self) -> bool:
+        if not os.path.exists(self.file_path) or self.file_path not in self._file_states:
+            # A new file, or one this DataManager never read: nothing to lose
+            return False
+        return (self._needs_reload or self._file_changed(self.file_path)
+                or (self.journal and self._file_changed(self.journal_path)))
+
+    def _merge_onto_current(self, records: list) -> dict:
+        """
+        Replay change records onto the current content of the file (called with the lock held).
+        """
+        if records is None or not self.auto_merge:
+            raise StaleWriteError(f"{self.file_path} was changed by another process; the save was rejected.")
+        data = self._read()[0]
+        self.revision = data.pop("revision", 0)
+        if self.journal:
+            self._replay_journal(data)
+        try:
+            apply_records(data, records)
+        except (KeyError, TypeError, AttributeError, ValueError) as error:
+            raise StaleWriteError(f"{self.file_path} was changed by another process "
+                                  f"in a way that conflicts with the unsaved changes: {error!r}") from error
+        # The live study program lacks the other process' changes until it is reloaded
+        self._needs_reload = True
+        return data
+
+    def _remember_file(self, path: str):
+        self._file_states[path] = (file_signature(path), file_digest(path))
+
+    def _file_changed(self, path: str) -> bool:
+        known_signature, known_digest = self._file_states.get(path, (None, None))
+        signature = file_signature(path)
+        if signature == known_signature:
+            return False
+        digest = file_digest(path)
+        if digest != known_digest:
+            return True
+        # Touched, but the content is the same
+        self._file_states[path] = (signature, digest)
+        return False
+
+    def has_external_changes(self) -> bool:
+        """
+        Check whether the data file (or its journal) was changed since this DataManager
+        last loaded or wrote it. A file that was deleted does not count; it is written
+        again on the next save. While a background save is pending the check is
+        deferred (returns False) instead of waiting for it: the save merges external
+        changes itself, and the first check after it reports them.
+        """
+        if self.write_behind and self._save_pending():
+            return False
+        if not os.path.exists(self.file_path):
+            return False
+        return (self._needs_reload or self._file_changed(self.file_path)
+                or (self.journal and self._file_changed(self.journal_path)))
+
+    def reload_changes(self, study_program):
+        """
+        Merge changes another process made to the data file into the live study program.
+        Returns the applied ProgramDiff, or None if the file is unchanged or unreadable.
+        """
+        return self.merge_changes(study_program, self.read_changes())
+
+    def read_changes(self):
+        """
+        Load the data file if another process changed it (None if it is unchanged or
+        unreadable); does not touch the study program. See merge_changes.
+        """
+        if not self.has_external_changes():
+            return None
+        return self.load_data()
+
+    def merge_changes(self, study_program, data: dict):
+        """
+        Merge data returned by read_changes into the live study program.
+        """
+        if data is None:
+            return None
+        # The merged changes are already on disk and must not be recorded again
+        if self._recorder is not None:
+            study_program.unsubscribe(self._recorder)
+        try:
+            return merge_program(study_program, data)
+        finally:
+            if self._recorder is not None:
+                study_program.subscribe(self._recorder)
+
+    def _replay_journal(self, data: dict):
+        self._journal_seq = data.get("journal_seq", 0)
+        if not os.path.exists(self.journal_path):
+            return
+        replayed = []
+        with open(self.journal_path, "rb") as file:
+            for line in file:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete record")
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn last line: an interrupted append, or one still being written
+                    # by another process (reads take no lock); _repair_journal removes it
+                    break
+                if record["seq"] > self._journal_seq:
+                    replayed.append(record)
+        # Applied together, so backfilled learning times are merged once per module
+        apply_records(data, replayed)
+        if replayed:
+            self._journal_seq = replayed[-1]["seq"]
+        print(f"{len(replayed)} change(s) replayed from {self.journal_path}.")
+
+    def _repair_journal(self):
+        """
+        Cut off a torn last line left behind by an interrupted append (called with the lock held).
+        """
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb+") as file:
+            content = file.read()
+            if content and not content.endswith(b"\n"):
+                file.truncate(content.rfind(b"\n") + 1)
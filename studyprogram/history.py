@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from journal import apply_records
+
+# Deltas after which the next full checkpoint is written
+CHECKPOINT_INTERVAL = 100
+
+CHECKPOINT = "checkpoint"
+DELTA = "delta"
+
+class HistoryStore:
+    """
+    Append-only history of every saved state of a study program.
+
+    Each line is "<ISO timestamp>\\t<kind>\\t<state>\\t<JSON>": a checkpoint holds the
+    full program dictionary, a delta the journal records (see journal.py) that lead from
+    the previous state to this one. state identifies the saved file content (DataManager
+    uses revision and journal sequence number). A delta is only written when it starts
+    from the last recorded state; changes that were not recorded (a writer without a
+    history, merged external edits) are bridged by a checkpoint. A checkpoint is also
+    written every checkpoint_interval deltas, so rebuilding any past state parses one
+    checkpoint and at most that many small deltas. The timestamps, kinds and states are
+    indexed without parsing the JSON.
+
+    Appends are made by DataManager while it holds the file lock, so several
+    processes can share one history file.
+    """
+    def __init__(self, path: str, checkpoint_interval: int = CHECKPOINT_INTERVAL):
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+        # Parallel lists: timestamp, byte offset, kind and state of every entry
+        self._times = []
+        self._offsets = []
+        self._kinds = []
+        self._states = []
+        # Byte offset up to which the file has been indexed
+        self._indexed = 0
+        self._lock = threading.Lock()
+
+    def _refresh_index(self):
+        """
+        Index the entries appended since the last call (also those of other processes).
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as file:
+            file.seek(self._indexed)
+            offset = self._indexed
+            for line in file:
+                if not line.endswith(b"\n"):
+                    # A torn last line, or one still being appended
+                    break
+                fields = line.split(b"\t", 3)
+                self._times.append(fields[0].decode("ascii"))
+                self._offsets.append(offset)
+                self._kinds.append(fields[1].decode("ascii"))
+                # Lines written before states were recorded have no state field
+                self._states.append(fields[2].decode("ascii") if len(fields) == 4 else "")
+                offset += len(line)
+            self._indexed = offset
+
+    def __len__(self):
+        with self._lock:
+            self._refresh_index()
+            return len(self._times)
+
+    def _append(self, kind: str, state: str, payload, time: datetime = None):
+        line = f"{(time or datetime.now()).isoformat(timespec='microseconds')}\t{kind}\t{state}\t"
+        line += json.dumps(payload, separators=(",", ":")) + "\n"
+        with open(self.path, "a", encoding="utf-8") as file:
+            # Cut off a torn line left behind by an interrupted append
+            if file.tell() > self._indexed:
+                file.truncate(self._indexed)
+            file.write(line)
+        self._refresh_index()
+
+    def record(self, records: list, full_state, state: str, base: str = None, time: datetime = None):
+        """
+        Record the saved state identified by state. It is stored as a delta of the
+        records that produced it if they were applied to base and base is the last
+        recorded state, otherwise as a checkpoint of full_state() (a callable, so the
+        dictionary is only built when needed). A state that is already the last one
+        recorded is skipped.
+        """
+        with self._lock:
+            self._refresh_index()
+            last = self._states[-1] if self._states else None
+            if last == state:
+                return
+            # An empty delta keeps the chain intact when only the state changed (e.g. a compaction)
+            if records is not None and base is not None and last == base:
+                self._append(DELTA, state, records, time)
+                since_checkpoint = len(self._kinds) - 1 - self._last_checkpoint(len(self._kinds) - 1)
+                if since_checkpoint < self.checkpoint_interval:
+                    return
+            self._append(CHECKPOINT, state, full_state(), time)
+
+    def _last_checkpoint(self, index: int) -> int:
+        while self._kinds[index] != CHECKPOINT:
+            index -= 1
+        return index
+
+    def _state_at_index(self, index: int) -> dict:
+        start = self._last_checkpoint(index)
+        with open(self.path, "rb") as file:
+            file.seek(self._offsets[start])
+            data = None
+            for position in range(start, index + 1):
+                fields = file.readline().split(b"\t", 3)
+                try:
+                    if self._kinds[position] == CHECKPOINT:
+                        data = json.loads(fields[-1])
+                    else:
+                        apply_records(data, json.loads(fields[-1]))
+                except (KeyError, TypeError, AttributeError, ValueError) as error:
+                    raise ValueError(f"The history entry of {self._times[position]} in {self.path} "
+                                     f"cannot be replayed: {error!r}") from error
+        return data
+
+    def state_at(self, moment) -> dict:
+        """
+        The program dictionary as it was last saved at the given datetime, or at the
+        end of the given day. None if nothing had been saved by then; ValueError if
+        the history is damaged.
+        """
+        if not isinstance(moment, datetime):
+            moment = datetime.combine(moment + timedelta(days=1), datetime.min.time()) - timedelta(microseconds=1)
+        with self._lock:
+            self._refresh_index()
+            index = bisect_right(self._times, moment.isoformat(timespec="microseconds")) - 1
+            if index < 0:
+                return None
+            return self._state_at_index(index)
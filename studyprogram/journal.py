@@ -0,0 +1,114 @@
+import json
+from operator import itemgetter
+
+class ChangeRecorder:
+    """
+    Listens to the change events of a study program and turns them into
+    compact, JSON-serializable mutation records.
+    """
+    def __init__(self):
+        self.records = []
+
+    def __call__(self, event: str, **payload):
+        record = self.to_record(event, **payload)
+        if record is not None:
+            self.records.append(record)
+
+    @staticmethod
+    def to_record(event: str, semester=None, module=None, **payload):
+        """
+        Convert a change event into a mutation record (or None if it is not persisted).
+        """
+        if event == "semester_added":
+            return {"op": "add_semester", "semester": semester.to_dict()}
+        if event == "module_added":
+            return {"op": "add_module", "semester": semester.number, "module": module.to_dict()}
+        if event == "module_removed":
+            return {"op": "remove_module", "semester": semester.number, "title": module.title}
+        if event == "exam_added":
+            exam = payload["exam"]
+            return {"op": "add_exam", "semester": semester.number, "title": module.title,
+                    "exam": {"grade": exam.grade, "attempt": exam.attempt, "passed": exam.passed}}
+        if event == "learning_time_added":
+            learning_time = payload["learning_time"]
+            return {"op": "add_learning_time", "semester": semester.number, "title": module.title,
+                    "learning_time": {"date": learning_time.date.isoformat(), "hours": learning_time.hours}}
+        if event == "status_changed":
+            return {"op": "set", "semester": semester.number, "title": module.title,
+                    "field": "status", "value": payload["new"].value}
+        if event == "ects_changed":
+            return {"op": "set", "semester": semester.number, "title": module.title,
+                    "field": "ects", "value": payload["new"]}
+        if event == "title_changed":
+            return {"op": "set", "semester": semester.number, "title": payload["old"],
+                    "field": "title", "value": payload["new"]}
+        if event == "program_changed":
+            return {"op": "set_program", "field": payload["field"], "value": payload["new"]}
+        return None
+
+    def drain(self) -> list:
+        """
+        Return all records collected so far and start over with an empty list.
+        """
+        records, self.records = self.records, []
+        return records
+
+def _find_semester(data: dict, number: int) -> dict:
+    return next((s for s in data["semesters"] if s["number"] == number), None)
+
+def _find_module(data: dict, number: int, title: str) -> dict:
+    semester = _find_semester(data, number)
+    if semester is None:
+        return None
+    return next((m for m in semester["modules"] if m["title"] == title), None)
+
+def apply_record(data: dict, record: dict):
+    """
+    Apply a single mutation record to the dictionary representation of a study program.
+    """
+    apply_records(data, (record,))
+
+def apply_records(data: dict, records):
+    """
+    Apply mutation records in order to the dictionary representation of a study program.
+    Learning times are appended and a list that got an older entry is sorted by date
+    once at the end (stable, like Module.add_learning_time), so replaying backfilled
+    entries does not scan or shift the list once per entry.
+    """
+    unsorted = {}
+    try:
+        for record in records:
+            _apply(data, record, unsorted)
+    finally:
+        for learning_times in unsorted.values():
+            learning_times.sort(key=itemgetter("date"))
+
+def _apply(data: dict, record: dict, unsorted: dict):
+    op = record["op"]
+    if op == "add_semester":
+        data.setdefault("semesters", []).append(record["semester"])
+    elif op == "add_module":
+        _find_semester(data, record["semester"])["modules"].append(record["module"])
+    elif op == "remove_module":
+        semester = _find_semester(data, record["semester"])
+        semester["modules"] = [m for m in semester["modules"] if m["title"] != record["title"]]
+    elif op == "add_exam":
+        _find_module(data, record["semester"], record["title"]).setdefault("exam_performances", []).append(record["exam"])
+    elif op == "add_learning_time":
+        learning_times = _find_module(data, record["semester"], record["title"]).setdefault("learning_times", [])
+        learning_time = record["learning_time"]
+        if learning_times and learning_times[-1]["date"] > learning_time["date"]:
+            unsorted[id(learning_times)] = learning_times
+        learning_times.append(learning_time)
+    elif op == "set":
+        _find_module(data, record["semester"], record["title"])[record["field"]] = record["value"]
+    elif op == "set_program":
+        data[record["field"]] = record["value"]
+    else:
+        raise ValueError(f"Unknown journal operation '{op}'.")
+
+def encode_record(record: dict) -> str:
+    """
+    Encode a record as one compact JSON line.
+    """
+    return json.dumps(record, separators=(",", ":")) + "\n"
@@ -1,12 +1,215 @@
+import argparse
+import os
+import sys
 from setup_controller import SetupController
+from data_manager import DataManager, StaleWriteError
+from serializers import COMPRESSIONS, SERIALIZERS
+import operations
+import csv_import
+
+def convert(source: str, target: str, storage_format: str, compression: str = None, compression_level: int = None):
+    # Load in whatever format the source has and save it in the requested format
+    # (compressed as requested, or as the target extension implies)
+    data = DataManager(source).load_data()
+    if data is None:
+        sys.exit(1)
+    DataManager(target, storage_format=storage_format, compression=compression,
+                compression_level=compression_level).save_data(data)
+
+def run_batch(args, apply) -> int:
+    """
+    Load the study program once, let apply(study_program) change it in memory and
+    persist the result with a single commit. apply returns the number of applied
+    operations and a list of (location, error message). Returns the number of rejected ones.
+    """
+    setup = SetupController(args.file, journal=args.journal, write_behind=False, storage_format=args.format,
+                            history=args.history, compression=args.compression,
+                            compression_level=args.compression_level)
+    study_program, data_manager = setup.study_program, setup.data_manager
+    applied, rejected = apply(study_program)
+    for where, message in rejected:
+        print(f"Rejected {where}: {message}", file=sys.stderr)
+    if applied:
+        try:
+            data_manager.commit(study_program)
+        except StaleWriteError as error:
+            # Another process changed the same modules meanwhile; nothing of this run was saved
+            print(f"Rejected all operations: {error}", file=sys.stderr)
+            rejected.append(("commit", str(error)))
+            applied = 0
+    data_manager.close()
+    print(f"{applied} operation(s) applied, {len(rejected)} rejected.")
+    return len(rejected)
+
+def serve(args):
+    """
+    Run the HTTP/JSON API server until it is interrupted.
+    """
+    import asyncio
+    from api_server import ApiServer
+    setup = SetupController(args.file, journal=args.journal, write_behind=not args.sync_writes,
+                            storage_format=args.format, analytics=args.analytics, history=args.history,
+                            compression=args.compression, compression_level=args.compression_level)
+    server = ApiServer(setup.data_manager, setup.study_program, setup.progress_monitor)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        print("Server stopped.")
+    setup.data_manager.close()
+
+def progress_at(args):
+    """
+    Print the progress metrics of the state saved at the end of a past day.
+    """
+    setup = SetupController(args.file, journal=args.journal, write_behind=False, storage_format=args.format,
+                            history=True, compression=args.compression, compression_level=args.compression_level)
+    try:
+        monitor = setup.progress_monitor.at(operations.parse_date(args.date))
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        sys.exit(1)
+    print(f"Progress on {args.date}:")
+    print(f"  Study progress: {monitor.calc_study_progress():.1f}%")
+    print(f"  Grade average: {monitor.calc_grade_average():.2f}")
+    print(f"  Pass quote: {monitor.calc_pass_quote():.1f}%")
+    print(f"  Average learning time: {monitor.calc_average_learning_time():.1f} hours")
+
+def apply_file(path: str):
+    def apply(study_program):
+        with open(path, "r", encoding="utf-8") as file:
+            applied, rejected = operations.apply_lines(study_program, file)
+        return applied, [(f"line {line_number}", message) for line_number, message in rejected]
+    return apply
+
+def import_csv(path: str, importer, rejected_path: str = None):
+    def apply(study_program):
+        # utf-8-sig skips the byte order mark spreadsheet exports often start with
+        with open(path, "r", encoding="utf-8-sig", newline="") as file:
+            report = importer(study_program, file)
+        if rejected_path:
+            with open(rejected_path, "w", encoding="utf-8", newline="") as file:
+                report.write_rejected(file)
+        return report.imported, [(f"line {line_number}", message) for line_number, _, message in report.rejected]
+    return apply
+
+def apply_single(name: str, **fields):
+    def apply(study_program):
+        rejected = operations.apply_operations(study_program, [{"op": name, **fields}])
+        return 1 - len(rejected), [("operation", message) for _, message in rejected]
+    return apply
 
 def main():
+    parser = argparse.ArgumentParser(description="Study progress dashboard")
+    parser.add_argument("--file", default="study_data.json",
+                        help="study program data file (.db/.sqlite/.sqlite3 files use the SQLite backend)")
+    parser.add_argument("--journal", action="store_true",
+                        help="append each change to a journal instead of rewriting the whole file")
+    parser.add_argument("--sync-writes", action="store_true",
+                        help="write every save synchronously instead of in the background")
+    parser.add_argument("--format", choices=sorted(SERIALIZERS), default=None,
+                        help="storage format used when saving (default: keep the format of the file)")
+    parser.add_argument("--compression", choices=["none"] + sorted(COMPRESSIONS), default=None,
+                        help="compression used when saving (default: keep the compression of the file, "
+                             "new .gz/.xz files are compressed accordingly)")
+    parser.add_argument("--compression-level", type=int, choices=range(10), default=None, metavar="0-9",
+                        help="gzip level or xz preset (default: 6)")
+    parser.add_argument("--analytics", choices=("python", "numpy", "auto"), default="python",
+                        help="backend computing the dashboard metrics (auto picks the faster one, currently python; "
+                             "numpy falls back to python if it is not installed)")
+    parser.add_argument("--history", action="store_true",
+                        help="record every saved state in <file>.history for progress-at queries")
+    parser.add_argument("--profile", nargs="?", const="profile.json", default=None, metavar="PATH",
+                        help="time actions, I/O and metrics and write the statistics as JSON on exit "
+                             "(default PATH: profile.json; also enabled by STUDYPROGRAM_PROFILE=PATH)")
+    parser.add_argument("--profile-action", default=None, metavar="ACTION",
+                        help="additionally capture one menu action with cProfile, e.g. show_dashboard")
+    subparsers = parser.add_subparsers(dest="command")
+
+    convert_parser = subparsers.add_parser("convert", help="convert a data file between storage formats")
+    convert_parser.add_argument("source", help="file to read (format is detected)")
+    convert_parser.add_argument("target", help="file to write")
+    convert_parser.add_argument("--to", choices=sorted(SERIALIZERS), required=True, help="target storage format")
+
+    migrate_parser = subparsers.add_parser("migrate", help="migrate a data file into a new SQLite database")
+    migrate_parser.add_argument("source", help="study_data.json (or binary snapshot) to migrate")
+    migrate_parser.add_argument("target", help="SQLite database to create, e.g. study_data.db")
+
+    apply_parser = subparsers.add_parser("apply", help="apply the operations of a JSON Lines file and save once")
+    apply_parser.add_argument("operations", help="file with one operation per line, e.g. "
+                              '{"op": "add_grade", "semester": 1, "module": "Mathematik", "grade": 1.7}')
+
+    add_module_parser = subparsers.add_parser("add-module", help="add a module")
+    add_module_parser.add_argument("semester")
+    add_module_parser.add_argument("title")
+    add_module_parser.add_argument("ects")
+
+    add_grade_parser = subparsers.add_parser("add-grade", help="record the next exam attempt of a module")
+    add_grade_parser.add_argument("semester")
+    add_grade_parser.add_argument("module")
+    add_grade_parser.add_argument("grade")
+
+    log_time_parser = subparsers.add_parser("log-time", help="record learning hours for a module")
+    log_time_parser.add_argument("semester")
+    log_time_parser.add_argument("module")
+    log_time_parser.add_argument("hours")
+    log_time_parser.add_argument("--date", help="YYYY-MM-DD (default: today)")
+
+    for name, columns in (("import-times", csv_import.LEARNING_TIME_COLUMNS), ("import-grades", csv_import.EXAM_COLUMNS)):
+        import_parser = subparsers.add_parser(name, help=f"import a CSV file with the columns {', '.join(columns)} and save once")
+        import_parser.add_argument("csv", help="CSV file (the header row is optional, ',', ';' or tab separated)")
+        import_parser.add_argument("--rejected", help="write the rejected rows with the reason to this CSV file")
+
+    serve_parser = subparsers.add_parser("serve", help="serve the study program and its metrics as a local HTTP/JSON API")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8000, help="port to listen on (default: 8000)")
+
+    progress_at_parser = subparsers.add_parser("progress-at", help="show the progress metrics as saved at the end of a day "
+                                                                   "(needs a history recorded with --history)")
+    progress_at_parser.add_argument("date", help="YYYY-MM-DD")
+
+    args = parser.parse_args()
+
+    # The profiling module (and its method wrappers) is only loaded when profiling is on
+    if args.profile or os.environ.get("STUDYPROGRAM_PROFILE"):
+        from profiling import enable_from_environment
+        enable_from_environment(args.profile, args.profile_action)
+
+    if args.command == "convert":
+        convert(args.source, args.target, args.to, args.compression, args.compression_level)
+        return
+    if args.command == "migrate":
+        from sqlite_data_manager import migrate_json_to_sqlite
+        migrate_json_to_sqlite(args.source, args.target)
+        return
+    batches = {
+        "apply": lambda: apply_file(args.operations),
+        "add-module": lambda: apply_single("add_module", semester=args.semester, title=args.title, ects=args.ects),
+        "add-grade": lambda: apply_single("add_grade", semester=args.semester, module=args.module, grade=args.grade),
+        "import-times": lambda: import_csv(args.csv, csv_import.import_learning_times, args.rejected),
+        "import-grades": lambda: import_csv(args.csv, csv_import.import_exam_results, args.rejected),
+        "log-time": lambda: apply_single("log_time", semester=args.semester, module=args.module, hours=args.hours,
+                                         date=args.date),
+    }
+    if args.command in batches:
+        sys.exit(1 if run_batch(args, batches[args.command]()) else 0)
+    if args.command == "progress-at":
+        progress_at(args)
+        return
+    if args.command == "serve":
+        serve(args)
+        return
+
     # Create the CLIController via the setup (factory) controller
-    controller = SetupController().create_controller()
+    # (the data file is loaded in the background while the menu is displayed)
+    controller = SetupController(args.file, journal=args.journal, write_behind=not args.sync_writes,
+                                 storage_format=args.format, background_load=True,
+                                 analytics=args.analytics, history=args.history,
+                                 compression=args.compression,
+                                 compression_level=args.compression_level).create_controller()
 
     # Start the user input loop (CLI interaction)
     controller.handle_user_input()
 
 # Entry point for the script
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
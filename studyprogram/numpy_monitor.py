@@ -0,0 +1,192 @@
+from datetime import date, timedelta
+from classes import ModuleStatus, check_period, period_starts
+from progress_monitor import ProgressMonitor, ProgressTotals, DashboardSnapshot, RECENT_WEEKS
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional; create_progress_monitor falls back to the pure Python monitor
+    np = None
+
+# Status codes used in the status column
+STATUS_CODES = {status: code for code, status in enumerate(ModuleStatus)}
+
+class ProgramColumns:
+    """
+    The study program as columnar NumPy arrays: one row per module, exam and learning
+    time. Exams and learning times refer to their module by row index.
+    """
+    def __init__(self, study_program):
+        modules = [(semester.number, module) for semester in study_program.semesters for module in semester.modules]
+        self.titles = [module.title for _, module in modules]
+        self.semester = np.array([number for number, _ in modules], dtype=np.int64)
+        self.ects = np.array([module.ects for _, module in modules], dtype=np.int64)
+        self.status = np.array([STATUS_CODES[module.status] for _, module in modules], dtype=np.int8)
+
+        # The packed arrays of the modules expose the buffer protocol, so they are copied without Python loops
+        exam_counts = [len(module._exam_grades) for _, module in modules]
+        lt_counts = [len(module._lt_hours) for _, module in modules]
+        self.exam_module = np.repeat(np.arange(len(modules)), exam_counts)
+        self.exam_grade = self._concatenate([module._exam_grades for _, module in modules], np.float64)
+        self.exam_passed = self._concatenate([module._exam_passed for _, module in modules], np.int8).astype(bool)
+        self.lt_module = np.repeat(np.arange(len(modules)), lt_counts)
+        self.lt_hours = self._concatenate([module._lt_hours for _, module in modules], np.float64)
+        self.lt_dates = self._concatenate([module._lt_dates for _, module in modules], np.int32)
+        self._date_index = None
+        self._module_hours = None
+
+    def module_hours(self):
+        """
+        Learning hours per module (cached like the date index).
+        """
+        if self._module_hours is None:
+            self._module_hours = np.bincount(self.lt_module, weights=self.lt_hours, minlength=len(self.titles))
+        return self._module_hours
+
+    def date_index(self):
+        """
+        All learning time dates sorted, with the cumulative hours in that order;
+        built on the first date query so window sums are two binary searches.
+        """
+        if self._date_index is None:
+            order = np.argsort(self.lt_dates, kind="stable")
+            cumulative = np.concatenate(([0.0], np.cumsum(self.lt_hours[order])))
+            self._date_index = (self.lt_dates[order], cumulative)
+        return self._date_index
+
+    def hours_before(self, ordinals):
+        """
+        Hours of all learning times before each of the given date ordinals.
+        """
+        dates, cumulative = self.date_index()
+        return cumulative[np.searchsorted(dates, ordinals, side="left")]
+
+    @staticmethod
+    def _concatenate(buffers, dtype):
+        parts = [np.frombuffer(buffer, dtype=dtype) for buffer in buffers if len(buffer)]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+class NumpyProgressMonitor(ProgressMonitor):
+    """
+    ProgressMonitor computing every metric as vectorized reductions over ProgramColumns.
+
+    The columns (and the sorted date index) are rebuilt on the first call after any
+    change of the study program. Measured against the incrementally maintained pure
+    Python ProgressMonitor this is slower at every program size, even for cached
+    snapshots, so it is only used when asked for explicitly (backend "numpy"). Results
+    match the pure Python ProgressMonitor up to floating point rounding of the sums.
+    """
+    def __init__(self, study_program, verify: bool = False):
+        if np is None:
+            raise ImportError("NumpyProgressMonitor requires numpy.")
+        self.study_program = study_program
+        self.verify = verify
+        self._columns = None
+        self._totals = None
+        study_program.subscribe(self._on_change)
+
+    def _on_change(self, event: str, **payload):
+        self._columns = None
+        self._totals = None
+
+    @property
+    def columns(self) -> ProgramColumns:
+        if self._columns is None:
+            self._columns = ProgramColumns(self.study_program)
+        return self._columns
+
+    @property
+    def totals(self) -> ProgressTotals:
+        """
+        ProgressTotals reduced from the columns; the calc_* methods of ProgressMonitor derive from them.
+        """
+        if self._totals is None:
+            self._totals = self._reduce_totals(self.columns)
+        return self._totals
+
+    @staticmethod
+    def _reduce_totals(columns: ProgramColumns) -> ProgressTotals:
+        totals = ProgressTotals()
+        passed_modules = columns.status == STATUS_CODES[ModuleStatus.PASSED]
+        passed_grades = columns.exam_grade[columns.exam_passed]
+        totals.total_ects = int(columns.ects.sum())
+        totals.passed_ects = int(columns.ects[passed_modules].sum())
+        totals.module_count = len(columns.ects)
+        totals.modules_with_passed_exam = int(np.unique(columns.exam_module[columns.exam_passed]).size)
+        totals.passed_grade_sum = float(passed_grades.sum())
+        totals.passed_grade_count = int(passed_grades.size)
+        totals.learning_hours_sum = float(columns.lt_hours.sum())
+        totals.learning_time_count = int(columns.lt_hours.size)
+        return totals
+
+    def verify_totals(self):
+        """
+        Recompute the totals with the pure Python code and assert that the vectorized ones match.
+        """
+        expected = ProgressTotals.from_study_program(self.study_program)
+        actual = self.totals
+        assert actual.matches(expected), f"Vectorized {actual} != recomputed {expected}"
+
+    def calc_learning_hours_between(self, start: date = None, end: date = None) -> float:
+        columns = self.columns
+        low = columns.hours_before(start.toordinal()) if start else 0.0
+        high = columns.hours_before(end.toordinal() + 1) if end else self.totals.learning_hours_sum
+        return float(max(high - low, 0.0))
+
+    def calc_learning_time_rollup(self, period: str = "week", start: date = None, end: date = None) -> list:
+        # Checked up front: without learning times the period is never used
+        check_period(period)
+        columns = self.columns
+        if start is None:
+            if not columns.lt_dates.size:
+                return []
+            start = date.fromordinal(int(columns.lt_dates.min()))
+        boundaries = period_starts(start, end or date.today(), period)
+        hours = np.diff(columns.hours_before(np.array([boundary.toordinal() for boundary in boundaries])))
+        return [(boundary, float(value)) for boundary, value in zip(boundaries, hours)]
+
+    def build_dashboard_snapshot(self) -> DashboardSnapshot:
+        """
+        Collect every dashboard metric and plot series with group-by reductions over the columns.
+        """
+        columns = self.columns
+        totals = self._current_totals()
+        snapshot = DashboardSnapshot()
+        snapshot.study_progress = totals.study_progress()
+        snapshot.grade_average = totals.grade_average()
+        snapshot.average_learning_time = totals.average_learning_time()
+
+        # Per semester average of the passed grades
+        passed = columns.exam_passed
+        grade_semesters = columns.semester[columns.exam_module[passed]]
+        numbers, groups = np.unique(grade_semesters, return_inverse=True)
+        grade_sums = np.bincount(groups, weights=columns.exam_grade[passed], minlength=len(numbers))
+        grade_counts = np.bincount(groups, minlength=len(numbers))
+        snapshot.semester_grade_averages = {
+            int(number): float(total / count) for number, total, count in zip(numbers, grade_sums, grade_counts)
+        }
+
+        snapshot.module_titles = list(columns.titles)
+        snapshot.module_actual_times = columns.module_hours().tolist()
+        snapshot.module_planned_times = (columns.ects * 25).tolist()
+        status_counts = np.bincount(columns.status, minlength=len(STATUS_CODES))
+        snapshot.status_counts = {status: int(status_counts[code]) for status, code in STATUS_CODES.items()}
+        snapshot.planned_learning_time = sum(snapshot.module_planned_times)
+        snapshot.actual_learning_time = totals.learning_hours_sum
+
+        today = date.today()
+        snapshot.recent_weekly_hours = self.calc_learning_time_rollup(
+            "week", start=today - timedelta(weeks=RECENT_WEEKS - 1), end=today)
+        return snapshot
+
+def create_progress_monitor(study_program, backend: str = "python", verify: bool = False) -> ProgressMonitor:
+    """
+    Create the ProgressMonitor for a backend: "python", "numpy" or "auto" (the faster
+    one, which is the pure Python monitor at every measured size). Without NumPy,
+    "numpy" falls back to the pure Python monitor.
+    """
+    if backend not in ("python", "numpy", "auto"):
+        raise ValueError(f"Unknown analytics backend '{backend}' (expected python, numpy or auto).")
+    if backend == "numpy" and np is not None:
+        return NumpyProgressMonitor(study_program, verify=verify)
+    return ProgressMonitor(study_program, verify=verify)
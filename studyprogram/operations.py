@@ -0,0 +1,221 @@
+import json
+from datetime import date
+from classes import StudyProgram, Semester, Module, ModuleStatus, normalize_title
+from classes import ExamPerformance, LearningTime
+
+# Validation rules shared by the interactive menu and the batch mode
+SEMESTER_NUMBERS = range(1, 7)
+ALLOWED_ECTS = (5, 10)
+MAX_ATTEMPTS = 3
+
+def _number(value, cast, message: str):
+    # Accept numbers as well as strings with a decimal comma ("1,7"), but neither
+    # booleans nor (for integers) fractional numbers like 1.9
+    if isinstance(value, bool):
+        raise ValueError(message)
+    try:
+        number = cast(value.replace(",", ".") if isinstance(value, str) else value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(message)
+    if isinstance(value, float) and number != value:
+        raise ValueError(message)
+    return number
+
+def parse_semester_number(value) -> int:
+    number = _number(value, int, "Please enter a valid integer for the semester number.")
+    if number not in SEMESTER_NUMBERS:
+        raise ValueError(f"Semester number must be between {SEMESTER_NUMBERS[0]} and {SEMESTER_NUMBERS[-1]}.")
+    return number
+
+def parse_ects(value) -> int:
+    ects = _number(value, int, "Please enter a valid integer (5 or 10).")
+    if ects not in ALLOWED_ECTS:
+        raise ValueError("ECTS points must be either 5 or 10.")
+    return ects
+
+def parse_grade(value) -> float:
+    grade = _number(value, float, "Please enter a valid number for the grade.")
+    if not 1.0 <= grade <= 5.0:
+        raise ValueError("Grade must be between 1.00 and 5.00.")
+    return grade
+
+def parse_hours(value) -> float:
+    hours = _number(value, float, "Please enter a valid number for the learning hours.")
+    if not hours >= 0:
+        raise ValueError("Learning hours must be a non-negative number.")
+    return hours
+
+def parse_date(value) -> date:
+    if value is None:
+        return date.today()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid date '{value}' (expected YYYY-MM-DD).")
+
+def parse_title(value) -> str:
+    if not isinstance(value, str) or not normalize_title(value):
+        raise ValueError("Module name must not be empty.")
+    return normalize_title(value)
+
+def find_module(study_program: StudyProgram, semester_number, module_name: str) -> Module:
+    """
+    Look up a module, raising ValueError if the semester or the module does not exist.
+    """
+    if not isinstance(module_name, str):
+        raise ValueError("Module name must be a string.")
+    semester_number = parse_semester_number(semester_number)
+    if study_program.get_semester(semester_number) is None:
+        raise ValueError(f"No semester found with number {semester_number}.")
+    module = study_program.get_module(semester_number, module_name)
+    if module is None:
+        raise ValueError(f"No module found with name '{module_name}' in semester {semester_number}.")
+    return module
+
+def _get_or_create_semester(study_program: StudyProgram, number: int) -> Semester:
+    semester = study_program.get_semester(number)
+    if semester is None:
+        semester = Semester(number)
+        study_program.add_semester(semester)
+    return semester
+
+def add_module(study_program: StudyProgram, title: str, ects, semester) -> Module:
+    """
+    Add a new open module, creating the semester if needed.
+    """
+    title = parse_title(title)
+    ects = parse_ects(ects)
+    semester_number = parse_semester_number(semester)
+    if study_program.get_module(semester_number, title):
+        raise ValueError(f"Module '{title}' already exists in semester {semester_number}.")
+    module = Module(title, ects, status=ModuleStatus.OPEN)
+    _get_or_create_semester(study_program, semester_number).add_module(module)
+    return module
+
+def check_can_add_grade(module: Module):
+    """
+    Raise ValueError if no further exam attempt may be recorded for the module.
+    """
+    if module.status == ModuleStatus.PASSED:
+        raise ValueError(f"Module '{module.title}' has already been passed. No more grades can be entered.")
+    if len(module.exam_performances) >= MAX_ATTEMPTS:
+        raise ValueError(f"Module '{module.title}' has already been attempted {MAX_ATTEMPTS} times and is considered failed.")
+
+def add_grade(study_program: StudyProgram, semester, module: str, grade, attempt=None) -> ExamPerformance:
+    """
+    Record the next exam attempt of a module and update its status.
+    """
+    return record_grade(find_module(study_program, semester, module), parse_grade(grade), attempt)
+
+def record_grade(module: Module, grade: float, attempt=None) -> ExamPerformance:
+    """
+    Record a validated grade as the next exam attempt of a module. If an attempt
+    number is given (e.g. by an import) it has to be the next one.
+    """
+    check_can_add_grade(module)
+    next_attempt = len(module.exam_performances) + 1
+    if attempt is not None and _number(attempt, int, "Attempt must be an integer.") != next_attempt:
+        raise ValueError(f"Module '{module.title}' expects attempt {next_attempt}, got {attempt}.")
+    performance = ExamPerformance(grade=grade, attempt=next_attempt, passed=grade <= 4.0)
+    module.add_exam_performance(performance)
+    module.status = ModuleStatus.PASSED if performance.passed else ModuleStatus.FAILED
+    return performance
+
+def log_time(study_program: StudyProgram, semester, module: str, hours, date=None) -> LearningTime:
+    """
+    Record learning hours for a module (today unless a date is given).
+    """
+    target = find_module(study_program, semester, module)
+    learning_time = LearningTime(date=parse_date(date), hours=parse_hours(hours))
+    target.add_learning_time(learning_time)
+    return learning_time
+
+def rename_module(study_program: StudyProgram, semester, module: str, title: str) -> Module:
+    target = find_module(study_program, semester, module)
+    title = parse_title(title)
+    existing = study_program.get_module(target.semester.number, title)
+    if existing and existing is not target:
+        raise ValueError(f"Module '{title}' already exists in semester {target.semester.number}.")
+    target.title = title
+    return target
+
+def set_ects(study_program: StudyProgram, semester, module: str, ects) -> Module:
+    target = find_module(study_program, semester, module)
+    target.ects = parse_ects(ects)
+    return target
+
+def move_module(study_program: StudyProgram, semester, module: str, to) -> Module:
+    target = find_module(study_program, semester, module)
+    new_number = parse_semester_number(to)
+    existing = study_program.get_module(new_number, target.title)
+    if existing and existing is not target:
+        raise ValueError(f"Module '{target.title}' already exists in semester {new_number}.")
+    new_semester = _get_or_create_semester(study_program, new_number)
+    target.semester.remove_module(target)
+    new_semester.add_module(target)
+    return target
+
+def delete_module(study_program: StudyProgram, semester, module: str) -> Module:
+    target = find_module(study_program, semester, module)
+    target.semester.remove_module(target)
+    return target
+
+# Operation name -> function; the remaining fields of an operation are its keyword arguments
+OPERATIONS = {
+    "add_module": add_module,
+    "add_grade": add_grade,
+    "log_time": log_time,
+    "rename_module": rename_module,
+    "set_ects": set_ects,
+    "move_module": move_module,
+    "delete_module": delete_module,
+}
+
+def apply_operation(study_program: StudyProgram, operation: dict):
+    """
+    Apply one operation such as {"op": "add_grade", "semester": 1, "module": "Mathematik", "grade": 1.7}.
+    """
+    if not isinstance(operation, dict):
+        raise ValueError("An operation must be a JSON object.")
+    fields = dict(operation)
+    name = fields.pop("op", None)
+    if name not in OPERATIONS:
+        raise ValueError(f"Unknown operation '{name}'. Available operations: {', '.join(OPERATIONS)}.")
+    try:
+        return OPERATIONS[name](study_program, **fields)
+    except TypeError as error:
+        # Missing or unexpected fields
+        raise ValueError(f"Invalid fields for '{name}': {error}")
+
+def apply_operations(study_program: StudyProgram, operations) -> list:
+    """
+    Apply operations in order. Invalid operations are skipped; returns a list of
+    (position, error message) for them, counting from 1.
+    """
+    rejected = []
+    for position, operation in enumerate(operations, start=1):
+        try:
+            apply_operation(study_program, operation)
+        except ValueError as error:
+            rejected.append((position, str(error)))
+    return rejected
+
+def apply_lines(study_program: StudyProgram, lines) -> tuple:
+    """
+    Apply the operations of a JSON Lines file (one operation per line, empty lines
+    are ignored). Returns (number of applied operations, [(line number, error message)]).
+    """
+    applied = 0
+    rejected = []
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            apply_operation(study_program, json.loads(line))
+            applied += 1
+        except ValueError as error:
+            # json.JSONDecodeError is a ValueError as well
+            rejected.append((line_number, str(error)))
+    return applied, rejected
@@ -0,0 +1,183 @@
+import atexit
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import time
+from classes import StudyProgram
+from cli_controller import CLIController
+from data_manager import DataManager
+from progress_monitor import ProgressMonitor
+
+# Environment variables that enable profiling without the command line flags
+PROFILE_ENV = "STUDYPROGRAM_PROFILE"
+PROFILE_ACTION_ENV = "STUDYPROGRAM_PROFILE_ACTION"
+
+# Menu actions that can be timed and captured with cProfile
+ACTIONS = ("add_module", "input_grades", "show_progress", "show_dashboard", "add_learning_time", "edit_module")
+METRICS = ("calc_grade_average", "calc_pass_quote", "calc_study_progress", "calc_average_learning_time",
+           "build_dashboard_snapshot")
+
+class TimingHistogram:
+    """
+    Durations of one instrumented operation in power-of-two microsecond buckets,
+    plus the bytes and objects it handled.
+    """
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        # Bucket b counts durations below 2**b microseconds (and at least 2**(b-1))
+        self.buckets = {}
+        self.bytes = 0
+        self.objects = 0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.minimum = seconds if self.minimum is None else min(self.minimum, seconds)
+        self.maximum = seconds if self.maximum is None else max(self.maximum, seconds)
+        bucket = max(int(seconds * 1e6), 0).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count else 0,
+            "min_seconds": self.minimum,
+            "max_seconds": self.maximum,
+            "histogram": [{"below_us": 2 ** bucket, "count": self.buckets[bucket]} for bucket in sorted(self.buckets)],
+            "bytes": self.bytes,
+            "objects": self.objects,
+        }
+
+def _count_objects(data: dict) -> int:
+    # Semesters, modules, exam performances and learning times of a study program dictionary
+    count = 0
+    for semester in data.get("semesters", []):
+        count += 1
+        for module in semester.get("modules", []):
+            count += 1 + len(module.get("exam_performances", [])) + len(module.get("learning_times", []))
+    return count
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+class Profiler:
+    """
+    Wraps the CLI actions, DataManager I/O, (de)serialization and ProgressMonitor metrics
+    with timers. Nothing is patched until enable() is called, so there is no overhead
+    when profiling is off.
+    """
+    def __init__(self, output_path: str = "profile.json", profile_action: str = None):
+        if profile_action is not None and profile_action not in ACTIONS:
+            raise ValueError(f"Unknown action '{profile_action}'. Available actions: {', '.join(ACTIONS)}.")
+        self.output_path = output_path
+        self.profile_action = profile_action
+        self.stats = {}
+        self.cprofile = cProfile.Profile() if profile_action else None
+        self._originals = []
+
+    def record(self, name: str, seconds: float, size: int = 0, objects: int = 0):
+        histogram = self.stats.get(name)
+        if histogram is None:
+            histogram = self.stats[name] = TimingHistogram()
+        histogram.add(seconds)
+        histogram.bytes += size
+        histogram.objects += objects
+
+    def _wrap(self, owner, name: str, metric: str, measure=None, cprofile: bool = False):
+        """
+        Replace owner.name by a timed wrapper; measure(args, result) returns (bytes, objects).
+        """
+        original = owner.__dict__[name]
+        is_static = isinstance(original, staticmethod)
+        function = original.__func__ if is_static else original
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                if cprofile:
+                    result = self.cprofile.runcall(function, *args, **kwargs)
+                else:
+                    result = function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+            size, objects = measure(args, result) if measure else (0, 0)
+            self.record(metric, elapsed, size, objects)
+            return result
+
+        self._originals.append((owner, name, original))
+        setattr(owner, name, staticmethod(wrapper) if is_static else wrapper)
+
+    def enable(self):
+        for action in ACTIONS:
+            self._wrap(CLIController, action, f"action.{action}", cprofile=action == self.profile_action)
+        self._wrap(DataManager, "save_data", "data_manager.save_data",
+                   lambda args, result: (0, _count_objects(args[1])))
+        # With write-behind, save_data only hands the data over; the actual write is timed here
+        self._wrap(DataManager, "_write_atomic", "data_manager.write",
+                   lambda args, result: (_file_size(args[0].file_path), 0))
+        self._wrap(DataManager, "load_data", "data_manager.load_data",
+                   lambda args, result: (_file_size(args[0].file_path), _count_objects(result or {})))
+        self._wrap(StudyProgram, "to_dict", "study_program.to_dict",
+                   lambda args, result: (0, _count_objects(result)))
+        self._wrap(StudyProgram, "from_dict", "study_program.from_dict",
+                   lambda args, result: (0, _count_objects(args[0])))
+        for metric in METRICS:
+            self._wrap(ProgressMonitor, metric, f"progress_monitor.{metric}")
+        atexit.register(self.dump)
+        return self
+
+    def disable(self):
+        """
+        Restore the original methods.
+        """
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals = []
+        atexit.unregister(self.dump)
+
+    def report(self, cprofile_path: str = None) -> dict:
+        report = {"stats": {name: histogram.to_dict() for name, histogram in sorted(self.stats.items())}}
+        if self.cprofile is not None:
+            report["cprofile"] = {"action": self.profile_action, "file": cprofile_path, "top": None}
+            if cprofile_path:
+                text = io.StringIO()
+                pstats.Stats(cprofile_path, stream=text).sort_stats("cumulative").print_stats(25)
+                report["cprofile"]["top"] = text.getvalue()
+        return report
+
+    def dump(self):
+        """
+        Write the collected statistics as JSON (and the raw cProfile data next to it).
+        """
+        cprofile_path = None
+        if self.cprofile is not None:
+            self.cprofile.create_stats()
+            # Nothing to write if the action was never chosen
+            if self.cprofile.stats:
+                cprofile_path = f"{os.path.splitext(self.output_path)[0]}.{self.profile_action}.prof"
+                self.cprofile.dump_stats(cprofile_path)
+        with open(self.output_path, "w", encoding="utf-8") as file:
+            json.dump(self.report(cprofile_path), file, indent=4)
+        print(f"Profile written to {self.output_path}.", file=sys.stderr)
+
+def enable_from_environment(output_path: str = None, profile_action: str = None):
+    """
+    Enable profiling if a path was given or the STUDYPROGRAM_PROFILE variable is set.
+    Returns the Profiler, or None if profiling stays off.
+    """
+    output_path = output_path or os.environ.get(PROFILE_ENV)
+    if not output_path:
+        return None
+    return Profiler(output_path, profile_action or os.environ.get(PROFILE_ACTION_ENV)).enable()
@@ -0,0 +1,118 @@
+from classes import Semester, Module
+
+class ProgramDiff:
+    """
+    Structural difference between a live study program and a dictionary representation
+    of it: semesters are matched by number and modules by (semester number, title).
+    """
+    def __init__(self):
+        self.fields = {}
+        # Semester dictionaries that are missing in the live program
+        self.added_semesters = []
+        # (semester number, module dictionary)
+        self.added_modules = []
+        self.changed_modules = []
+        # (semester number, module title)
+        self.removed_modules = []
+        # Semester number -> module titles in the order of the dictionary
+        self.module_order = {}
+
+    def __bool__(self):
+        return bool(self.fields or self.added_semesters or self.added_modules
+                    or self.changed_modules or self.removed_modules)
+
+    def summary(self) -> str:
+        parts = [f"{len(self.added_semesters)} semester(s) added"] if self.added_semesters else []
+        for label, entries in (("added", self.added_modules), ("changed", self.changed_modules),
+                               ("removed", self.removed_modules)):
+            if entries:
+                parts.append(f"{len(entries)} module(s) {label}")
+        if self.fields:
+            parts.append(f"{', '.join(sorted(self.fields))} changed")
+        return ", ".join(parts) or "no changes"
+
+def _module_matches(module: Module, data: dict) -> bool:
+    if (module.ects, module.status.value) != (data["ects"], data["status"]):
+        return False
+    exams = data.get("exam_performances", [])
+    learning_times = data.get("learning_times", [])
+    # The counts rule out the usual external edit (an added entry) without building any dictionaries
+    if module.get_exam_count() != len(exams) or module.get_learning_time_count() != len(learning_times):
+        return False
+    current = module.to_dict()
+    return current["exam_performances"] == exams and current["learning_times"] == learning_times
+
+def diff_program(study_program, data: dict) -> ProgramDiff:
+    """
+    Compare a study program with its dictionary representation (e.g. the data file
+    as another process left it).
+    """
+    diff = ProgramDiff()
+    for field in ("name", "regular_study_period"):
+        if getattr(study_program, field) != data[field]:
+            diff.fields[field] = data[field]
+
+    seen = set()
+    for semester_data in data.get("semesters", []):
+        number = semester_data["number"]
+        seen.add(number)
+        semester = study_program.get_semester(number)
+        if semester is None:
+            diff.added_semesters.append(semester_data)
+            continue
+        modules = {module.title: module for module in semester.modules}
+        titles = []
+        for module_data in semester_data.get("modules", []):
+            title = module_data["title"]
+            titles.append(title)
+            module = modules.pop(title, None)
+            if module is None:
+                diff.added_modules.append((number, module_data))
+            elif not _module_matches(module, module_data):
+                diff.changed_modules.append((number, module_data))
+        diff.removed_modules.extend((number, title) for title in modules)
+        diff.module_order[number] = titles
+
+    # Semesters cannot be removed, so a semester missing in the data only loses its modules
+    for semester in study_program.semesters:
+        if semester.number not in seen:
+            diff.removed_modules.extend((semester.number, module.title) for module in semester.modules)
+            diff.module_order[semester.number] = []
+    return diff
+
+def apply_diff(study_program, diff: ProgramDiff):
+    """
+    Merge a ProgramDiff into the live study program. Only the differing semesters and
+    modules are (lazily) rebuilt; everything else keeps its objects. The changes go
+    through the regular change events, so indexes, versions and listeners follow.
+    """
+    for field, value in diff.fields.items():
+        setattr(study_program, field, value)
+    for semester_data in diff.added_semesters:
+        study_program.add_semester(Semester.from_dict(semester_data, lazy=True))
+
+    def module(number, title):
+        return next(module for module in study_program.get_semester(number).modules if module.title == title)
+
+    for number, title in diff.removed_modules:
+        study_program.get_semester(number).remove_module(module(number, title))
+    for number, module_data in diff.changed_modules:
+        semester = study_program.get_semester(number)
+        semester.remove_module(module(number, module_data["title"]))
+        semester.add_module(Module.from_dict(module_data, lazy=True))
+    for number, module_data in diff.added_modules:
+        study_program.get_semester(number).add_module(Module.from_dict(module_data, lazy=True))
+
+    # Restore the module order of the data (replaced and added modules were appended)
+    for number, titles in diff.module_order.items():
+        position = {title: index for index, title in enumerate(titles)}
+        study_program.get_semester(number).modules.sort(key=lambda module: position.get(module.title, len(position)))
+
+def merge_program(study_program, data: dict) -> ProgramDiff:
+    """
+    Bring a live study program in line with data and return what was changed.
+    """
+    diff = diff_program(study_program, data)
+    if diff:
+        apply_diff(study_program, diff)
+    return diff
@@ -1,58 +1,294 @@
-from classes import ModuleStatus
+import math
+from datetime import date, timedelta
+from classes import StudyProgram, ModuleStatus, check_period, period_starts
+
+# Weeks shown in the recent study intensity panel of the dashboard
+RECENT_WEEKS = 8
+
+class ProgressTotals:
+    """
+    Running totals from which all progress metrics of a study program are derived.
+    """
+    FIELDS = (
+        "total_ects", "passed_ects", "module_count", "modules_with_passed_exam",
+        "passed_grade_sum", "passed_grade_count", "learning_hours_sum", "learning_time_count",
+    )
+
+    def __init__(self):
+        self.total_ects = 0
+        self.passed_ects = 0
+        self.module_count = 0
+        self.modules_with_passed_exam = 0
+        self.passed_grade_sum = 0.0
+        self.passed_grade_count = 0
+        self.learning_hours_sum = 0.0
+        self.learning_time_count = 0
+
+    def add_module(self, module, sign: int = 1):
+        """
+        Add (sign=1) or subtract (sign=-1) the full contribution of a module.
+        """
+        self.total_ects += sign * module.ects
+        if module.status == ModuleStatus.PASSED:
+            self.passed_ects += sign * module.ects
+        self.module_count += sign
+        passed_grades = module.get_passed_grades()
+        if passed_grades:
+            self.modules_with_passed_exam += sign
+        self.passed_grade_sum += sign * sum(passed_grades)
+        self.passed_grade_count += sign * len(passed_grades)
+        self.learning_hours_sum += sign * module.get_learning_hours()
+        self.learning_time_count += sign * module.get_learning_time_count()
+
+    def merge(self, other):
+        """
+        Add the totals of another study program (or group of programs) to these totals.
+        """
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        return self
+
+    @staticmethod
+    def from_study_program(study_program):
+        """
+        Compute the totals from scratch by walking the whole study program.
+        """
+        totals = ProgressTotals()
+        for semester in study_program.semesters:
+            for module in semester.modules:
+                totals.add_module(module)
+        return totals
+
+    def grade_average(self) -> float:
+        """
+        Average of all passed grades.
+        """
+        return self.passed_grade_sum / self.passed_grade_count if self.passed_grade_count > 0 else 0
+
+    def pass_quote(self) -> float:
+        """
+        Percentage of modules with a passed exam.
+        """
+        return (self.modules_with_passed_exam / self.module_count) * 100 if self.module_count > 0 else 0
+
+    def study_progress(self) -> float:
+        """
+        Percentage of passed ECTS.
+        """
+        return (self.passed_ects / self.total_ects) * 100 if self.total_ects > 0 else 0
+
+    def average_learning_time(self) -> float:
+        """
+        Average hours per learning time entry.
+        """
+        return self.learning_hours_sum / self.learning_time_count if self.learning_time_count > 0 else 0
+
+    def matches(self, other) -> bool:
+        """
+        Check whether two sets of totals agree (floats compared with a tolerance).
+        """
+        return all(
+            math.isclose(getattr(self, field), getattr(other, field), abs_tol=1e-9)
+            for field in self.FIELDS
+        )
+
+    def __repr__(self):
+        values = ", ".join(f"{field}={getattr(self, field)}" for field in self.FIELDS)
+        return f"ProgressTotals({values})"
+
+class DashboardSnapshot:
+    """
+    All metrics and plot series shown on the dashboard, collected in a single pass.
+    """
+    def __init__(self):
+        self.study_progress = 0.0
+        self.grade_average = 0.0
+        self.average_learning_time = 0.0
+        self.planned_learning_time = 0.0
+        self.actual_learning_time = 0.0
+        # Semester number -> average of the passed grades in that semester
+        self.semester_grade_averages = {}
+        # Parallel series for the learning time per module plot
+        self.module_titles = []
+        self.module_actual_times = []
+        self.module_planned_times = []
+        # ModuleStatus -> number of modules with that status
+        self.status_counts = {status: 0 for status in ModuleStatus}
+        # (week start, hours) for the last RECENT_WEEKS weeks, oldest first
+        self.recent_weekly_hours = []
+
+    def __repr__(self):
+        return (f"DashboardSnapshot(study_progress={self.study_progress}, grade_average={self.grade_average}, "
+                f"average_learning_time={self.average_learning_time}, modules={len(self.module_titles)})")
 
 class ProgressMonitor:
-    def __init__(self, study_program):
+    """
+    Provides progress metrics for a study program.
+
+    The metrics are derived from running totals that are kept up to date through the
+    change events of the study program, so every calc_* call is O(1). With verify=True
+    each call additionally recomputes the totals from scratch and asserts that they match.
+
+    With a HistoryStore attached as history, at(day) answers the same metrics for a
+    past state of the study program.
+    """
+    # HistoryStore of the saved states, set by SetupController when history is enabled
+    history = None
+
+    def __init__(self, study_program, verify: bool = False):
         self.study_program = study_program
+        self.verify = verify
+        self.totals = ProgressTotals.from_study_program(study_program)
+        study_program.subscribe(self._on_change)
+
+    def _on_change(self, event: str, **payload):
+        handler = getattr(self, f"_on_{event}", None)
+        if handler:
+            handler(**payload)
+
+    def _on_semester_added(self, semester):
+        for module in semester.modules:
+            self.totals.add_module(module)
+
+    def _on_module_added(self, semester, module):
+        self.totals.add_module(module)
+
+    def _on_module_removed(self, semester, module):
+        self.totals.add_module(module, sign=-1)
+
+    def _on_exam_added(self, semester, module, exam):
+        if not exam.passed:
+            return
+        self.totals.passed_grade_sum += exam.grade
+        self.totals.passed_grade_count += 1
+        if len(module.get_passed_grades()) == 1:
+            self.totals.modules_with_passed_exam += 1
+
+    def _on_learning_time_added(self, semester, module, learning_time):
+        self.totals.learning_hours_sum += learning_time.hours
+        self.totals.learning_time_count += 1
+
+    def _on_status_changed(self, semester, module, old, new):
+        if old == ModuleStatus.PASSED:
+            self.totals.passed_ects -= module.ects
+        if new == ModuleStatus.PASSED:
+            self.totals.passed_ects += module.ects
+
+    def _on_ects_changed(self, semester, module, old, new):
+        self.totals.total_ects += new - old
+        if module.status == ModuleStatus.PASSED:
+            self.totals.passed_ects += new - old
+
+    def verify_totals(self):
+        """
+        Recompute the totals from scratch and assert that the cached totals match.
+        """
+        expected = ProgressTotals.from_study_program(self.study_program)
+        assert self.totals.matches(expected), f"Cached {self.totals} != recomputed {expected}"
+
+    def _current_totals(self) -> ProgressTotals:
+        if self.verify:
+            self.verify_totals()
+        return self.totals
 
     def calc_grade_average(self) -> float:
         """
         Calculate the average grade of all exam performances in the study program.
         """
-        total_grade = 0
-        count = 0
-        for semester in self.study_program.semesters:
-            for module in semester.modules:
-                for exam in module.exam_performances:
-                    if exam.passed:
-                        total_grade += exam.grade
-                        count += 1
-        return total_grade / count if count > 0 else 0
-    
+        return self._current_totals().grade_average()
+
     def calc_pass_quote(self) -> float:
         """
         Calculate the pass quote of the study program.
         """
-        total_modules = 0
-        passed_modules = 0
-        for semester in self.study_program.semesters:
-            for module in semester.modules:
-                total_modules += 1
-                if any(ep.is_passed() for ep in module.exam_performances):
-                    passed_modules += 1
-        return (passed_modules / total_modules) * 100 if total_modules > 0 else 0
-    
+        return self._current_totals().pass_quote()
+
     def calc_study_progress(self) -> float:
         """
         Calculate the study progress of the study program based on completed ECTS.
         """
-        total_ects = 0
-        completed_ects = 0
-        for semester in self.study_program.semesters:
-            for module in semester.modules:
-                total_ects += module.ects
-                if module.status == ModuleStatus.PASSED:
-                    completed_ects += module.ects
-        return (completed_ects / total_ects) * 100 if total_ects > 0 else 0
-    
+        return self._current_totals().study_progress()
+
     def calc_average_learning_time(self) -> float:
         """
         Calculate the average learning time for all modules in the study program.
         """
-        total_learning_time = 0
-        count = 0
+        return self._current_totals().average_learning_time()
+
+    def at(self, moment) -> "ProgressMonitor":
+        """
+        Get a monitor of the study program as it was last saved at the end of the given
+        day (or at the given datetime), rebuilt from the nearest history checkpoint.
+        """
+        if self.history is None:
+            raise ValueError("No history is recorded for this study program.")
+        data = self.history.state_at(moment)
+        if data is None:
+            raise ValueError(f"No saved state before {moment}.")
+        monitor = type(self)(StudyProgram.from_dict(data, lazy=True))
+        monitor.history = self.history
+        return monitor
+
+    def _modules(self):
+        for semester in self.study_program.semesters:
+            yield from semester.modules
+
+    def calc_learning_hours_between(self, start: date = None, end: date = None) -> float:
+        """
+        Sum the learning hours logged between two dates (inclusive) over all modules,
+        with an O(log n) lookup per module.
+        """
+        return sum(module.get_learning_hours_between(start, end) for module in self._modules())
+
+    def calc_learning_time_rollup(self, period: str = "week", start: date = None, end: date = None) -> list:
+        """
+        Get (period start, hours) over all modules for every week or month from start to
+        end (default: the first learning time to today), including empty periods.
+        """
+        # Checked up front: without learning times the period is never used
+        check_period(period)
+        if start is None:
+            first_dates = [d for d in (module.get_first_learning_date() for module in self._modules()) if d]
+            if not first_dates:
+                return []
+            start = min(first_dates)
+        boundaries = period_starts(start, end or date.today(), period)
+        cumulative = [0.0] * len(boundaries)
+        for module in self._modules():
+            if module.get_learning_time_count():
+                for i, boundary in enumerate(boundaries):
+                    cumulative[i] += module.get_learning_hours_before(boundary)
+        return [(boundaries[i], cumulative[i + 1] - cumulative[i]) for i in range(len(boundaries) - 1)]
+
+    def build_dashboard_snapshot(self) -> DashboardSnapshot:
+        """
+        Collect every dashboard metric and plot series with one walk over the study program.
+        """
+        snapshot = DashboardSnapshot()
+        snapshot.study_progress = self.calc_study_progress()
+        snapshot.grade_average = self.calc_grade_average()
+        snapshot.average_learning_time = self.calc_average_learning_time()
+
+        semester_grades = {}
         for semester in self.study_program.semesters:
             for module in semester.modules:
-                for learning_time in module.learning_times:
-                    total_learning_time += learning_time.hours
-                    count += 1
-        return total_learning_time / count if count > 0 else 0
\ No newline at end of file
+                passed_grades = module.get_passed_grades()
+                if passed_grades:
+                    grades = semester_grades.setdefault(semester.number, [0.0, 0])
+                    grades[0] += sum(passed_grades)
+                    grades[1] += len(passed_grades)
+                actual_time = module.get_learning_hours()
+                snapshot.module_titles.append(module.title)
+                snapshot.module_actual_times.append(actual_time)
+                snapshot.module_planned_times.append(module.ects * 25)
+                snapshot.status_counts[module.status] += 1
+
+        snapshot.semester_grade_averages = {
+            number: total / count for number, (total, count) in semester_grades.items()
+        }
+        snapshot.planned_learning_time = sum(snapshot.module_planned_times)
+        snapshot.actual_learning_time = sum(snapshot.module_actual_times)
+        today = date.today()
+        snapshot.recent_weekly_hours = self.calc_learning_time_rollup(
+            "week", start=today - timedelta(weeks=RECENT_WEEKS - 1), end=today)
+        return snapshot
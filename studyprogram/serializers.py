@@ -0,0 +1,270 @@
+import gzip
+import io
+import json
+import lzma
+import struct
+from datetime import date
+
+class JsonSerializer:
+    """
+    Pretty-printed JSON, the original study_data.json format.
+    """
+    name = "json"
+
+    def matches(self, header: bytes) -> bool:
+        return header.lstrip()[:1] == b"{"
+
+    def dump(self, data: dict, file):
+        # Encoded and written in chunks instead of building the whole text first
+        text = io.TextIOWrapper(file, encoding="utf-8")
+        try:
+            json.dump(data, text, indent=4)
+        finally:
+            # Flushes the text; the caller closes the file
+            text.detach()
+
+    def load(self, file) -> dict:
+        text = io.TextIOWrapper(file, encoding="utf-8")
+        try:
+            return json.load(text)
+        finally:
+            text.detach()
+
+class BinarySerializer:
+    """
+    Compact binary snapshot format.
+
+    Layout (little endian):
+      header        magic b"SPDB", format version (uint16)
+      strings       count (uint32), then per string: length (uint16) + UTF-8 bytes
+      extras        length (uint32) + JSON object with any unknown top-level keys
+      program       name (string index uint32), regular study period (uint16), semester count (uint32)
+      semester      number (int16), module count (uint32)
+      module        title (string index uint32), ects (uint16), status (uint8),
+                    exam count (uint32), learning time count (uint32),
+                    grades (float64 * n), attempts (uint16 * n), passed flags (uint8 * n),
+                    date ordinals (int32 * m), hours (float64 * m)
+
+    The program name and all module titles are interned in the string table.
+    """
+    name = "binary"
+    MAGIC = b"SPDB"
+    VERSION = 1
+    STATUS_CODES = {"open": 0, "passed": 1, "failed": 2}
+    KNOWN_KEYS = ("name", "regular_study_period", "semesters")
+
+    _HEADER = struct.Struct("<4sH")
+    _COUNT = struct.Struct("<I")
+    _STRING_LENGTH = struct.Struct("<H")
+    _PROGRAM = struct.Struct("<IHI")
+    _SEMESTER = struct.Struct("<hI")
+    _MODULE = struct.Struct("<IHBII")
+
+    def matches(self, header: bytes) -> bool:
+        return header[:4] == self.MAGIC
+
+    def dump(self, data: dict, file):
+        strings = {}
+
+        def intern(value: str) -> int:
+            return strings.setdefault(value, len(strings))
+
+        ordinals = {}
+        body = [self._PROGRAM.pack(intern(data["name"]), data["regular_study_period"], len(data["semesters"]))]
+        for semester in data["semesters"]:
+            modules = semester.get("modules", [])
+            body.append(self._SEMESTER.pack(semester["number"], len(modules)))
+            for module in modules:
+                exams = module.get("exam_performances", [])
+                learning_times = module.get("learning_times", [])
+                n, m = len(exams), len(learning_times)
+                body.append(self._MODULE.pack(intern(module["title"]), module["ects"],
+                                              self.STATUS_CODES[module["status"]], n, m))
+                body.append(struct.pack(f"<{n}d", *(exam["grade"] for exam in exams)))
+                body.append(struct.pack(f"<{n}H", *(exam["attempt"] for exam in exams)))
+                body.append(struct.pack(f"<{n}B", *(exam["passed"] for exam in exams)))
+                dates = []
+                for lt in learning_times:
+                    iso = lt["date"]
+                    ordinal = ordinals.get(iso)
+                    if ordinal is None:
+                        ordinal = ordinals[iso] = date.fromisoformat(iso).toordinal()
+                    dates.append(ordinal)
+                body.append(struct.pack(f"<{m}i", *dates))
+                body.append(struct.pack(f"<{m}d", *(lt["hours"] for lt in learning_times)))
+
+        file.write(self._HEADER.pack(self.MAGIC, self.VERSION))
+        file.write(self._COUNT.pack(len(strings)))
+        for value in strings:
+            encoded = value.encode("utf-8")
+            file.write(self._STRING_LENGTH.pack(len(encoded)))
+            file.write(encoded)
+        extras = json.dumps({key: value for key, value in data.items() if key not in self.KNOWN_KEYS}).encode("utf-8")
+        file.write(self._COUNT.pack(len(extras)))
+        file.write(extras)
+        file.write(b"".join(body))
+
+    def load(self, file) -> dict:
+        buffer = memoryview(file.read())
+        magic, version = self._HEADER.unpack_from(buffer, 0)
+        if magic != self.MAGIC:
+            raise ValueError("Not a binary study program snapshot.")
+        if version > self.VERSION:
+            raise ValueError(f"Unsupported binary snapshot version {version} (supported up to {self.VERSION}).")
+        offset = self._HEADER.size
+
+        (count,) = self._COUNT.unpack_from(buffer, offset)
+        offset += self._COUNT.size
+        strings = []
+        for _ in range(count):
+            (length,) = self._STRING_LENGTH.unpack_from(buffer, offset)
+            offset += self._STRING_LENGTH.size
+            strings.append(bytes(buffer[offset:offset + length]).decode("utf-8"))
+            offset += length
+
+        (length,) = self._COUNT.unpack_from(buffer, offset)
+        offset += self._COUNT.size
+        extras = json.loads(bytes(buffer[offset:offset + length]))
+        offset += length
+
+        statuses = {code: status for status, code in self.STATUS_CODES.items()}
+        iso_dates = {}
+        name_index, regular_study_period, semester_count = self._PROGRAM.unpack_from(buffer, offset)
+        offset += self._PROGRAM.size
+        semesters = []
+        for _ in range(semester_count):
+            number, module_count = self._SEMESTER.unpack_from(buffer, offset)
+            offset += self._SEMESTER.size
+            modules = []
+            for _ in range(module_count):
+                title_index, ects, status, n, m = self._MODULE.unpack_from(buffer, offset)
+                offset += self._MODULE.size
+                grades = struct.unpack_from(f"<{n}d", buffer, offset)
+                offset += 8 * n
+                attempts = struct.unpack_from(f"<{n}H", buffer, offset)
+                offset += 2 * n
+                passed = struct.unpack_from(f"<{n}B", buffer, offset)
+                offset += n
+                ordinals = struct.unpack_from(f"<{m}i", buffer, offset)
+                offset += 4 * m
+                hours = struct.unpack_from(f"<{m}d", buffer, offset)
+                offset += 8 * m
+                learning_times = []
+                for ordinal, hour in zip(ordinals, hours):
+                    iso = iso_dates.get(ordinal)
+                    if iso is None:
+                        iso = iso_dates[ordinal] = date.fromordinal(ordinal).isoformat()
+                    learning_times.append({"date": iso, "hours": hour})
+                modules.append({
+                    "title": strings[title_index],
+                    "ects": ects,
+                    "status": statuses[status],
+                    "exam_performances": [
+                        {"grade": grade, "attempt": attempt, "passed": bool(flag)}
+                        for grade, attempt, flag in zip(grades, attempts, passed)
+                    ],
+                    "learning_times": learning_times,
+                })
+            semesters.append({"number": number, "modules": modules})
+
+        data = {"name": strings[name_index], "regular_study_period": regular_study_period, "semesters": semesters}
+        data.update(extras)
+        return data
+
+SERIALIZERS = {serializer.name: serializer for serializer in (JsonSerializer(), BinarySerializer())}
+
+def get_serializer(name: str):
+    """
+    Look up a serializer by its name ("json" or "binary").
+    """
+    try:
+        return SERIALIZERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown storage format '{name}'. Available formats: {', '.join(SERIALIZERS)}.")
+
+def detect_serializer(header: bytes):
+    """
+    Pick the serializer whose format matches the first bytes of a file (None if no format matches).
+    """
+    return next((serializer for serializer in SERIALIZERS.values() if serializer.matches(header)), None)
+
+class GzipCompression:
+    """
+    gzip compression (stdlib gzip), levels 0-9. Fast, moderate ratio.
+    """
+    name = "gzip"
+    MAGIC = b"\x1f\x8b"
+    EXTENSION = ".gz"
+    DEFAULT_LEVEL = 6
+
+    def matches(self, header: bytes) -> bool:
+        return header.startswith(self.MAGIC)
+
+    def writer(self, file, level: int = None):
+        # mtime=0 keeps the output identical for identical data
+        return gzip.GzipFile(fileobj=file, mode="wb", compresslevel=self.DEFAULT_LEVEL if level is None else level, mtime=0)
+
+    def reader(self, file):
+        return gzip.GzipFile(fileobj=file, mode="rb")
+
+    def open(self, path: str):
+        return gzip.open(path, "rb")
+
+class XzCompression:
+    """
+    xz/LZMA compression (stdlib lzma), presets 0-9. Slow to write, best ratio.
+    """
+    name = "xz"
+    MAGIC = b"\xfd7zXZ\x00"
+    EXTENSION = ".xz"
+    DEFAULT_LEVEL = 6
+
+    def matches(self, header: bytes) -> bool:
+        return header.startswith(self.MAGIC)
+
+    def writer(self, file, level: int = None):
+        return lzma.LZMAFile(file, "wb", preset=self.DEFAULT_LEVEL if level is None else level)
+
+    def reader(self, file):
+        return lzma.LZMAFile(file, "rb")
+
+    def open(self, path: str):
+        return lzma.open(path, "rb")
+
+COMPRESSIONS = {compression.name: compression for compression in (GzipCompression(), XzCompression())}
+
+# Errors a damaged compressed file raises while it is read
+DECOMPRESSION_ERRORS = (gzip.BadGzipFile, lzma.LZMAError, EOFError)
+
+def get_compression(name: str, level: int = None):
+    """
+    Look up a compression by its name ("gzip" or "xz"; "none" for no compression).
+    """
+    if level is not None and level not in range(10):
+        raise ValueError(f"Compression level must be between 0 and 9, got {level}.")
+    if name == "none":
+        return None
+    try:
+        return COMPRESSIONS[name]
+    except KeyError:
+        raise ValueError(f"Unknown compression '{name}'. Available compressions: none, {', '.join(COMPRESSIONS)}.")
+
+def detect_compression(header: bytes):
+    """
+    Pick the compression whose magic bytes start the file (None for an uncompressed file).
+    """
+    return next((compression for compression in COMPRESSIONS.values() if compression.matches(header)), None)
+
+def compression_for_path(path: str):
+    """
+    Compression implied by the file extension, e.g. study_data.json.gz (None otherwise).
+    """
+    return next((compression for compression in COMPRESSIONS.values() if path.endswith(compression.EXTENSION)), None)
+
+def open_data_file(path: str):
+    """
+    Open a data file for reading in binary mode, decompressing it on the fly if it is compressed.
+    """
+    with open(path, "rb") as file:
+        compression = detect_compression(file.read(16))
+    return compression.open(path) if compression else open(path, "rb")
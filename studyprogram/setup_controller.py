@@ -1,31 +1,93 @@
+import threading
 from classes import StudyProgram
 from progress_monitor import ProgressMonitor
 from data_manager import DataManager
 from cli_controller import CLIController
 
+# Data files with these extensions are opened with the SQLite backend
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
 class SetupController:
-    def __init__(self, file_path="study_data.json"):
-        # Initialize DataManager to handle loading/saving data
-        self.data_manager = DataManager(file_path)
+    def __init__(self, file_path="study_data.json", journal=False, write_behind=True, storage_format=None,
+                 background_load=False, analytics="python", history=False, compression=None, compression_level=None):
+        # Initialize DataManager to handle loading/saving data: SQLite databases get the
+        # SQLite backend, everything else the file-based DataManager (by default saves
+        # are written in the background so the menu never waits for the disk)
+        self.sqlite = file_path.endswith(SQLITE_EXTENSIONS)
+        if self.sqlite:
+            from sqlite_data_manager import SQLiteDataManager
+            self.data_manager = SQLiteDataManager(file_path)
+        else:
+            self.data_manager = DataManager(file_path, journal=journal, write_behind=write_behind,
+                                            storage_format=storage_format, history=history,
+                                            compression=compression, compression_level=compression_level)
+
+        self.analytics = analytics
+        self.study_program = None
+        self.progress_monitor = None
+        self._loading_thread = None
+        self._loading_error = None
+        if background_load:
+            # Load while the menu is already shown; the controller waits for it on the first action
+            self._loading_thread = threading.Thread(target=self._load_in_background, name="StudyProgramLoader", daemon=True)
+            self._loading_thread.start()
+        else:
+            self._load()
 
+    def _load(self):
         # Load existing study program from file, or create a new one if none exists
         self.study_program = self._load_or_create_study_program()
 
-        # Initialize the progress monitor with the loaded or new study program
-        self.progress_monitor = ProgressMonitor(self.study_program)
+        # Initialize the progress monitor with the loaded or new study program: the
+        # SQLite backend answers the metrics with SQL aggregates over its tables
+        # (the NumPy backend is only imported when it was asked for)
+        if self.sqlite:
+            from sqlite_data_manager import SQLiteProgressMonitor
+            self.progress_monitor = SQLiteProgressMonitor(self.data_manager.connection)
+        elif self.analytics != "numpy":
+            self.progress_monitor = ProgressMonitor(self.study_program)
+        else:
+            from numpy_monitor import create_progress_monitor
+            self.progress_monitor = create_progress_monitor(self.study_program, self.analytics)
+
+        # Past states for ProgressMonitor.at (the SQLite backend keeps no history)
+        self.progress_monitor.history = getattr(self.data_manager, "history", None)
+
+        # Let the DataManager record changes (journal mode and the SQLite backend)
+        self.data_manager.attach(self.study_program)
+
+    def _load_in_background(self):
+        try:
+            self._load()
+        except BaseException as error:
+            self._loading_error = error
+
+    def wait_until_loaded(self):
+        # Block until a background load has finished and return the loaded components
+        if self._loading_thread is not None:
+            self._loading_thread.join()
+            self._loading_thread = None
+            if self._loading_error is not None:
+                raise self._loading_error
+        return self.study_program, self.progress_monitor
 
     def _load_or_create_study_program(self) -> StudyProgram:
         # Try to load data from JSON file
         data = self.data_manager.load_data()
 
         # If data was loaded successfully, recreate the StudyProgram object from it
+        # (modules only deserialize their exams and learning times when first accessed)
         if data:
-            return StudyProgram.from_dict(data)
+            return StudyProgram.from_dict(data, lazy=True)
 
         # Otherwise, create a new default study program
         return StudyProgram(name="Softwareentwicklung", regular_study_period=6)
 
     def create_controller(self) -> CLIController:
+        # While loading in the background, the controller fetches the components on its first action
+        if self._loading_thread is not None:
+            return CLIController(data_manager=self.data_manager, loader=self.wait_until_loaded)
+
         # Return a fully configured CLIController with all necessary components
         return CLIController(
             data_manager=self.data_manager,
@@ -0,0 +1,347 @@
+import json
+import os
+import sqlite3
+from datetime import date, timedelta
+from classes import ModuleStatus, normalize_title, check_period, period_starts
+from data_manager import DataManager
+from progress_monitor import DashboardSnapshot, RECENT_WEEKS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS program (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    name TEXT NOT NULL,
+    regular_study_period INTEGER NOT NULL,
+    extras TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS semesters (
+    id INTEGER PRIMARY KEY,
+    number INTEGER NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS modules (
+    id INTEGER PRIMARY KEY,
+    semester INTEGER NOT NULL REFERENCES semesters(number),
+    title TEXT NOT NULL,
+    normalized_title TEXT NOT NULL,
+    ects INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_modules_semester_title ON modules(semester, normalized_title);
+CREATE TABLE IF NOT EXISTS exam_performances (
+    id INTEGER PRIMARY KEY,
+    module_id INTEGER NOT NULL REFERENCES modules(id) ON DELETE CASCADE,
+    grade REAL NOT NULL,
+    attempt INTEGER NOT NULL,
+    passed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_exam_performances_module ON exam_performances(module_id);
+CREATE TABLE IF NOT EXISTS learning_times (
+    id INTEGER PRIMARY KEY,
+    module_id INTEGER NOT NULL REFERENCES modules(id) ON DELETE CASCADE,
+    date TEXT NOT NULL,
+    hours REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_learning_times_module ON learning_times(module_id);
+CREATE INDEX IF NOT EXISTS idx_learning_times_date ON learning_times(date);
+"""
+
+class SQLiteDataManager:
+    """
+    Storage backend that keeps the study program in an SQLite database.
+
+    It offers the same interface as DataManager. Once attached to a study program,
+    every change event becomes a single-row INSERT/UPDATE/DELETE and commit()
+    finishes the transaction, so saving never rewrites the whole data set.
+    """
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        # The connection may be opened on the main thread and used by the background loader
+        self.connection = sqlite3.connect(file_path, check_same_thread=False)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        self._attached = False
+
+    def save_data(self, data):
+        """
+        Replace the whole content of the database with the given data.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM learning_times")
+            self.connection.execute("DELETE FROM exam_performances")
+            self.connection.execute("DELETE FROM modules")
+            self.connection.execute("DELETE FROM semesters")
+            extras = {key: value for key, value in data.items() if key not in ("name", "regular_study_period", "semesters")}
+            self.connection.execute(
+                "INSERT OR REPLACE INTO program (id, name, regular_study_period, extras) VALUES (1, ?, ?, ?)",
+                (data["name"], data["regular_study_period"], json.dumps(extras)))
+            for semester in data.get("semesters", []):
+                self._insert_semester(semester)
+        print(f"File {self.file_path} saved.")
+
+    def load_data(self):
+        """
+        Load the study program as its dictionary representation.
+        """
+        row = self.connection.execute("SELECT name, regular_study_period, extras FROM program WHERE id = 1").fetchone()
+        if row is None:
+            print(f"No study program found in {self.file_path}.")
+            return None
+        name, regular_study_period, extras = row
+        semesters = {}
+        data = {"name": name, "regular_study_period": regular_study_period, "semesters": []}
+        for (number,) in self.connection.execute("SELECT number FROM semesters ORDER BY id"):
+            semesters[number] = {"number": number, "modules": []}
+            data["semesters"].append(semesters[number])
+        modules = {}
+        for module_id, semester, title, ects, status in self.connection.execute(
+                "SELECT id, semester, title, ects, status FROM modules ORDER BY position"):
+            modules[module_id] = {"title": title, "ects": ects, "status": status,
+                                  "exam_performances": [], "learning_times": []}
+            semesters[semester]["modules"].append(modules[module_id])
+        for module_id, grade, attempt, passed in self.connection.execute(
+                "SELECT module_id, grade, attempt, passed FROM exam_performances ORDER BY id"):
+            modules[module_id]["exam_performances"].append({"grade": grade, "attempt": attempt, "passed": bool(passed)})
+        for module_id, day, hours in self.connection.execute(
+                "SELECT module_id, date, hours FROM learning_times ORDER BY id"):
+            modules[module_id]["learning_times"].append({"date": day, "hours": hours})
+        data.update(json.loads(extras))
+        print(f"File {self.file_path} loaded.")
+        return data
+
+    def attach(self, study_program):
+        """
+        Start turning the change events of a study program into row-level statements.
+        """
+        if not self._attached:
+            self._attached = True
+            study_program.subscribe(self._on_change)
+
+    def commit(self, study_program):
+        """
+        Commit the changes made to a study program since the last commit in one transaction.
+        """
+        self.commit_changes(*self.take_changes(study_program))
+
+    def take_changes(self, study_program) -> tuple:
+        """
+        Take what commit_changes needs, like DataManager.take_changes. The row-level
+        statements already ran in the change events, so there are no records; the
+        dictionary is the whole program until it is attached, else its program row.
+        """
+        if not self._attached:
+            return None, study_program.to_dict()
+        return None, {"name": study_program.name, "regular_study_period": study_program.regular_study_period}
+
+    def commit_changes(self, records: list, data: dict):
+        """
+        Commit changes taken with take_changes; does not touch the study program.
+        """
+        if not self._attached:
+            self.save_data(data)
+            return
+        if self.connection.execute("SELECT 1 FROM program WHERE id = 1").fetchone() is None:
+            self.connection.execute("INSERT INTO program (id, name, regular_study_period) VALUES (1, ?, ?)",
+                                    (data["name"], data["regular_study_period"]))
+        self.connection.commit()
+        print(f"Changes saved to {self.file_path}.")
+
+    def flush(self):
+        """
+        Nothing is written in the background, so there is nothing to wait for.
+        """
+
+    def reload_changes(self, study_program):
+        """
+        Other processes write through SQLite's own transactions; there is no file to merge.
+        """
+        return self.merge_changes(study_program, self.read_changes())
+
+    def read_changes(self):
+        """
+        Always None, see reload_changes.
+        """
+        return None
+
+    def merge_changes(self, study_program, data: dict):
+        """
+        Nothing to merge, see reload_changes.
+        """
+        return None
+
+    def close(self):
+        self.connection.close()
+
+    def _module_id(self, semester: int, title: str) -> int:
+        row = self.connection.execute(
+            "SELECT id FROM modules WHERE semester = ? AND normalized_title = ? AND title = ?",
+            (semester, normalize_title(title), title)).fetchone()
+        if row is None:
+            raise ValueError(f"Module '{title}' of semester {semester} is not in {self.file_path}.")
+        return row[0]
+
+    def _insert_semester(self, semester: dict):
+        self.connection.execute("INSERT INTO semesters (number) VALUES (?)", (semester["number"],))
+        for module in semester.get("modules", []):
+            self._insert_module(semester["number"], module)
+
+    def _insert_module(self, semester: int, module: dict):
+        cursor = self.connection.execute(
+            "INSERT INTO modules (semester, title, normalized_title, ects, status, position) "
+            "VALUES (?, ?, ?, ?, ?, (SELECT COALESCE(MAX(position), 0) + 1 FROM modules))",
+            (semester, module["title"], normalize_title(module["title"]), module["ects"], module["status"]))
+        module_id = cursor.lastrowid
+        self.connection.executemany(
+            "INSERT INTO exam_performances (module_id, grade, attempt, passed) VALUES (?, ?, ?, ?)",
+            [(module_id, e["grade"], e["attempt"], e["passed"]) for e in module.get("exam_performances", [])])
+        self.connection.executemany(
+            "INSERT INTO learning_times (module_id, date, hours) VALUES (?, ?, ?)",
+            [(module_id, lt["date"], lt["hours"]) for lt in module.get("learning_times", [])])
+
+    def _on_change(self, event: str, semester=None, module=None, **payload):
+        if event == "semester_added":
+            self._insert_semester(semester.to_dict())
+        elif event == "module_added":
+            self._insert_module(semester.number, module.to_dict())
+        elif event == "module_removed":
+            # Deleted right away, so a module added again under the same title gets its own row
+            # (a move is a delete and a re-insert of the module's rows)
+            self.connection.execute("DELETE FROM modules WHERE id = ?", (self._module_id(semester.number, module.title),))
+        elif event == "exam_added":
+            exam = payload["exam"]
+            self.connection.execute(
+                "INSERT INTO exam_performances (module_id, grade, attempt, passed) VALUES (?, ?, ?, ?)",
+                (self._module_id(semester.number, module.title), exam.grade, exam.attempt, exam.passed))
+        elif event == "learning_time_added":
+            learning_time = payload["learning_time"]
+            self.connection.execute(
+                "INSERT INTO learning_times (module_id, date, hours) VALUES (?, ?, ?)",
+                (self._module_id(semester.number, module.title), learning_time.date.isoformat(), learning_time.hours))
+        elif event == "status_changed":
+            self.connection.execute("UPDATE modules SET status = ? WHERE id = ?",
+                                    (payload["new"].value, self._module_id(semester.number, module.title)))
+        elif event == "ects_changed":
+            self.connection.execute("UPDATE modules SET ects = ? WHERE id = ?",
+                                    (payload["new"], self._module_id(semester.number, module.title)))
+        elif event == "program_changed":
+            # The field is "name" or "regular_study_period", both columns of the program table
+            self.connection.execute(f"UPDATE program SET {payload['field']} = ? WHERE id = 1", (payload["new"],))
+        elif event == "title_changed":
+            self.connection.execute("UPDATE modules SET title = ?, normalized_title = ? WHERE id = ?",
+                                    (payload["new"], normalize_title(payload["new"]),
+                                     self._module_id(semester.number, payload["old"])))
+
+class SQLiteProgressMonitor:
+    """
+    Answers the ProgressMonitor metrics with SQL aggregates, without walking the study program.
+
+    SetupController uses it for the SQLite backend. It reads the rows the attached
+    SQLiteDataManager writes for every change event, so it is current after each change.
+    """
+    # The SQLite backend keeps no history of saved states
+    history = None
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def at(self, moment):
+        raise ValueError("No history is recorded for this study program.")
+
+    def _scalar(self, query: str, parameters=()):
+        return self.connection.execute(query, parameters).fetchone()[0]
+
+    def calc_grade_average(self) -> float:
+        """
+        Calculate the average grade of all passed exam performances.
+        """
+        return self._scalar("SELECT AVG(grade) FROM exam_performances WHERE passed") or 0
+
+    def calc_pass_quote(self) -> float:
+        """
+        Calculate the percentage of modules with at least one passed exam.
+        """
+        total_modules = self._scalar("SELECT COUNT(*) FROM modules")
+        if total_modules == 0:
+            return 0
+        passed_modules = self._scalar("SELECT COUNT(DISTINCT module_id) FROM exam_performances WHERE passed")
+        return (passed_modules / total_modules) * 100
+
+    def calc_study_progress(self) -> float:
+        """
+        Calculate the study progress based on completed ECTS.
+        """
+        total_ects, completed_ects = self.connection.execute(
+            "SELECT SUM(ects), SUM(CASE WHEN status = 'passed' THEN ects ELSE 0 END) FROM modules").fetchone()
+        return (completed_ects / total_ects) * 100 if total_ects else 0
+
+    def calc_average_learning_time(self) -> float:
+        """
+        Calculate the average hours of all learning time entries.
+        """
+        return self._scalar("SELECT AVG(hours) FROM learning_times") or 0
+
+    def calc_learning_hours_between(self, start: date = None, end: date = None) -> float:
+        """
+        Sum the learning hours logged between two dates (inclusive), using the date index.
+        """
+        return self._scalar("SELECT COALESCE(SUM(hours), 0) FROM learning_times WHERE date BETWEEN ? AND ?",
+                            ((start or date.min).isoformat(), (end or date.max).isoformat()))
+
+    def calc_learning_time_rollup(self, period: str = "week", start: date = None, end: date = None) -> list:
+        """
+        Get (period start, hours) for every week or month from start to end (default:
+        the first learning time to today), with one range query per period.
+        """
+        # Checked up front: without learning times the period is never used
+        check_period(period)
+        if start is None:
+            first = self._scalar("SELECT MIN(date) FROM learning_times")
+            if first is None:
+                return []
+            start = date.fromisoformat(first)
+        boundaries = period_starts(start, end or date.today(), period)
+        return [
+            (boundaries[i], self._scalar("SELECT COALESCE(SUM(hours), 0) FROM learning_times WHERE date >= ? AND date < ?",
+                                         (boundaries[i].isoformat(), boundaries[i + 1].isoformat())))
+            for i in range(len(boundaries) - 1)
+        ]
+
+    def build_dashboard_snapshot(self) -> DashboardSnapshot:
+        """
+        Collect every dashboard metric and plot series with grouped queries, in the
+        order of the semesters and modules of the study program.
+        """
+        snapshot = DashboardSnapshot()
+        snapshot.study_progress = self.calc_study_progress()
+        snapshot.grade_average = self.calc_grade_average()
+        snapshot.average_learning_time = self.calc_average_learning_time()
+        for title, ects, status, actual_time in self.connection.execute(
+                "SELECT m.title, m.ects, m.status, COALESCE(lt.hours, 0) FROM modules m "
+                "JOIN semesters s ON s.number = m.semester "
+                "LEFT JOIN (SELECT module_id, SUM(hours) AS hours FROM learning_times GROUP BY module_id) lt "
+                "ON lt.module_id = m.id ORDER BY s.id, m.position"):
+            snapshot.module_titles.append(title)
+            snapshot.module_actual_times.append(actual_time)
+            snapshot.module_planned_times.append(ects * 25)
+            snapshot.status_counts[ModuleStatus(status)] += 1
+        snapshot.semester_grade_averages = dict(self.connection.execute(
+            "SELECT m.semester, AVG(e.grade) FROM exam_performances e JOIN modules m ON m.id = e.module_id "
+            "JOIN semesters s ON s.number = m.semester WHERE e.passed GROUP BY m.semester ORDER BY MIN(s.id)"))
+        snapshot.planned_learning_time = sum(snapshot.module_planned_times)
+        snapshot.actual_learning_time = sum(snapshot.module_actual_times)
+        today = date.today()
+        snapshot.recent_weekly_hours = self.calc_learning_time_rollup(
+            "week", start=today - timedelta(weeks=RECENT_WEEKS - 1), end=today)
+        return snapshot
+
+def migrate_json_to_sqlite(json_path: str, db_path: str):
+    """
+    One-shot migration of a study_data.json file (any DataManager format) into an SQLite database.
+    """
+    if os.path.exists(db_path):
+        raise FileExistsError(f"Database {db_path} already exists.")
+    data = DataManager(json_path).load_data()
+    if data is None:
+        raise ValueError(f"Could not load {json_path}.")
+    data_manager = SQLiteDataManager(db_path)
+    data_manager.save_data(data)
+    data_manager.close()
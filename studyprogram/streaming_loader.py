@@ -0,0 +1,167 @@
+import io
+import json
+from classes import StudyProgram, Semester, Module
+from progress_monitor import ProgressTotals
+from serializers import open_data_file
+
+# Characters read from the file at a time
+CHUNK_SIZE = 64 * 1024
+
+class _StreamReader:
+    """
+    Minimal incremental JSON reader: walks the structure of a study program file
+    character by character and decodes one complete value at a time, so only a
+    small window of the file text is held in memory.
+    """
+    def __init__(self, file, chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, grow: bool = False) -> bool:
+        if self.eof:
+            return False
+        # When a value does not fit yet, read at least as much as is buffered to avoid quadratic re-parsing
+        size = max(self.chunk_size, len(self.buffer) - self.pos) if grow else self.chunk_size
+        chunk = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop the consumed part of the buffer before appending
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of file.")
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}, found '{self.buffer[self.pos]}'.")
+        self.pos += 1
+
+    def read_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill(grow=True):
+                    continue
+                raise
+            # A value ending exactly at the buffer end (e.g. a number) may continue in the next chunk
+            if end == len(self.buffer) and self._fill(grow=True):
+                continue
+            self.pos = end
+            return value
+
+    def iter_object_keys(self):
+        """
+        Iterate over the keys of the object at the current position; the caller consumes each value.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def iter_array(self):
+        """
+        Iterate over the items of the array at the current position; the caller consumes each item.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+def iter_events(path: str, chunk_size: int = CHUNK_SIZE):
+    """
+    Parse a JSON study program file (gzip/xz compressed ones are decompressed on
+    the fly) incrementally. Yields
+      ("field", key, value)          for every top-level value except "semesters",
+      ("semester", number)           when a semester starts,
+      ("module", number, module)     for every module as a dictionary.
+    """
+    with io.TextIOWrapper(open_data_file(path), encoding="utf-8") as file:
+        reader = _StreamReader(file, chunk_size)
+        for key in reader.iter_object_keys():
+            if key != "semesters":
+                yield ("field", key, reader.read_value())
+                continue
+            for _ in reader.iter_array():
+                number = None
+                # Modules seen before the semester number (unusual key order) have to wait for it
+                waiting = []
+                for semester_key in reader.iter_object_keys():
+                    if semester_key == "number":
+                        number = reader.read_value()
+                        yield ("semester", number)
+                        for module in waiting:
+                            yield ("module", number, module)
+                        waiting = []
+                    elif semester_key == "modules":
+                        for _ in reader.iter_array():
+                            module = reader.read_value()
+                            if number is None:
+                                waiting.append(module)
+                            else:
+                                yield ("module", number, module)
+                    else:
+                        reader.read_value()
+
+def load_program(path: str, chunk_size: int = CHUNK_SIZE) -> StudyProgram:
+    """
+    Build a StudyProgram from a JSON file one module at a time.
+    Peak memory is the program itself plus roughly one module's raw data.
+
+    Read-only and used for bulk processing (see cohort.py). It keeps only the
+    name, regular study period, semesters and modules: no revision or journal
+    state and no extra fields. Programs that are edited and saved again are
+    loaded through DataManager.load_data instead.
+    """
+    study_program = StudyProgram(name="", regular_study_period=6)
+    for event in iter_events(path, chunk_size):
+        if event[0] == "field":
+            _, key, value = event
+            if key in ("name", "regular_study_period"):
+                setattr(study_program, key, value)
+        elif event[0] == "semester":
+            study_program.add_semester(Semester(event[1]))
+        else:
+            _, number, module_data = event
+            study_program.get_semester(number).add_module(Module.from_dict(module_data))
+    return study_program
+
+def aggregate_file(path: str, chunk_size: int = CHUNK_SIZE) -> ProgressTotals:
+    """
+    Compute the ProgressTotals of a JSON file without building the study program.
+    """
+    totals = ProgressTotals()
+    for event in iter_events(path, chunk_size):
+        if event[0] == "module":
+            totals.add_module(Module.from_dict(event[2], lazy=True))
+    return totals
@@ -0,0 +1,163 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+from classes import StudyProgram
+from data_manager import DataManager
+from progress_monitor import ProgressMonitor
+from api_server import ApiServer, HttpError
+from sqlite_data_manager import SQLiteDataManager, SQLiteProgressMonitor
+from test_progress_monitor import create_test_study_program
+
+async def request(reader, writer, method: str, path: str, body=None, headers: dict = None):
+    # One request on a keep-alive connection; returns (status, headers, parsed body)
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    lines = [f"{method} {path} HTTP/1.1", "Host: localhost", f"Content-Length: {len(data)}"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + data)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    response_headers = {}
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.decode("latin-1").partition(":")
+        response_headers[name.lower()] = value.strip()
+    payload = await reader.readexactly(int(response_headers["content-length"]))
+    return status, response_headers, json.loads(payload) if payload else None
+
+async def exercise_server(file_path: str):
+    program = create_test_study_program()
+    data_manager = DataManager(file_path)
+    data_manager.attach(program)
+    commits = []
+    commit_changes = data_manager.commit_changes
+    data_manager.commit_changes = lambda records, data: (commits.append(len(records)), commit_changes(records, data))
+    server = ApiServer(data_manager, program, ProgressMonitor(program), commit_delay=0.05, reload_interval=0)
+    await server.start("127.0.0.1", 0)
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    try:
+        status, headers, body = await request(reader, writer, "GET", "/api/program")
+        assert status == 200 and body == program.to_dict()
+        # Unchanged data is served from the cache and revalidated by its ETag
+        assert server.read("/api/program")[1] is server.read("/api/program")[1]
+        status, _, _ = await request(reader, writer, "GET", "/api/program", headers={"If-None-Match": headers["etag"]})
+        assert status == 304
+        # Parameters the endpoint does not read share its cache entry
+        cached = len(server._cache)
+        for number in range(3):
+            await request(reader, writer, "GET", f"/api/program?_={number}")
+        assert len(server._cache) == cached
+
+        status, _, metrics = await request(reader, writer, "GET", "/api/metrics")
+        assert status == 200 and metrics["grade_average"] == ProgressMonitor(program).calc_grade_average()
+
+        # Writes are validated like the menu
+        status, _, body = await request(reader, writer, "POST", "/api/grades", {"semester": 1, "module": "Mathematik", "grade": 7})
+        assert status == 400 and "between 1.00 and 5.00" in body["error"]
+        status, _, body = await request(reader, writer, "POST", "/api/modules", {"title": "Statistik", "ects": 5, "semester": 1})
+        assert status == 201
+        status, _, body = await request(reader, writer, "POST", "/api/learning-times",
+                                        {"semester": 1, "module": "statistik", "hours": "2,5", "date": "2025-02-03"})
+        assert status == 201 and body["version"] == program.version
+
+        status, _, dashboard = await request(reader, writer, "GET", "/api/dashboard")
+        assert "statistik" in [module["title"] for module in dashboard["modules"]]
+        status, _, rollup = await request(reader, writer, "GET", "/api/learning-time?period=month&start=2025-02-01&end=2025-02-28")
+        assert rollup == [{"start": "2025-02-01", "hours": 2.5}]
+        status, _, _ = await request(reader, writer, "GET", "/api/learning-time?period=year")
+        assert status == 400
+        # Also without any learning times
+        empty = StudyProgram("Leer")
+        try:
+            ApiServer(data_manager, empty, ProgressMonitor(empty)).read("/api/learning-time", "period=year")
+            assert False, "an unknown period was accepted"
+        except HttpError as error:
+            assert error.status == 400
+        status, _, _ = await request(reader, writer, "GET", "/api/unknown")
+        assert status == 404
+
+        # Invalid operations are rejected, unexpected errors answered with 500
+        status, _, body = await request(reader, writer, "POST", "/api/operations",
+                                        [{"op": "add_grade", "semester": 1, "module": 5, "grade": 2}])
+        assert status == 201 and body["applied"] == 0 and body["rejected"][0]["position"] == 1
+        status, _, body = await request(reader, writer, "POST", "/api/grades", {"semester": True, "module": "Mathematik", "grade": 2})
+        assert status == 400
+        build = server._build
+        server._build = lambda path, query: {}["broken"]
+        with contextlib.redirect_stderr(io.StringIO()):
+            status, _, body = await request(reader, writer, "GET", "/api/metrics")
+        assert status == 500 and body == {"error": "Internal server error."}
+        server._build = build
+
+        # Both writes are persisted with a single commit
+        assert commits == []
+        await asyncio.sleep(0.2)
+        assert commits == [2]
+
+        # Reads are answered while a slow commit is written; the server waits for it on close
+        data_manager.commit_changes = lambda records, data: (time.sleep(0.5), commit_changes(records, data))
+        status, _, _ = await request(reader, writer, "POST", "/api/learning-times", {"semester": 1, "module": "Statistik", "hours": 1})
+        await asyncio.sleep(0.15)
+        start = time.perf_counter()
+        status, _, _ = await request(reader, writer, "GET", "/api/program")
+        assert status == 200 and time.perf_counter() - start < 0.25
+    finally:
+        writer.close()
+        await writer.wait_closed()
+        await server.close()
+    return program
+
+def test_api_server_reads_and_batches_writes():
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        file_path = os.path.join(directory, "study_data.json")
+        program = asyncio.run(exercise_server(file_path))
+        assert DataManager(file_path).load_data() == program.to_dict()
+
+async def exercise_sqlite_server(db_path: str):
+    program = create_test_study_program()
+    data_manager = SQLiteDataManager(db_path)
+    data_manager.save_data(program.to_dict())
+    data_manager.attach(program)
+    server = ApiServer(data_manager, program, SQLiteProgressMonitor(data_manager.connection),
+                       commit_delay=0.05, reload_interval=0.05)
+    await server.start("127.0.0.1", 0)
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    try:
+        status, _, _ = await request(reader, writer, "POST", "/api/modules", {"title": "Statistik", "ects": 5, "semester": 1})
+        assert status == 201
+        status, _, _ = await request(reader, writer, "POST", "/api/learning-times",
+                                     {"semester": 1, "module": "Statistik", "hours": 2, "date": "2025-02-03"})
+        assert status == 201
+        await asyncio.sleep(0.2)
+        assert SQLiteDataManager(db_path).load_data() == program.to_dict()
+
+        # A failing commit is reported instead of being lost with its task
+        data_manager.commit_changes = lambda records, data: {}["broken"]
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            status, _, _ = await request(reader, writer, "POST", "/api/grades", {"semester": 1, "module": "Statistik", "grade": 2})
+            await asyncio.sleep(0.2)
+        assert status == 201 and "Committing failed" in stderr.getvalue()
+        # The rows stay in the open transaction and are saved with the next commit
+        del data_manager.commit_changes
+        status, _, _ = await request(reader, writer, "POST", "/api/learning-times", {"semester": 1, "module": "Statistik", "hours": 1})
+        assert status == 201
+    finally:
+        writer.close()
+        await writer.wait_closed()
+        await server.close()
+    data_manager.close()
+    return program
+
+def test_api_server_with_sqlite_backend():
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        db_path = os.path.join(directory, "study_data.db")
+        program = asyncio.run(exercise_sqlite_server(db_path))
+        assert SQLiteDataManager(db_path).load_data() == program.to_dict()
+
+if __name__ == "__main__":
+    test_api_server_reads_and_batches_writes()
+    test_api_server_with_sqlite_backend()
+    print("API server test successful!")
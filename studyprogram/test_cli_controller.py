@@ -0,0 +1,62 @@
+import os
+from datetime import date
+from classes import Semester, Module, ExamPerformance, LearningTime, ModuleStatus
+from cli_controller import CLIController
+from data_manager import DataManager
+from progress_monitor import ProgressMonitor
+from test_progress_monitor import create_test_study_program
+
+def test_data_version_bumps_on_every_mutation():
+    program = create_test_study_program()
+    module = program.semesters[0].modules[1]
+    mutations = [
+        lambda: module.add_learning_time(LearningTime(date=date(2025, 2, 1), hours=1.0)),
+        lambda: module.add_exam_performance(ExamPerformance(grade=2.0, attempt=1, passed=True)),
+        lambda: setattr(module, "status", ModuleStatus.PASSED),
+        lambda: setattr(module, "ects", 5),
+        lambda: setattr(module, "title", "Python II"),
+        lambda: program.add_semester(Semester(number=2)),
+        lambda: program.semesters[1].add_module(Module(title="Neu", ects=5, status=ModuleStatus.OPEN)),
+        lambda: program.semesters[1].remove_module(program.semesters[1].modules[0]),
+    ]
+    for mutation in mutations:
+        version = program.version
+        mutation()
+        assert program.version > version
+
+def test_panels_are_rendered_once_per_version():
+    program = create_test_study_program()
+    controller = CLIController(DataManager(os.devnull), program, ProgressMonitor(program))
+    renders = []
+    render = lambda snapshot: renders.append(snapshot) or f"{len(snapshot.module_titles)} modules"
+
+    assert controller._cached_panel("panel", render) == "2 modules"
+    assert controller._cached_panel("panel", render) == "2 modules"
+    assert len(renders) == 1
+
+    program.semesters[0].add_module(Module(title="Statistik", ects=5, status=ModuleStatus.OPEN))
+    assert controller._cached_panel("panel", render) == "3 modules"
+    assert len(renders) == 2
+    # The snapshot is shared between the panels of one version
+    assert controller._cached_panel("other panel", render) == "3 modules"
+    assert renders[1] is renders[2]
+
+def test_render_progress_truncates_learning_times():
+    program = create_test_study_program()
+    module = program.semesters[0].modules[1]
+    for day in range(1, 11):
+        module.add_learning_time(LearningTime(date=date(2025, 3, day), hours=1.0))
+    controller = CLIController(DataManager(os.devnull), program, ProgressMonitor(program))
+
+    text = controller.render_progress(max_learning_times=3)
+    assert "... 7 earlier entries (7.0 hours) not shown" in text
+    assert "Date: 2025-03-10" in text and "Date: 2025-03-07" not in text
+    assert text.count("Date: ") == 1 + 3
+    assert controller.render_progress().count("Date: ") == 1 + 10
+    assert controller.format_progress_bar("Open", 50, bar_length=10) == "Open  : |█████-----|  50.0%"
+
+if __name__ == "__main__":
+    test_data_version_bumps_on_every_mutation()
+    test_panels_are_rendered_once_per_version()
+    test_render_progress_truncates_learning_times()
+    print("CLIController tests successful!")
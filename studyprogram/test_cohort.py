@@ -0,0 +1,56 @@
+import json
+import math
+import os
+import tempfile
+from classes import StudyProgram
+from cohort import aggregate_files, analyze_cohort
+from data_manager import DataManager
+from progress_monitor import ProgressMonitor
+from benchmarks.synthetic import generate_program_dict
+
+def test_cohort_matches_single_programs():
+    with tempfile.TemporaryDirectory() as directory:
+        monitors = []
+        for seed in range(5):
+            data = generate_program_dict(semesters=2, modules_per_semester=3, learning_times_per_module=10, seed=seed)
+            DataManager(os.path.join(directory, f"student_{seed}.json")).save_data(data)
+            monitors.append(ProgressMonitor(StudyProgram.from_dict(data)))
+        with open(os.path.join(directory, "broken.json"), "w", encoding="utf-8") as file:
+            file.write("{")
+        # Valid JSON, but a module without "status"
+        del data["semesters"][0]["modules"][0]["status"]
+        with open(os.path.join(directory, "incomplete.json"), "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        # A binary snapshot cut off in the middle, stored under a .json name
+        binary_path = os.path.join(directory, "truncated.json")
+        DataManager(binary_path, storage_format="binary").save_data(generate_program_dict(semesters=2, modules_per_semester=3))
+        with open(binary_path, "r+b") as file:
+            file.truncate(os.path.getsize(binary_path) // 2)
+
+        result = analyze_cohort(directory, workers=2, chunk_size=2)
+
+        assert result.files == 5
+        assert sorted(os.path.basename(path) for path in result.failed_files) == ["broken.json", "incomplete.json", "truncated.json"]
+        progress = result.distributions["study_progress"]
+        assert progress.count == 5
+        assert math.isclose(progress.mean(), sum(m.calc_study_progress() for m in monitors) / 5)
+        assert math.isclose(result.totals.learning_hours_sum, sum(m.totals.learning_hours_sum for m in monitors))
+
+def test_unreadable_files_are_recorded_as_failed():
+    with tempfile.TemporaryDirectory() as directory:
+        valid = os.path.join(directory, "student.json")
+        DataManager(valid).save_data(generate_program_dict(semesters=1, modules_per_semester=2))
+        # Removed after it was listed, and a path that cannot be opened as a file
+        missing = os.path.join(directory, "removed.json")
+        unreadable = os.path.join(directory, "folder.json")
+        os.mkdir(unreadable)
+
+        result = aggregate_files([valid, missing, unreadable])
+
+        assert result.files == 1
+        assert result.failed_files == [missing, unreadable]
+
+if __name__ == "__main__":
+    test_cohort_matches_single_programs()
+    test_unreadable_files_are_recorded_as_failed()
+    print("Cohort test successful!")
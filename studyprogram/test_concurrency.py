@@ -0,0 +1,98 @@
+import contextlib
+import io
+import multiprocessing
+import os
+import tempfile
+import time
+from datetime import date
+from classes import StudyProgram, LearningTime, ModuleStatus
+from data_manager import DataManager, StaleWriteError
+from test_progress_monitor import create_test_study_program
+
+PROCESSES = 4
+COMMITS_PER_PROCESS = 25
+
+def hammer(file_path: str, worker: int, journal: bool):
+    # Every commit is stale as soon as another process wrote; the program is never reloaded
+    with contextlib.redirect_stdout(io.StringIO()):
+        data_manager = DataManager(file_path, journal=journal, compact_threshold=2048)
+        program = StudyProgram.from_dict(data_manager.load_data())
+        data_manager.attach(program)
+        module = program.semesters[0].modules[worker % 2]
+        for i in range(COMMITS_PER_PROCESS):
+            module.add_learning_time(LearningTime(date=date(2025, 1 + worker, 1 + i), hours=1.0))
+            data_manager.commit(program)
+
+def run_stress_test(journal: bool) -> float:
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        file_path = os.path.join(directory, "study_data.json")
+        initial = create_test_study_program()
+        DataManager(file_path).save_data(initial.to_dict())
+        initial_hours = sum(module.get_learning_hours() for module in initial.semesters[0].modules)
+
+        start = time.perf_counter()
+        processes = [multiprocessing.Process(target=hammer, args=(file_path, worker, journal)) for worker in range(PROCESSES)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+        assert all(process.exitcode == 0 for process in processes)
+
+        # No update was lost
+        data_manager = DataManager(file_path, journal=journal)
+        program = StudyProgram.from_dict(data_manager.load_data())
+        hours = sum(module.get_learning_hours() for module in program.semesters[0].modules)
+        assert hours == initial_hours + PROCESSES * COMMITS_PER_PROCESS
+        if not journal:
+            # The initial save plus one snapshot per commit
+            assert data_manager.revision == 1 + PROCESSES * COMMITS_PER_PROCESS
+        return PROCESSES * COMMITS_PER_PROCESS / elapsed
+
+def test_concurrent_commits_lose_no_update():
+    for journal in (False, True):
+        throughput = run_stress_test(journal)
+        # Generous bound; process start-up dominates at this size
+        assert throughput > 10, f"{throughput:.0f} commits/s"
+
+def test_conflicting_write_is_rejected():
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        file_path = os.path.join(directory, "study_data.json")
+        DataManager(file_path).save_data(create_test_study_program().to_dict())
+        first, second = DataManager(file_path), DataManager(file_path)
+        programs = [StudyProgram.from_dict(data_manager.load_data()) for data_manager in (first, second)]
+        first.attach(programs[0])
+        second.attach(programs[1])
+
+        semester = programs[0].semesters[0]
+        semester.remove_module(semester.modules[1])
+        first.commit(programs[0])
+        programs[1].semesters[0].modules[1].status = ModuleStatus.PASSED
+        try:
+            second.commit(programs[1])
+            assert False, "the stale write was not rejected"
+        except StaleWriteError:
+            pass
+
+        # Without auto_merge any stale write is rejected, and a reload makes it current again
+        strict = DataManager(file_path, auto_merge=False)
+        program = StudyProgram.from_dict(strict.load_data())
+        strict.attach(program)
+        programs[0].semesters[0].modules[0].ects = 10
+        first.commit(programs[0])
+        program.semesters[0].modules[0].status = ModuleStatus.PASSED
+        try:
+            strict.commit(program)
+            assert False, "the stale write was not rejected"
+        except StaleWriteError:
+            pass
+        assert strict.reload_changes(program)
+        program.semesters[0].modules[0].status = ModuleStatus.PASSED
+        strict.commit(program)
+        assert strict.revision == 4
+
+if __name__ == "__main__":
+    for journal in (False, True):
+        print(f"journal={journal}: {run_stress_test(journal):.0f} commits/s")
+    test_conflicting_write_is_rejected()
+    print("Concurrency tests successful!")
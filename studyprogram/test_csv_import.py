@@ -0,0 +1,76 @@
+import io
+from datetime import date
+from classes import ModuleStatus, LearningTime
+from csv_import import import_learning_times, import_exam_results
+from progress_monitor import ProgressMonitor
+from test_progress_monitor import create_test_study_program
+
+def test_import_learning_times_in_chunks():
+    program = create_test_study_program()
+    monitor = ProgressMonitor(program, verify=True)
+    rows = ["Date;Hours;Module;Semester"]
+    rows += [f"2023-01-{day:02d};1,5;PYTHON;1" for day in range(1, 32)]
+    rows += [
+        "2023-02-01;2;Statistik;1",     # unknown module
+        "2023-02-31;2;Python;1",        # invalid date
+        "2023-02-01;-1;Python;1",       # negative hours
+        ";2;Python;1",                  # missing date
+        "2023-02-01;2",                 # too few columns
+        "",
+    ]
+    report = import_learning_times(program, io.StringIO("\n".join(rows)), chunk_size=8)
+
+    assert report.imported == 31
+    assert [line for line, _, _ in report.rejected] == [33, 34, 35, 36, 37]
+    python = program.get_module(1, "python")
+    assert python.learning_times[0].date == date(2023, 1, 1)
+    assert python.get_learning_hours() == 31 * 1.5
+    monitor.verify_totals()
+
+    rejected = io.StringIO()
+    report.write_rejected(rejected)
+    assert rejected.getvalue().splitlines()[1].startswith("33,No module found")
+
+def test_import_exam_results_checks_attempts():
+    program = create_test_study_program()
+    csv_text = "\n".join([
+        "1,Python,5.0,1",
+        "1,Python,4.7,3",   # attempt 2 is missing
+        "1,Python,4.7,2",
+        "1,Python,2.3,",    # attempt is optional
+        "1,Python,1.0,4",   # already passed
+        "1,Mathematik,1.3,2",
+    ])
+    report = import_exam_results(program, io.StringIO(csv_text), chunk_size=2)
+
+    assert report.imported == 3
+    assert [line for line, _, _ in report.rejected] == [2, 5, 6]
+    python = program.get_module(1, "python")
+    assert [ep.attempt for ep in python.exam_performances] == [1, 2, 3]
+    assert python.status == ModuleStatus.PASSED
+
+def test_import_backfills_newest_first():
+    program = create_test_study_program()
+    expected = create_test_study_program()
+    monitor = ProgressMonitor(program, verify=True)
+    rows = [f"1;Python;2022-12-{day:02d};{day}" for day in range(31, 0, -1)] + ["1;Python;2022-12-15;0,5"]
+    report = import_learning_times(program, io.StringIO("\n".join(rows)), chunk_size=10)
+
+    assert report.imported == 32
+    # Same entries, order and sums as adding the rows one by one
+    python = expected.get_module(1, "python")
+    for row in rows:
+        day, hours = row.split(";")[2:]
+        python.add_learning_time(LearningTime(date.fromisoformat(day), float(hours.replace(",", "."))))
+    imported = program.get_module(1, "python")
+    assert list(imported.learning_times) == list(python.learning_times)
+    assert imported.get_learning_hours_between(date(2022, 12, 10), date(2023, 1, 2)) == \
+        python.get_learning_hours_between(date(2022, 12, 10), date(2023, 1, 2))
+    assert program.to_dict() == expected.to_dict()
+    monitor.verify_totals()
+
+if __name__ == "__main__":
+    test_import_learning_times_in_chunks()
+    test_import_backfills_newest_first()
+    test_import_exam_results_checks_attempts()
+    print("CSV import tests successful!")
@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+from data_manager import DataManager
+from serializers import BinarySerializer, GzipCompression, XzCompression
+from streaming_loader import load_program
+from benchmarks.synthetic import generate_program_dict
+
+def test_write_behind_coalesces_saves():
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "study_data.json")
+        data_manager = DataManager(file_path, write_behind=True, debounce=0.05)
+
+        writes = []
+        write_atomic = data_manager._write_atomic
+        data_manager._write_atomic = lambda data: (writes.append(data), write_atomic(data))
+
+        for i in range(50):
+            data_manager.save_data({"name": "Testprogramm", "regular_study_period": 6, "semesters": [], "i": i})
+        data_manager.flush()
+
+        with open(file_path, "r", encoding="utf-8") as file:
+            assert json.load(file)["i"] == 49
+        assert len(writes) < 50
+        # The temporary file was renamed into place (the lock file stays for the next writer)
+        assert sorted(os.listdir(directory)) == ["study_data.json", "study_data.json.lock"]
+        data_manager.close()
+
+def test_binary_format_roundtrip_and_detection():
+    data = generate_program_dict(semesters=2, modules_per_semester=3, exams_per_module=2, learning_times_per_module=10)
+    data["journal_seq"] = 7
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "study_data.bin")
+        DataManager(file_path, storage_format="binary").save_data(data)
+        with open(file_path, "rb") as file:
+            assert file.read(4) == BinarySerializer.MAGIC
+
+        data_manager = DataManager(file_path)
+        assert data_manager.load_data() == data
+        assert data_manager.serializer.name == "binary"
+
+def test_binary_format_rejects_newer_version():
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "study_data.bin")
+        with open(file_path, "wb") as file:
+            file.write(BinarySerializer._HEADER.pack(BinarySerializer.MAGIC, BinarySerializer.VERSION + 1))
+        assert DataManager(file_path).load_data() is None
+
+def test_compressed_roundtrip_and_detection():
+    data = generate_program_dict(semesters=2, modules_per_semester=3, exams_per_module=2, learning_times_per_module=50)
+    with tempfile.TemporaryDirectory() as directory:
+        for compression in (GzipCompression, XzCompression):
+            # New files are compressed according to their extension
+            file_path = os.path.join(directory, "study_data.json" + compression.EXTENSION)
+            DataManager(file_path).save_data(data)
+            with open(file_path, "rb") as file:
+                assert file.read(len(compression.MAGIC)) == compression.MAGIC
+            data_manager = DataManager(file_path)
+            assert data_manager.load_data() == data
+            assert data_manager.compression.name == compression.name
+            assert load_program(file_path, chunk_size=7).to_dict() == load_program(file_path).to_dict()
+
+            # The magic bytes decide, not the extension, and the compression is kept on save
+            file_path = os.path.join(directory, "archive.json")
+            DataManager(file_path, compression=compression.name, compression_level=1).save_data(data)
+            data_manager = DataManager(file_path)
+            assert data_manager.load_data() == data
+            data_manager.save_data(data)
+            with open(file_path, "rb") as file:
+                assert file.read(len(compression.MAGIC)) == compression.MAGIC
+
+        # A higher level gives a smaller file; "none" writes plain JSON whatever the extension
+        sizes = []
+        for level in (0, 9):
+            file_path = os.path.join(directory, f"level{level}.json.gz")
+            DataManager(file_path, compression_level=level).save_data(data)
+            sizes.append(os.path.getsize(file_path))
+        assert sizes[1] < sizes[0]
+        file_path = os.path.join(directory, "plain.json.gz")
+        DataManager(file_path, compression="none").save_data(data)
+        with open(file_path, "r", encoding="utf-8") as file:
+            assert json.load(file)["semesters"] == data["semesters"]
+        try:
+            DataManager(file_path, compression="gzip", compression_level=10)
+            assert False, "the level was not validated"
+        except ValueError:
+            pass
+
+        # A truncated archive is reported instead of raising
+        file_path = os.path.join(directory, "broken.json.gz")
+        DataManager(file_path).save_data(data)
+        with open(file_path, "r+b") as file:
+            file.truncate(os.path.getsize(file_path) // 2)
+        assert DataManager(file_path).load_data() is None
+
+if __name__ == "__main__":
+    test_write_behind_coalesces_saves()
+    test_binary_format_roundtrip_and_detection()
+    test_binary_format_rejects_newer_version()
+    test_compressed_roundtrip_and_detection()
+    print("DataManager test successful!")
@@ -0,0 +1,127 @@
+import contextlib
+import io
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+from classes import StudyProgram, Semester, Module, ExamPerformance, LearningTime, ModuleStatus
+from data_manager import DataManager
+from history import HistoryStore, CHECKPOINT
+from journal import ChangeRecorder
+from progress_monitor import ProgressMonitor
+from test_progress_monitor import create_test_study_program
+
+def test_history_rebuilds_past_states():
+    program = create_test_study_program()
+    recorder = ChangeRecorder()
+    program.subscribe(recorder)
+    with tempfile.TemporaryDirectory() as directory:
+        history = HistoryStore(os.path.join(directory, "study_data.json.history"), checkpoint_interval=3)
+        history.record(None, program.to_dict, "1", time=datetime(2025, 1, 1, 12))
+        expected = {date(2025, 1, 1): program.to_dict()}
+        for day in range(2, 11):
+            module = program.semesters[0].modules[day % 2]
+            module.add_learning_time(LearningTime(date=date(2025, 1, day), hours=float(day)))
+            if day == 5:
+                module.add_exam_performance(ExamPerformance(grade=2.3, attempt=1, passed=True))
+                module.status = ModuleStatus.PASSED
+            if day == 8:
+                program.add_semester(Semester(number=2))
+                program.semesters[1].add_module(Module(title="Statistik", ects=5, status=ModuleStatus.OPEN))
+            history.record(recorder.drain(), program.to_dict, str(day), str(day - 1), time=datetime(2025, 1, day, 12))
+            expected[date(2025, 1, day)] = program.to_dict()
+
+        # One checkpoint to start from and one after every three deltas
+        assert history._kinds.count(CHECKPOINT) == 1 + 9 // 3
+        for day, state in expected.items():
+            assert StudyProgram.from_dict(history.state_at(day)).to_dict() == state
+        # Before noon of day 5 the state of day 4 applies; nothing was saved before day 1
+        assert StudyProgram.from_dict(history.state_at(datetime(2025, 1, 5, 11))).to_dict() == expected[date(2025, 1, 4)]
+        assert history.state_at(date(2024, 12, 31)) is None
+
+        # A second store on the same file (another process) indexes the same entries
+        assert len(HistoryStore(history.path)) == len(history)
+
+        # Records that do not start from the last recorded state are stored as a checkpoint
+        program.semesters[0].modules[0].ects = 10
+        recorder.drain()
+        program.semesters[0].modules[1].ects = 7
+        history.record(recorder.drain(), program.to_dict, "12", "11", time=datetime(2025, 1, 12, 12))
+        assert history._kinds[-1] == CHECKPOINT
+        assert StudyProgram.from_dict(history.state_at(date(2025, 1, 12))).to_dict() == program.to_dict()
+
+        # A damaged entry is reported as ValueError
+        with open(history.path, "a", encoding="utf-8") as file:
+            file.write('2025-01-13T12:00:00.000000\tdelta\t13\t[{"op": "remove_module", "semester": 9, "title": "x"}]\n')
+        try:
+            history.state_at(date(2025, 1, 13))
+            assert False, "the damaged entry was replayed"
+        except ValueError:
+            pass
+
+def test_progress_monitor_at_uses_saved_history():
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        file_path = os.path.join(directory, "study_data.json")
+        data_manager = DataManager(file_path, history=True)
+        program = create_test_study_program()
+        data_manager.attach(program)
+        data_manager.commit(program)
+        module = program.semesters[0].modules[1]
+        module.add_exam_performance(ExamPerformance(grade=1.3, attempt=1, passed=True))
+        module.status = ModuleStatus.PASSED
+        data_manager.commit(program)
+
+        monitor = ProgressMonitor(program)
+        monitor.history = data_manager.history
+        past = monitor.at(date.today())
+        assert past.calc_study_progress() == monitor.calc_study_progress()
+        assert past.calc_grade_average() == monitor.calc_grade_average()
+        try:
+            monitor.at(date.today() - timedelta(days=1))
+            assert False, "there is no state before today"
+        except ValueError:
+            pass
+
+        # Reopening the file continues the same history
+        reopened = DataManager(file_path, history=True)
+        reopened.load_data()
+        assert len(reopened.history) == 2
+
+def test_history_bridges_writers_without_history():
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        file_path = os.path.join(directory, "study_data.json")
+        for journal in (False, True):
+            if os.path.exists(file_path + ".history"):
+                os.remove(file_path + ".history")
+            DataManager(file_path).save_data(create_test_study_program().to_dict())
+            recorded = DataManager(file_path, journal=journal, history=True)
+            program = StudyProgram.from_dict(recorded.load_data())
+            recorded.attach(program)
+            program.semesters[0].add_module(Module(title="Mathe", ects=5, status=ModuleStatus.OPEN))
+            recorded.commit(program)
+
+            # Another process without a history adds a module
+            other = DataManager(file_path, journal=journal)
+            other_program = StudyProgram.from_dict(other.load_data())
+            other.attach(other_program)
+            other_program.semesters[0].add_module(Module(title="Stats", ects=5, status=ModuleStatus.OPEN))
+            other.commit(other_program)
+
+            # A stale commit is merged; the history must not replay it onto the old state
+            program.semesters[0].modules[0].add_learning_time(LearningTime(date=date(2025, 1, 1), hours=2.0))
+            recorded.commit(program)
+            expected = StudyProgram.from_dict(DataManager(file_path, journal=journal).load_data()).to_dict()
+            assert StudyProgram.from_dict(recorded.history.state_at(date.today())).to_dict() == expected
+
+            # A reload of the other process' change is recorded as well
+            other_program.semesters[0].modules[1].ects = 8
+            other.commit(other_program)
+            assert recorded.reload_changes(program)
+            program.semesters[0].modules[0].ects = 9
+            recorded.commit(program)
+            assert StudyProgram.from_dict(recorded.history.state_at(date.today())).to_dict() == program.to_dict()
+
+if __name__ == "__main__":
+    test_history_rebuilds_past_states()
+    test_progress_monitor_at_uses_saved_history()
+    test_history_bridges_writers_without_history()
+    print("History tests successful!")
@@ -0,0 +1,52 @@
+import os
+import tempfile
+from classes import StudyProgram, Semester, Module, ExamPerformance, LearningTime, ModuleStatus
+from data_manager import DataManager
+from datetime import date
+
+def load_program(data_manager: DataManager) -> StudyProgram:
+    program = StudyProgram.from_dict(data_manager.load_data())
+    data_manager.attach(program)
+    return program
+
+def test_journal_replay_and_compaction():
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "study_data.json")
+        data_manager = DataManager(file_path, journal=True)
+        program = StudyProgram(name="Testprogramm")
+        data_manager.attach(program)
+        data_manager.commit(program)  # first commit writes the snapshot
+
+        semester = Semester(number=1)
+        program.add_semester(semester)
+        semester.add_module(Module(title="Mathematik", ects=5, status=ModuleStatus.OPEN))
+        data_manager.commit(program)
+        module = program.semesters[0].modules[0]
+        module.add_learning_time(LearningTime(date=date(2025, 3, 1), hours=2.0))
+        # Backfilled entries are replayed in the same order (equal dates in the order they were added)
+        module.add_learning_times([LearningTime(date=date(2025, 2, 1), hours=0.5), LearningTime(date=date(2025, 1, 1), hours=1.0)])
+        module.add_learning_time(LearningTime(date=date(2025, 2, 1), hours=1.5))
+        module.add_exam_performance(ExamPerformance(grade=2.0, attempt=1, passed=True))
+        module.status = ModuleStatus.PASSED
+        module.title = "math"
+        data_manager.commit(program)
+        assert os.path.exists(data_manager.journal_path)
+
+        # Simulate a torn record from an interrupted append
+        with open(data_manager.journal_path, "a", encoding="utf-8") as file:
+            file.write('{"op": "add_le')
+
+        reloaded = load_program(DataManager(file_path, journal=True))
+        assert reloaded.to_dict() == program.to_dict()
+
+        # Folding the journal back into the snapshot
+        data_manager.compact_threshold = 0
+        module.add_learning_time(LearningTime(date=date(2025, 3, 2), hours=1.0))
+        data_manager.commit(program)
+        assert not os.path.exists(data_manager.journal_path)
+        reloaded = load_program(DataManager(file_path, journal=True))
+        assert reloaded.to_dict() == program.to_dict()
+
+if __name__ == "__main__":
+    test_journal_replay_and_compaction()
+    print("Journal test successful!")
@@ -0,0 +1,55 @@
+import math
+from datetime import date
+from classes import StudyProgram, Semester, Module, LearningTime, ModuleStatus
+from progress_monitor import ProgressMonitor
+from benchmarks.synthetic import generate_program_dict
+import numpy_monitor
+from numpy_monitor import create_progress_monitor
+
+def assert_same_snapshot(actual, expected):
+    for field in ("study_progress", "grade_average", "average_learning_time", "planned_learning_time", "actual_learning_time"):
+        assert math.isclose(getattr(actual, field), getattr(expected, field), abs_tol=1e-9), field
+    assert actual.semester_grade_averages.keys() == expected.semester_grade_averages.keys()
+    for number, average in expected.semester_grade_averages.items():
+        assert math.isclose(actual.semester_grade_averages[number], average)
+    assert actual.module_titles == expected.module_titles
+    assert all(math.isclose(a, b, abs_tol=1e-9) for a, b in zip(actual.module_actual_times, expected.module_actual_times))
+    assert actual.module_planned_times == expected.module_planned_times
+    assert actual.status_counts == expected.status_counts
+    assert [week for week, _ in actual.recent_weekly_hours] == [week for week, _ in expected.recent_weekly_hours]
+
+def test_numpy_backend_matches_python():
+    data = generate_program_dict(semesters=3, modules_per_semester=4, exams_per_module=2, learning_times_per_module=50)
+    program = StudyProgram.from_dict(data, lazy=True)
+    # The pure Python monitor is faster at every measured size, so auto picks it
+    assert type(create_progress_monitor(program, backend="auto")) is ProgressMonitor
+    monitor = create_progress_monitor(program, backend="numpy", verify=True)
+    python_monitor = ProgressMonitor(StudyProgram.from_dict(data))
+    if numpy_monitor.np is None:
+        # Without NumPy every backend is the pure Python monitor
+        assert type(monitor) is ProgressMonitor
+        return
+
+    def check():
+        for metric in ("calc_grade_average", "calc_pass_quote", "calc_study_progress", "calc_average_learning_time"):
+            assert math.isclose(getattr(monitor, metric)(), getattr(python_monitor, metric)(), abs_tol=1e-9), metric
+        assert_same_snapshot(monitor.build_dashboard_snapshot(), python_monitor.build_dashboard_snapshot())
+        window = (date(2020, 1, 10), date(2020, 2, 3))
+        assert math.isclose(monitor.calc_learning_hours_between(*window), python_monitor.calc_learning_hours_between(*window))
+        for (month, hours), (expected_month, expected_hours) in zip(monitor.calc_learning_time_rollup("month"),
+                                                                    python_monitor.calc_learning_time_rollup("month")):
+            assert month == expected_month and math.isclose(hours, expected_hours, abs_tol=1e-9)
+
+    check()
+    # The columns follow changes made after the monitor was created
+    for target in (program, python_monitor.study_program):
+        semester = Semester(number=4)
+        target.add_semester(semester)
+        module = Module(title="Neu", ects=10, status=ModuleStatus.PASSED)
+        semester.add_module(module)
+        module.add_learning_time(LearningTime(date=date(2020, 1, 20), hours=4.0))
+    check()
+
+if __name__ == "__main__":
+    test_numpy_backend_matches_python()
+    print("NumPy monitor test successful!")
@@ -0,0 +1,86 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+from classes import ModuleStatus
+from data_manager import DataManager
+import main
+import operations
+from test_progress_monitor import create_test_study_program
+
+def test_operations_use_the_menu_validation():
+    program = create_test_study_program()
+    operations.add_module(program, "  Datenbanken ", "10", 2.0)
+    module = program.get_module(2, "datenbanken")
+    assert module.ects == 10 and module.status == ModuleStatus.OPEN
+
+    for bad in (
+        {"op": "add_module", "title": "Datenbanken", "ects": 10, "semester": 2},  # duplicate
+        {"op": "add_module", "title": "Statistik", "ects": 7, "semester": 2},
+        {"op": "add_module", "title": "Statistik", "ects": 5, "semester": 9},
+        {"op": "add_grade", "semester": 1, "module": "Mathematik", "grade": 2.0},  # already passed
+        {"op": "add_grade", "semester": 2, "module": "Datenbanken", "grade": 6},
+        {"op": "log_time", "semester": 1, "module": "Unbekannt", "hours": 1},
+        {"op": "log_time", "semester": 1, "module": "Python", "hours": -1},
+        {"op": "log_time", "semester": 1, "module": "Python"},
+        {"op": "drop_everything"},
+        {"op": "add_grade", "semester": 1, "module": 5, "grade": 2},
+        {"op": "add_module", "title": ["Statistik"], "ects": 5, "semester": 2},
+        {"op": "add_module", "title": "Statistik", "ects": 5, "semester": 1.9},
+        {"op": "add_module", "title": "Statistik", "ects": 5, "semester": True},
+        {"op": "add_module", "title": "Statistik", "ects": 5.5, "semester": 2},
+    ):
+        try:
+            operations.apply_operation(program, bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad}")
+
+    for grade in ("5,0", 4.3, 5.0):
+        operations.add_grade(program, 2, "Datenbanken", grade)
+    assert [ep.attempt for ep in module.exam_performances] == [1, 2, 3]
+    assert module.status == ModuleStatus.FAILED
+    try:
+        operations.add_grade(program, 2, "Datenbanken", 1.0)
+        raise AssertionError("fourth attempt accepted")
+    except ValueError:
+        pass
+
+def test_apply_saves_once():
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "study_data.json")
+        DataManager(file_path).save_data(create_test_study_program().to_dict())
+        ops_path = os.path.join(directory, "ops.jsonl")
+        with open(ops_path, "w", encoding="utf-8") as file:
+            for day in range(1, 29):
+                file.write(json.dumps({"op": "log_time", "semester": 1, "module": "python", "hours": 1.5,
+                                       "date": f"2024-02-{day:02d}"}) + "\n")
+            file.write("\n{not json\n")
+            file.write(json.dumps({"op": "add_grade", "semester": 1, "module": "Python", "grade": "2,3"}) + "\n")
+
+        saves = []
+        save_data = DataManager.save_data
+        DataManager.save_data = lambda self, data, *args: (saves.append(data), save_data(self, data, *args))
+        stderr = io.StringIO()
+        try:
+            args = argparse.Namespace(file=file_path, journal=False, format=None, history=False,
+                                      compression=None, compression_level=None)
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(stderr):
+                assert main.run_batch(args, main.apply_file(ops_path)) == 1
+        finally:
+            DataManager.save_data = save_data
+        assert len(saves) == 1
+        assert "line 30" in stderr.getvalue()
+
+        data = DataManager(file_path).load_data()
+        python = data["semesters"][0]["modules"][1]
+        assert len(python["learning_times"]) == 28
+        assert python["exam_performances"] == [{"grade": 2.3, "attempt": 1, "passed": True}]
+        assert python["status"] == "passed"
+
+if __name__ == "__main__":
+    test_operations_use_the_menu_validation()
+    test_apply_saves_once()
+    print("Operations tests successful!")
@@ -0,0 +1,47 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+from classes import StudyProgram
+from data_manager import DataManager
+from progress_monitor import ProgressMonitor
+from profiling import Profiler
+from test_progress_monitor import create_test_study_program
+
+def test_profiler_records_and_restores():
+    save_data, from_dict = DataManager.save_data, StudyProgram.__dict__["from_dict"]
+    with tempfile.TemporaryDirectory() as directory:
+        profiler = Profiler(os.path.join(directory, "profile.json"), profile_action="show_progress").enable()
+        try:
+            data_manager = DataManager(os.path.join(directory, "study_data.json"))
+            with contextlib.redirect_stdout(io.StringIO()):
+                data_manager.save_data(create_test_study_program().to_dict())
+                program = StudyProgram.from_dict(data_manager.load_data())
+            monitor = ProgressMonitor(program)
+            for _ in range(3):
+                monitor.calc_grade_average()
+        finally:
+            profiler.disable()
+
+        assert DataManager.save_data is save_data
+        assert StudyProgram.__dict__["from_dict"] is from_dict
+        stats = profiler.stats
+        assert stats["progress_monitor.calc_grade_average"].count == 3
+        assert stats["data_manager.write"].bytes == os.path.getsize(data_manager.file_path)
+        # One semester, two modules, one exam and one learning time
+        assert stats["study_program.from_dict"].objects == 5
+        assert sum(stats["data_manager.load_data"].buckets.values()) == 1
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            profiler.dump()
+        with open(profiler.output_path, "r", encoding="utf-8") as file:
+            report = json.load(file)
+        assert report["stats"]["study_program.to_dict"]["count"] == 1
+        assert report["cprofile"]["action"] == "show_progress"
+        # show_progress was never called, so there is no cProfile data to write
+        assert report["cprofile"]["file"] is None
+
+if __name__ == "__main__":
+    test_profiler_records_and_restores()
+    print("Profiling test successful!")
@@ -0,0 +1,103 @@
+import contextlib
+import io
+import os
+import tempfile
+import time
+from datetime import date
+from classes import StudyProgram, Module, LearningTime, ModuleStatus
+from data_manager import DataManager
+from program_diff import diff_program
+from test_progress_monitor import create_test_study_program
+
+def test_reload_merges_only_changed_modules():
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        file_path = os.path.join(directory, "study_data.json")
+        DataManager(file_path).save_data(create_test_study_program().to_dict())
+        data_manager = DataManager(file_path)
+        program = StudyProgram.from_dict(data_manager.load_data(), lazy=True)
+        unchanged = program.semesters[0].modules[0]
+        assert data_manager.reload_changes(program) is None
+
+        # Another process logs a learning time and adds a module
+        other = DataManager(file_path)
+        external = StudyProgram.from_dict(other.load_data())
+        external.semesters[0].modules[1].add_learning_time(LearningTime(date=date(2025, 1, 5), hours=2.0))
+        external.semesters[0].add_module(Module(title="Statistik", ects=5, status=ModuleStatus.OPEN))
+        other.save_data(external.to_dict())
+
+        version = program.version
+        diff = data_manager.reload_changes(program)
+        assert len(diff.changed_modules) == 1 and len(diff.added_modules) == 1 and not diff.removed_modules
+        assert program.semesters[0].modules[0] is unchanged and unchanged.is_loaded() is False
+        assert program.version > version
+        assert program.get_module(1, "statistik") is program.semesters[0].modules[2]
+        assert program.to_dict() == external.to_dict()
+        assert not diff_program(program, external.to_dict())
+
+        # Touching the file without changing it is not a change
+        os.utime(file_path, ns=(0, 0))
+        assert data_manager.reload_changes(program) is None
+        # A renamed program is a change event like any other
+        external.name = "Umbenannt"
+        external.regular_study_period = 7
+        other.save_data(external.to_dict())
+        version = program.version
+        diff = data_manager.reload_changes(program)
+        assert diff.fields == {"name": "Umbenannt", "regular_study_period": 7}
+        assert program.version == version + 2 and program.to_dict() == external.to_dict()
+        # Neither is our own save
+        program.semesters[0].modules[0].status = ModuleStatus.PASSED
+        data_manager.save_data(program.to_dict())
+        assert not data_manager.has_external_changes()
+
+def test_reload_picks_up_journal_records():
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        file_path = os.path.join(directory, "study_data.json")
+        data_manager = DataManager(file_path, journal=True)
+        program = create_test_study_program()
+        data_manager.attach(program)
+        data_manager.commit(program)
+
+        other = DataManager(file_path, journal=True)
+        external = StudyProgram.from_dict(other.load_data())
+        other.attach(external)
+        external.semesters[0].modules[0].ects = 10
+        external.name = "Umbenannt"
+        other.commit(external)
+
+        diff = data_manager.reload_changes(program)
+        assert [module["title"] for _, module in diff.changed_modules] == [program.semesters[0].modules[0].title]
+        assert program.semesters[0].modules[0].ects == 10 and program.name == "Umbenannt"
+        # The merged change is already in the journal and is not recorded a second time
+        assert data_manager._recorder.drain() == []
+
+def test_check_does_not_wait_for_background_save():
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        file_path = os.path.join(directory, "study_data.json")
+        DataManager(file_path).save_data(create_test_study_program().to_dict())
+        data_manager = DataManager(file_path, write_behind=True, debounce=5.0)
+        program = StudyProgram.from_dict(data_manager.load_data())
+        data_manager.attach(program)
+        program.semesters[0].modules[0].ects = 10
+        data_manager.commit(program)
+
+        other = DataManager(file_path)
+        external = StudyProgram.from_dict(other.load_data())
+        external.semesters[0].add_module(Module(title="Statistik", ects=5, status=ModuleStatus.OPEN))
+        other.save_data(external.to_dict())
+
+        # The pending save is not forced out by the check
+        start = time.perf_counter()
+        assert data_manager.reload_changes(program) is None
+        assert time.perf_counter() - start < 1.0
+        # The save merges the external change, and the next check picks it up
+        data_manager.flush()
+        diff = data_manager.reload_changes(program)
+        assert len(diff.added_modules) == 1 and program.semesters[0].modules[0].ects == 10
+        data_manager.close()
+
+if __name__ == "__main__":
+    test_reload_merges_only_changed_modules()
+    test_reload_picks_up_journal_records()
+    test_check_does_not_wait_for_background_save()
+    print("Program diff tests successful!")
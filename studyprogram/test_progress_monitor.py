@@ -0,0 +1,102 @@
+from classes import StudyProgram, Semester, Module, ExamPerformance, LearningTime, ModuleStatus
+from progress_monitor import ProgressMonitor, ProgressTotals
+from datetime import date
+import math
+
+def create_test_study_program():
+    program = StudyProgram(name="Testprogramm", regular_study_period=6)
+
+    semester = Semester(number=1)
+    module = Module(title="Mathematik", ects=5, status=ModuleStatus.PASSED)
+    module.add_exam_performance(ExamPerformance(grade=1.7, attempt=1, passed=True))
+    module.add_learning_time(LearningTime(date=date(2025, 1, 10), hours=3.5))
+    semester.add_module(module)
+    semester.add_module(Module(title="Python", ects=10, status=ModuleStatus.OPEN))
+    program.add_semester(semester)
+
+    return program
+
+def test_incremental_totals_follow_mutations():
+    program = create_test_study_program()
+    monitor = ProgressMonitor(program, verify=True)
+    assert monitor.calc_study_progress() == 5 / 15 * 100
+
+    python = program.semesters[0].modules[1]
+    python.add_exam_performance(ExamPerformance(grade=5.0, attempt=1, passed=False))
+    python.status = ModuleStatus.FAILED
+    python.add_exam_performance(ExamPerformance(grade=2.3, attempt=2, passed=True))
+    python.status = ModuleStatus.PASSED
+    python.add_learning_time(LearningTime(date=date(2025, 1, 11), hours=1.5))
+    assert monitor.calc_study_progress() == 100
+    assert abs(monitor.calc_grade_average() - 2.0) < 1e-9
+    assert monitor.calc_pass_quote() == 100
+    assert monitor.calc_average_learning_time() == 2.5
+
+    # Move the module to a new semester, change its ECTS and finally delete it
+    semester_2 = Semester(number=2)
+    program.add_semester(semester_2)
+    program.semesters[0].remove_module(python)
+    semester_2.add_module(python)
+    python.ects = 5
+    assert monitor.calc_study_progress() == 100
+    semester_2.remove_module(python)
+    assert monitor.calc_average_learning_time() == 3.5
+    assert monitor.totals.matches(ProgressTotals.from_study_program(program))
+
+def test_verify_detects_stale_totals():
+    program = create_test_study_program()
+    monitor = ProgressMonitor(program, verify=True)
+    # Simulate a change that bypassed the change events
+    monitor.totals.learning_hours_sum += 1.0
+    try:
+        monitor.calc_average_learning_time()
+    except AssertionError:
+        return
+    raise AssertionError("verification mode did not detect stale totals")
+
+def test_dashboard_snapshot():
+    program = create_test_study_program()
+    snapshot = ProgressMonitor(program).build_dashboard_snapshot()
+    assert snapshot.module_titles == ["Mathematik", "Python"]
+    assert snapshot.module_actual_times == [3.5, 0]
+    assert snapshot.planned_learning_time == 15 * 25
+    assert snapshot.actual_learning_time == 3.5
+    assert snapshot.semester_grade_averages == {1: 1.7}
+    assert snapshot.status_counts[ModuleStatus.PASSED] == 1
+    assert snapshot.status_counts[ModuleStatus.OPEN] == 1
+
+def test_learning_time_range_queries():
+    program = create_test_study_program()
+    monitor = ProgressMonitor(program, verify=True)
+    python = program.semesters[0].modules[1]
+    # Backfilled out of order; the module keeps them sorted by date
+    entries = [(date(2025, 1, 1 + (i * 7) % 31), 0.5 + i % 4) for i in range(40)]
+    for day, hours in entries:
+        python.add_learning_time(LearningTime(date=day, hours=hours))
+    dates = [lt.date for lt in python.learning_times]
+    assert dates == sorted(dates)
+
+    for start, end in ((date(2025, 1, 5), date(2025, 1, 12)), (None, date(2025, 1, 3)), (date(2025, 1, 31), None)):
+        expected = sum(hours for day, hours in entries
+                       if (start is None or day >= start) and (end is None or day <= end))
+        assert math.isclose(python.get_learning_hours_between(start, end), expected)
+    assert python.get_learning_hours_between(date(2024, 1, 1), date(2024, 12, 31)) == 0
+    assert math.isclose(monitor.calc_learning_hours_between(date(2025, 1, 10), date(2025, 1, 10)),
+                        3.5 + sum(hours for day, hours in entries if day == date(2025, 1, 10)))
+
+    weeks = monitor.calc_learning_time_rollup("week", end=date(2025, 2, 2))
+    assert weeks[0][0] == date(2024, 12, 30) and weeks[-1][0] == date(2025, 1, 27)
+    assert all(week_start.weekday() == 0 for week_start, _ in weeks)
+    assert math.isclose(sum(hours for _, hours in weeks), monitor.totals.learning_hours_sum)
+
+    months = python.get_learning_time_rollup("month", start=date(2024, 12, 15), end=date(2025, 2, 1))
+    assert [month for month, _ in months] == [date(2024, 12, 1), date(2025, 1, 1), date(2025, 2, 1)]
+    assert months[0][1] == 0 and months[2][1] == 0
+    assert math.isclose(months[1][1], python.get_learning_hours())
+
+if __name__ == "__main__":
+    test_incremental_totals_follow_mutations()
+    test_verify_detects_stale_totals()
+    test_dashboard_snapshot()
+    test_learning_time_range_queries()
+    print("ProgressMonitor tests successful!")
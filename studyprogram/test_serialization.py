@@ -1,4 +1,6 @@
+import io
 import json
+import tracemalloc
 from classes import StudyProgram, Semester, Module, ExamPerformance, LearningTime, ModuleStatus
 from datetime import date
 
@@ -44,6 +46,61 @@ def test_serialization_roundtrip():
 
     print("Roundtrip-Test successful!")
 
+# 5. Packed learning times and exams behave like lists
+def test_packed_views_roundtrip():
+    original = create_test_study_program()
+    module = original.semesters[0].modules[0]
+    module.learning_times.append(LearningTime(date=date(2024, 5, 10), hours=1.25))
+    reconstructed = deserialize_program(serialize_program(original))
+    reconstructed_module = reconstructed.semesters[0].modules[0]
+
+    assert len(reconstructed_module.learning_times) == 2
+    # Learning times are kept sorted by date, so the older entry comes first
+    assert reconstructed_module.learning_times[0] == LearningTime(date=date(2024, 5, 10), hours=1.25)
+    assert reconstructed_module.learning_times == module.learning_times
+    assert list(reconstructed_module.exam_performances) == [ExamPerformance(grade=1.7, attempt=1, passed=True)]
+    # Equal entries hash alike, so they can be collected in sets or used as keys
+    assert set(reconstructed_module.learning_times) == set(module.learning_times)
+    assert ExamPerformance(grade=1.7, attempt=1, passed=True) in set(module.exam_performances)
+    assert reconstructed_module.to_dict() == module.to_dict()
+
+# 6. Lazy deserialization only builds a module's entries on first access
+def test_lazy_deserialization():
+    original = create_test_study_program()
+    as_dict = json.loads(serialize_program(original))
+    lazy = StudyProgram.from_dict(as_dict, lazy=True)
+    module = lazy.semesters[0].modules[0]
+
+    assert not module.is_loaded()
+    assert module.get_learning_hours() == 3.5
+    assert module.get_passed_grades() == [1.7]
+    assert lazy.to_dict() == original.to_dict()
+    assert not module.is_loaded()
+
+    assert module.learning_times[0].hours == 3.5
+    assert module.is_loaded()
+    assert lazy.to_dict() == original.to_dict()
+
+# 4. JSON is written and read through the file without keeping the whole text in memory
+def test_json_serializer_streams():
+    from serializers import JsonSerializer
+    from benchmarks.synthetic import generate_program_dict
+    data = generate_program_dict(learning_times_per_module=200)
+    file = io.BytesIO()
+    tracemalloc.start()
+    JsonSerializer().dump(data, file)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert file.getvalue() == json.dumps(data, indent=4).encode("utf-8")
+    # The output buffer itself grows to the file size; the text is never held as a whole besides it
+    assert peak < 1.5 * len(file.getvalue())
+    assert not file.closed
+    file.seek(0)
+    assert JsonSerializer().load(file) == data and not file.closed
+
 # run the test
 if __name__ == "__main__":
     test_serialization_roundtrip()
+    test_packed_views_roundtrip()
+    test_lazy_deserialization()
+    test_json_serializer_streams()
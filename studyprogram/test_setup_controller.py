@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+import tempfile
+from setup_controller import SetupController
+from test_progress_monitor import create_test_study_program
+
+def test_startup_does_not_import_plotext():
+    probe = "import sys, main; print('plotext' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", probe], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "False"
+
+def test_background_load():
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "study_data.json")
+        SetupController(file_path, write_behind=False).data_manager.save_data(create_test_study_program().to_dict())
+
+        setup = SetupController(file_path, write_behind=False, background_load=True)
+        controller = setup.create_controller()
+        assert controller.study_program is None
+        controller._ensure_loaded()
+        assert controller.study_program.to_dict() == create_test_study_program().to_dict()
+        assert controller.progress_monitor.calc_study_progress() == 5 / 15 * 100
+
+if __name__ == "__main__":
+    test_startup_does_not_import_plotext()
+    test_background_load()
+    print("SetupController tests successful!")
@@ -0,0 +1,106 @@
+import contextlib
+import io
+import math
+import os
+import tempfile
+from classes import StudyProgram, Semester, Module, ExamPerformance, LearningTime, ModuleStatus
+from data_manager import DataManager
+from progress_monitor import ProgressMonitor
+from sqlite_data_manager import SQLiteDataManager, SQLiteProgressMonitor, migrate_json_to_sqlite
+from setup_controller import SetupController
+from test_numpy_monitor import assert_same_snapshot
+from benchmarks.synthetic import generate_program_dict
+import operations
+from datetime import date
+
+def test_migration_and_row_level_changes():
+    data = generate_program_dict(semesters=3, modules_per_semester=2, exams_per_module=2, learning_times_per_module=5)
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "study_data.json")
+        db_path = os.path.join(directory, "study_data.db")
+        DataManager(json_path).save_data(data)
+        migrate_json_to_sqlite(json_path, db_path)
+
+        data_manager = SQLiteDataManager(db_path)
+        program = StudyProgram.from_dict(data_manager.load_data())
+        assert program.to_dict() == StudyProgram.from_dict(data).to_dict()
+        data_manager.attach(program)
+
+        module = program.semesters[0].modules[0]
+        module.add_learning_time(LearningTime(date=date(2025, 4, 1), hours=2.5))
+        module.add_exam_performance(ExamPerformance(grade=1.3, attempt=3, passed=True))
+        module.status = ModuleStatus.PASSED
+        module.title = "renamed module"
+        data_manager.commit(program)
+
+        # Move a module to a new semester and delete another one
+        semester = Semester(number=4)
+        program.add_semester(semester)
+        moved = program.semesters[1].modules[0]
+        program.semesters[1].remove_module(moved)
+        semester.add_module(moved)
+        program.semesters[2].remove_module(program.semesters[2].modules[0])
+        semester.add_module(Module(title="new module", ects=10, status=ModuleStatus.OPEN))
+        data_manager.commit(program)
+        data_manager.close()
+
+        data_manager = SQLiteDataManager(db_path)
+        assert data_manager.load_data() == program.to_dict()
+
+        monitor = ProgressMonitor(program)
+        sql_monitor = SQLiteProgressMonitor(data_manager.connection)
+        for metric in ("calc_grade_average", "calc_pass_quote", "calc_study_progress", "calc_average_learning_time"):
+            assert math.isclose(getattr(sql_monitor, metric)(), getattr(monitor, metric)())
+        assert sql_monitor.calc_learning_hours_between(date(2025, 4, 1), date(2025, 4, 30)) == 2.5
+        assert math.isclose(monitor.calc_learning_hours_between(date(2025, 4, 1), date(2025, 4, 30)), 2.5)
+        sql_months, months = sql_monitor.calc_learning_time_rollup("month"), monitor.calc_learning_time_rollup("month")
+        assert [month for month, _ in sql_months] == [month for month, _ in months]
+        assert all(math.isclose(a, b, abs_tol=1e-9) for (_, a), (_, b) in zip(sql_months, months))
+        assert_same_snapshot(sql_monitor.build_dashboard_snapshot(), monitor.build_dashboard_snapshot())
+        try:
+            data_manager._module_id(1, "no such module")
+            assert False, "a missing module was not reported"
+        except ValueError:
+            pass
+        data_manager.close()
+
+        # The setup uses the SQL monitor for databases, and it follows the changes made in the menu
+        with contextlib.redirect_stdout(io.StringIO()):
+            setup = SetupController(db_path, write_behind=False)
+            assert isinstance(setup.progress_monitor, SQLiteProgressMonitor)
+            operations.log_time(setup.study_program, 4, "new module", 3.0, "2025-05-02")
+            setup.data_manager.commit(setup.study_program)
+        monitor = ProgressMonitor(setup.study_program)
+        assert math.isclose(setup.progress_monitor.calc_average_learning_time(), monitor.calc_average_learning_time())
+        assert_same_snapshot(setup.progress_monitor.build_dashboard_snapshot(), monitor.build_dashboard_snapshot())
+        setup.data_manager.close()
+
+def test_delete_and_re_add_in_one_commit():
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        db_path = os.path.join(directory, "study_data.db")
+        data_manager = SQLiteDataManager(db_path)
+        data_manager.save_data(generate_program_dict(semesters=1, modules_per_semester=2, learning_times_per_module=3))
+        program = StudyProgram.from_dict(data_manager.load_data())
+        data_manager.attach(program)
+        title = program.semesters[0].modules[0].title
+        operations.apply_operations(program, [
+            {"op": "delete_module", "semester": 1, "module": title},
+            {"op": "add_module", "semester": 1, "title": title, "ects": 5},
+            {"op": "add_grade", "semester": 1, "module": title, "grade": 1.3},
+            {"op": "log_time", "semester": 1, "module": title, "hours": 2, "date": "2025-03-01"},
+            {"op": "move_module", "semester": 1, "module": title, "to": 2},
+        ])
+        program.name = "Umbenannt"
+        data_manager.commit(program)
+        data_manager.close()
+
+        reloaded = SQLiteDataManager(db_path)
+        assert StudyProgram.from_dict(reloaded.load_data()).to_dict() == program.to_dict()
+        module = program.get_module(2, title)
+        assert module.status == ModuleStatus.PASSED and module.get_learning_time_count() == 1
+        reloaded.close()
+
+if __name__ == "__main__":
+    test_migration_and_row_level_changes()
+    test_delete_and_re_add_in_one_commit()
+    print("SQLite test successful!")
@@ -0,0 +1,27 @@
+import json
+import os
+import tempfile
+from classes import StudyProgram
+from progress_monitor import ProgressTotals
+from streaming_loader import load_program, aggregate_file
+from benchmarks.synthetic import generate_program_dict
+
+def test_streaming_matches_full_load():
+    data = generate_program_dict(semesters=3, modules_per_semester=4, exams_per_module=2, learning_times_per_module=20)
+    # Unusual key order: modules before the semester number, semesters before the name
+    data["semesters"][1] = {"modules": data["semesters"][1]["modules"], "number": 2}
+    data = {"semesters": data["semesters"], "name": data["name"], "regular_study_period": 5}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "study_data.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4)
+
+        expected = StudyProgram.from_dict(data)
+        # A tiny chunk size forces values to be split across chunk boundaries
+        for chunk_size in (7, 4096):
+            assert load_program(path, chunk_size).to_dict() == expected.to_dict()
+            assert aggregate_file(path, chunk_size).matches(ProgressTotals.from_study_program(expected))
+
+if __name__ == "__main__":
+    test_streaming_matches_full_load()
+    print("Streaming loader test successful!")
@@ -0,0 +1,34 @@
+from classes import StudyProgram, Semester, Module, ModuleStatus
+
+def create_test_study_program():
+    program = StudyProgram(name="Testprogramm", regular_study_period=6)
+    semester = Semester(number=1)
+    semester.add_module(Module(title="Mathematik", ects=5, status=ModuleStatus.OPEN))
+    program.add_semester(semester)
+    return program
+
+def test_index_follows_add_rename_move_and_delete():
+    program = StudyProgram.from_dict(create_test_study_program().to_dict())
+    semester = program.get_semester(1)
+    module = program.get_module(1, "  MATHEMATIK ")
+    assert semester is program.semesters[0]
+    assert module is semester.modules[0]
+    assert program.get_semester(2) is None
+
+    module.title = "Mathe  I"
+    assert program.get_module(1, "mathematik") is None
+    assert program.get_module(1, "mathe i") is module
+
+    semester_2 = Semester(number=2)
+    program.add_semester(semester_2)
+    semester.remove_module(module)
+    semester_2.add_module(module)
+    assert program.get_module(1, "mathe i") is None
+    assert program.get_module(2, "mathe i") is module
+
+    semester_2.remove_module(module)
+    assert program.get_module(2, "mathe i") is None
+
+if __name__ == "__main__":
+    test_index_follows_add_rename_move_and_delete()
+    print("StudyProgram index test successful!")